@@ -10,6 +10,7 @@ from .performance_analyzer import PerformanceAnalyzer
 from .mobile_analyzer import MobileAnalyzer
 from .url_analyzer import URLAnalyzer
 from .schema_analyzer import SchemaAnalyzer
+from .site_analyzer import SiteAnalyzer
 
 __all__ = [
     'ContentAnalyzer',
@@ -19,5 +20,6 @@ __all__ = [
     'MobileAnalyzer',
     'URLAnalyzer',
     'SchemaAnalyzer',
+    'SiteAnalyzer',
 ]
 
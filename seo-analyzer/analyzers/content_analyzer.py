@@ -4,55 +4,66 @@ Analizza title, meta description, headings, keywords, densità
 """
 
 import re
-from typing import Dict, List, Tuple
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Tuple, Union
+from utils.fingerprint import MinHasher
+from utils.context import AnalysisContext
+from utils.parser import ElementIndex, ParsedDocument
+from utils.rules import SEORules
 from collections import Counter
 
 
 class ContentAnalyzer:
     """Analizzatore per contenuti SEO on-page"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
+    def __init__(self, config: Union[Dict, SEORules]):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
         
-    def analyze(self, html: str, url: str) -> Dict:
+        near_duplicate = self.rules.content.text_content.near_duplicate
+        self.min_hasher = MinHasher(
+            num_perm=near_duplicate.num_perm,
+            shingle_size=near_duplicate.shingle_size
+        )
+        
+    def analyze(self, html: Union[str, ParsedDocument], url: str) -> Dict:
         """
         Analizza tutti gli aspetti dei contenuti SEO
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina analizzata
             
         Returns:
             Dizionario con risultati analisi
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
         results = {
             'url': url,
-            'title': self._analyze_title(soup),
-            'meta_description': self._analyze_meta_description(soup),
-            'headings': self._analyze_headings(soup),
-            'keywords': self._analyze_keywords(soup),
-            'content': self._analyze_content(soup),
+            'title': self._analyze_title(context, index),
+            'meta_description': self._analyze_meta_description(context, index),
+            'headings': self._analyze_headings(context, index),
+            'keywords': self._analyze_keywords(context, document),
+            'content': self._analyze_content(context, document),
+            'fingerprint': self._fingerprint(document),
             'issues': [],
             'score': 0
         }
         
         # Calcola score totale
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
         
         return results
     
-    def _analyze_title(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_title(self, context: AnalysisContext, index: ElementIndex) -> Dict:
         """Analizza il tag <title>"""
-        title_tag = soup.find('title')
+        title_tag = index.find('title')
         
         if not title_tag:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'title',
                 'message': 'Tag <title> mancante',
@@ -65,9 +76,10 @@ class ContentAnalyzer:
         length = len(title)
         
         # Verifica lunghezza
-        min_len = self.config['content']['title']['min_length']
-        max_len = self.config['content']['title']['max_length']
-        optimal_len = self.config['content']['title']['optimal_length']
+        title_rules = self.rules.content.title
+        min_len = title_rules.min_length
+        max_len = title_rules.max_length
+        optimal_len = title_rules.optimal_length
         
         title_result = {
             'exists': True,
@@ -77,7 +89,7 @@ class ContentAnalyzer:
         }
         
         if length < min_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'title',
                 'message': f'Title troppo corto ({length} caratteri, minimo {min_len})',
@@ -86,7 +98,7 @@ class ContentAnalyzer:
             })
             title_result['score'] = 30
         elif length > max_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'title',
                 'message': f'Title troppo lungo ({length} caratteri, massimo {max_len})',
@@ -104,12 +116,12 @@ class ContentAnalyzer:
         
         return title_result
     
-    def _analyze_meta_description(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_meta_description(self, context: AnalysisContext, index: ElementIndex) -> Dict:
         """Analizza la meta description"""
-        meta_desc = soup.find('meta', {'name': 'description'})
+        meta_desc = index.find('meta', {'name': 'description'})
         
         if not meta_desc or not meta_desc.get('content'):
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'meta',
                 'message': 'Meta description mancante',
@@ -121,9 +133,10 @@ class ContentAnalyzer:
         description = meta_desc.get('content').strip()
         length = len(description)
         
-        min_len = self.config['content']['meta_description']['min_length']
-        max_len = self.config['content']['meta_description']['max_length']
-        optimal_len = self.config['content']['meta_description']['optimal_length']
+        desc_rules = self.rules.content.meta_description
+        min_len = desc_rules.min_length
+        max_len = desc_rules.max_length
+        optimal_len = desc_rules.optimal_length
         
         desc_result = {
             'exists': True,
@@ -133,7 +146,7 @@ class ContentAnalyzer:
         }
         
         if length < min_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'meta',
                 'message': f'Meta description troppo corta ({length} caratteri, minimo {min_len})',
@@ -142,7 +155,7 @@ class ContentAnalyzer:
             })
             desc_result['score'] = 40
         elif length > max_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'meta',
                 'message': f'Meta description troppo lunga ({length} caratteri, massimo {max_len})',
@@ -154,12 +167,13 @@ class ContentAnalyzer:
             desc_result['score'] = 100
         
         # Verifica call-to-action
-        cta_words = self.config['content']['meta_description']['persuasive_words']
-        has_cta = any(word.lower() in description.lower() for word in cta_words)
+        cta_words = desc_rules.persuasive_words
+        description_lower = description.lower()
+        has_cta = any(word in description_lower for word in cta_words)
         desc_result['has_call_to_action'] = has_cta
         
         if not has_cta:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'meta',
                 'message': 'Meta description senza call-to-action',
@@ -170,7 +184,7 @@ class ContentAnalyzer:
         
         return desc_result
     
-    def _analyze_headings(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_headings(self, context: AnalysisContext, index: ElementIndex) -> Dict:
         """Analizza la struttura dei headings (H1-H6)"""
         headings_result = {
             'h1': [],
@@ -185,13 +199,13 @@ class ContentAnalyzer:
         
         # Trova tutti gli headings
         for level in range(1, 7):
-            tags = soup.find_all(f'h{level}')
+            tags = index.find_all(f'h{level}')
             headings_result[f'h{level}'] = [tag.get_text().strip() for tag in tags]
         
         # Verifica H1
         h1_count = len(headings_result['h1'])
         if h1_count == 0:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'headings',
                 'message': 'Nessun tag <h1> trovato',
@@ -200,7 +214,7 @@ class ContentAnalyzer:
             })
             headings_result['score'] = 0
         elif h1_count > 1:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'headings',
                 'message': f'Troppi tag <h1> ({h1_count}, raccomandato: 1)',
@@ -213,11 +227,11 @@ class ContentAnalyzer:
         
         # Verifica H2
         h2_count = len(headings_result['h2'])
-        h2_min = self.config['content']['headings']['h2_min']
-        h2_max = self.config['content']['headings']['h2_max']
+        h2_min = self.rules.content.headings.h2_min
+        h2_max = self.rules.content.headings.h2_max
         
         if h2_count < h2_min:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'headings',
                 'message': f'Pochi tag <h2> ({h2_count}, raccomandato: almeno {h2_min})',
@@ -226,7 +240,7 @@ class ContentAnalyzer:
             })
             headings_result['score'] = max(0, headings_result['score'] - 10)
         elif h2_count > h2_max:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'headings',
                 'message': f'Troppi tag <h2> ({h2_count}, raccomandato: max {h2_max})',
@@ -236,7 +250,7 @@ class ContentAnalyzer:
         
         # Verifica struttura gerarchica
         if headings_result['h3'] and not headings_result['h2']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'headings',
                 'message': 'H3 presente senza H2 (struttura non gerarchica)',
@@ -247,10 +261,10 @@ class ContentAnalyzer:
         
         return headings_result
     
-    def _analyze_keywords(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_keywords(self, context: AnalysisContext, document: ParsedDocument) -> Dict:
         """Analizza densità keyword e distribuzione"""
         # Estrai tutto il testo
-        text = soup.get_text()
+        text = document.text
         # Pulisci e normalizza
         text = re.sub(r'\s+', ' ', text).lower()
         
@@ -281,6 +295,10 @@ class ContentAnalyzer:
         # Top 5 parole più frequenti
         top_keywords = word_freq.most_common(5)
         
+        keyword_rules = self.rules.content.keywords
+        min_density = keyword_rules.min_density
+        max_density = keyword_rules.max_density
+        
         for keyword, count in top_keywords:
             density = (count / total_words) * 100
             keywords_result['keyword_density'][keyword] = {
@@ -289,13 +307,10 @@ class ContentAnalyzer:
             }
             
             # Verifica densità ottimale
-            min_density = self.config['content']['keywords']['primary_keyword']['min_density']
-            max_density = self.config['content']['keywords']['primary_keyword']['max_density']
-            
             if density < min_density:
                 # Keyword sotto-utilizzata (ma solo per la prima/principale)
                 if keyword == top_keywords[0][0]:
-                    self.issues.append({
+                    context.issues.append({
                         'severity': 'minor',
                         'category': 'keywords',
                         'message': f'Keyword "{keyword}" sotto-utilizzata (densità {density:.2f}%)',
@@ -304,7 +319,7 @@ class ContentAnalyzer:
                     })
             elif density > max_density:
                 # Keyword stuffing
-                self.issues.append({
+                context.issues.append({
                     'severity': 'important',
                     'category': 'keywords',
                     'message': f'Keyword stuffing rilevato per "{keyword}" (densità {density:.2f}%)',
@@ -315,14 +330,10 @@ class ContentAnalyzer:
         # Score basato su densità keyword principale
         if top_keywords:
             main_density = (top_keywords[0][1] / total_words) * 100
-            min_d = self.config['content']['keywords']['primary_keyword']['min_density']
-            max_d = self.config['content']['keywords']['primary_keyword']['max_density']
-            optimal = self.config['content']['keywords']['primary_keyword']['optimal_density']
-            
-            if min_d <= main_density <= max_d:
+            if min_density <= main_density <= max_density:
                 # Ottimale
                 keywords_result['score'] = 100
-            elif main_density < min_d:
+            elif main_density < min_density:
                 # Troppo bassa
                 keywords_result['score'] = 60
             else:
@@ -331,16 +342,25 @@ class ContentAnalyzer:
         
         return keywords_result
     
-    def _analyze_content(self, soup: BeautifulSoup) -> Dict:
+    def _fingerprint(self, document: ParsedDocument) -> Optional[List[int]]:
+        """Firma MinHash del contenuto principale (per i quasi duplicati a livello sito)"""
+        index = document.index
+        main = index.find('main') or index.find('article')
+        text = main.get_text(' ') if main else document.text
+        return self.min_hasher.signature(text)
+    
+    def _analyze_content(self, context: AnalysisContext, document: ParsedDocument) -> Dict:
         """Analizza qualità e quantità del contenuto testuale"""
-        text = soup.get_text()
+        index = document.index
+        text = document.text
         text_clean = re.sub(r'\s+', ' ', text).strip()
         words = text_clean.split()
         word_count = len(words)
         
-        min_words = self.config['content']['text_content']['min_words_per_page']
-        optimal_words = self.config['content']['text_content']['optimal_words']
-        max_words = self.config['content']['text_content']['max_words']
+        text_rules = self.rules.content.text_content
+        min_words = text_rules.min_words_per_page
+        optimal_words = text_rules.optimal_words
+        max_words = text_rules.max_words
         
         content_result = {
             'word_count': word_count,
@@ -348,7 +368,7 @@ class ContentAnalyzer:
         }
         
         if word_count < min_words:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'content',
                 'message': f'Contenuto insufficiente ({word_count} parole, minimo {min_words})',
@@ -357,7 +377,7 @@ class ContentAnalyzer:
             })
             content_result['score'] = (word_count / min_words) * 50
         elif word_count > max_words:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'content',
                 'message': f'Contenuto molto lungo ({word_count} parole, ideale {optimal_words})',
@@ -371,13 +391,13 @@ class ContentAnalyzer:
             content_result['score'] = max(70, 100 - (distance / 10))
         
         # Analisi paragrafi
-        paragraphs = soup.find_all('p')
+        paragraphs = index.find_all('p')
         if paragraphs:
             avg_paragraph_words = sum(len(p.get_text().split()) for p in paragraphs) / len(paragraphs)
-            max_paragraph = self.config['content']['text_content']['paragraph_max_words']
+            max_paragraph = text_rules.paragraph_max_words
             
             if avg_paragraph_words > max_paragraph:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'content',
                     'message': f'Paragrafi troppo lunghi (media {avg_paragraph_words:.0f} parole)',
@@ -391,26 +411,27 @@ class ContentAnalyzer:
         """Calcola score totale per il contenuto"""
         scores = []
         weights = []
+        content_rules = self.rules.content
         
         if results['title'].get('score'):
             scores.append(results['title']['score'])
-            weights.append(self.config['content']['title']['weight'])
+            weights.append(content_rules.title.weight)
         
         if results['meta_description'].get('score'):
             scores.append(results['meta_description']['score'])
-            weights.append(self.config['content']['meta_description']['weight'])
+            weights.append(content_rules.meta_description.weight)
         
         if results['headings'].get('score'):
             scores.append(results['headings']['score'])
-            weights.append(self.config['content']['headings']['weight'])
+            weights.append(content_rules.headings.weight)
         
         if results['keywords'].get('score'):
             scores.append(results['keywords']['score'])
-            weights.append(self.config['content']['keywords']['weight'])
+            weights.append(content_rules.keywords.weight)
         
         if results['content'].get('score'):
             scores.append(results['content']['score'])
-            weights.append(self.config['content']['text_content']['weight'])
+            weights.append(content_rules.text_content.weight)
         
         if not scores:
             return 0
@@ -5,41 +5,66 @@ Analizza attributi alt, nomi file, dimensioni, compressione, lazy loading
 
 import re
 import os
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Union
+from utils.http_client import HTTPClient
+from utils.image_probe import ImageProbe
+from utils.local_site import LocalSiteIndex, locate_resource
+from utils.rate_limiter import HostRateLimiter
+from utils.context import AnalysisContext
+from utils.parser import ParsedDocument
+from utils.rules import SEORules
 from urllib.parse import urlparse, unquote
-try:
-    from PIL import Image
-    import requests
-    from io import BytesIO
-    IMAGING_AVAILABLE = True
-except ImportError:
-    IMAGING_AVAILABLE = False
+
+
+# Immagine locale referenziata ma assente dalla directory della build
+MISSING_FILE = 'missing'
+
+# URL di un candidato srcset: separatori iniziali saltati, poi tutto fino al primo spazio
+SRCSET_URL = re.compile(r'[\s,]*(\S+)')
+
+# Nomi generici o auto-generati (fotocamere, screenshot, hash)
+GENERIC_FILENAME = re.compile(
+    r'img\d+|image\d+|photo\d+|picture\d+|screenshot\d+'
+    r'|[a-f0-9]{8,}'  # Hash-like
+    r'|untitled|dsc\d+'  # Camera default
+)
 
 
 class ImageAnalyzer:
     """Analizzatore per immagini SEO"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
-        
-    def analyze(self, html: str, url: str, check_image_size: bool = True) -> Dict:
+    def __init__(self, config: Union[Dict, SEORules], http_client: Optional[HTTPClient] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.http = http_client or HTTPClient.from_config(self.rules)
+        self.rate_limiter = rate_limiter or HostRateLimiter(self.rules.advanced.rate_limit,
+                                                            http_client=self.http)
+        
+        # Formato, dimensioni e peso dagli header, condivisi tra le pagine dell'esecuzione
+        self.probe = ImageProbe.from_config(self.config, http_client=self.http, rate_limiter=self.rate_limiter)
+    
+    def analyze(self, html: Union[str, ParsedDocument], url: str, check_image_size: bool = True,
+                local_index: Optional[LocalSiteIndex] = None) -> Dict:
         """
         Analizza tutte le immagini nella pagina
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL base per risolvere percorsi relativi
-            check_image_size: Se True, scarica immagini per verificare dimensioni
-            
+            check_image_size: Se True, legge gli header delle immagini remote (Range) per peso e dimensioni
+            local_index: Indice della directory (--local-dir): src e srcset locali vengono
+                letti dal disco anche senza check_image_size
+        
         Returns:
             Dizionario con risultati analisi immagini
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
-        images = soup.find_all('img')
+        images = index.find_all('img')
         
         results = {
             'total_images': len(images),
@@ -53,13 +78,24 @@ class ImageAnalyzer:
                 'optimized_names': 0,
                 'lazy_loaded': 0,
                 'modern_format': 0,
-                'oversized': 0
+                'oversized': 0,
+                'missing_files': 0
             }
         }
         
+        # Tutte le sonde (src e candidati srcset) partono subito e procedono in parallelo con l'analisi
+        probes = [
+            (
+                self._submit_probe(context, img.get('src', ''), check_image_size, local_index),
+                [(candidate, descriptor, self._submit_probe(context, candidate, check_image_size, local_index))
+                 for candidate, descriptor in self._parse_srcset(img.get('srcset', ''))]
+            )
+            for img in images
+        ]
+        
         for idx, img in enumerate(images):
             img_analysis = self._analyze_single_image(
-                img, url, idx, check_image_size
+                context, img, url, idx, *probes[idx]
             )
             results['images'].append(img_analysis)
             
@@ -81,19 +117,25 @@ class ImageAnalyzer:
             
             if img_analysis.get('is_oversized'):
                 results['summary']['oversized'] += 1
+            
+            if img_analysis.get('missing_files'):
+                results['summary']['missing_files'] += 1
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
+        results['dependencies'] = sorted(context.dependencies)
         
         return results
     
     def _analyze_single_image(
         self, 
+        context: AnalysisContext,
         img_tag, 
         base_url: str, 
         index: int,
-        check_size: bool
+        probe: Optional[Future] = None,
+        srcset_probes: List = ()
     ) -> Dict:
         """Analizza una singola immagine"""
         
@@ -121,6 +163,44 @@ class ImageAnalyzer:
             'format': None
         }
         
+        # Dimensioni reali dagli header dell'immagine
+        info = self._probe_result(probe)
+        if info:
+            result['intrinsic_format'] = info['format']
+            result['intrinsic_width'] = info['width']
+            result['intrinsic_height'] = info['height']
+            if info['size_bytes'] is not None:
+                result['size_kb'] = info['size_bytes'] / 1024
+        
+        missing = [src] if probe == MISSING_FILE else []
+        if srcset_probes:
+            result['srcset'] = []
+            for candidate, descriptor, candidate_probe in srcset_probes:
+                if candidate_probe == MISSING_FILE:
+                    missing.append(candidate)
+                    continue
+                candidate_info = self._probe_result(candidate_probe) or {}
+                size_bytes = candidate_info.get('size_bytes')
+                result['srcset'].append({
+                    'url': candidate,
+                    'descriptor': descriptor,
+                    'width': candidate_info.get('width'),
+                    'height': candidate_info.get('height'),
+                    'size_kb': size_bytes / 1024 if size_bytes is not None else None
+                })
+        
+        # Immagini locali inesistenti (src o candidati srcset)
+        if missing:
+            result['missing_files'] = missing
+            context.issues.append({
+                'severity': 'critical',
+                'category': 'images',
+                'message': f'Immagine #{index + 1} non trovata nella directory ({", ".join(path[:60] for path in missing)})',
+                'image_src': src[:100],
+                'recommendation': 'Correggi il percorso o aggiungi il file mancante alla build',
+                'impact': 'Alto - Le immagini mancanti restituiscono 404 e spariscono dalla pagina'
+            })
+        
         # Analizza filename
         if src:
             parsed = urlparse(src)
@@ -133,12 +213,11 @@ class ImageAnalyzer:
             # Verifica formato
             ext = os.path.splitext(filename)[1].lower().lstrip('.')
             result['format'] = ext
-            modern_formats = self.config['images']['optimization']['modern_formats']
-            result['is_modern_format'] = ext in modern_formats
+            result['is_modern_format'] = ext in self.rules.images.modern_formats
         
         # Verifica attributo alt
         if not result['has_alt']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'images',
                 'message': f'Immagine #{index + 1} senza attributo alt',
@@ -152,11 +231,11 @@ class ImageAnalyzer:
         else:
             # Verifica qualità alt text
             alt_length = len(alt)
-            min_len = self.config['images']['attributes']['alt_min_length']
-            max_len = self.config['images']['attributes']['alt_max_length']
+            min_len = self.rules.images.alt_min_length
+            max_len = self.rules.images.alt_max_length
             
             if alt_length < min_len:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'images',
                     'message': f'Alt text troppo corto per immagine #{index + 1} ({alt_length} caratteri)',
@@ -165,7 +244,7 @@ class ImageAnalyzer:
                     'impact': 'Basso - Alt text più descrittivi migliorano ranking immagini'
                 })
             elif alt_length > max_len:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'images',
                     'message': f'Alt text troppo lungo per immagine #{index + 1} ({alt_length} caratteri)',
@@ -176,7 +255,7 @@ class ImageAnalyzer:
         
         # Verifica filename
         if not result['filename_optimized']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'images',
                 'message': f'Nome file non ottimizzato: "{result["filename"]}"',
@@ -187,7 +266,7 @@ class ImageAnalyzer:
         
         # Verifica lazy loading
         if not result['is_lazy_loaded']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'images',
                 'message': f'Immagine #{index + 1} senza lazy loading',
@@ -198,18 +277,21 @@ class ImageAnalyzer:
         
         # Verifica dimensioni specificate
         if not result['has_dimensions']:
-            self.issues.append({
+            recommendation = 'Specifica width e height per evitare layout shift'
+            if info and info['width'] and info['height']:
+                recommendation += f' (dimensioni reali: width="{info["width"]}" height="{info["height"]}")'
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'images',
                 'message': f'Immagine #{index + 1} senza width/height',
                 'image_src': src[:100],
-                'recommendation': 'Specifica width e height per evitare layout shift',
+                'recommendation': recommendation,
                 'impact': 'Medio - Previene CLS (Cumulative Layout Shift)'
             })
         
         # Verifica formato moderno
         if result['format'] and result['format'] in ['jpg', 'jpeg', 'png', 'gif']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'images',
                 'message': f'Immagine #{index + 1} in formato obsoleto ({result["format"]})',
@@ -218,27 +300,52 @@ class ImageAnalyzer:
                 'impact': 'Medio - Formati moderni migliorano performance'
             })
         
-        # Verifica dimensione file (se richiesto e possibile)
-        if check_size and IMAGING_AVAILABLE and src and src.startswith('http'):
-            try:
-                size_kb = self._check_image_size(src)
-                if size_kb:
-                    result['size_kb'] = size_kb
-                    max_size = self.config['images']['optimization']['max_size_kb']
-                    
-                    if size_kb > max_size:
-                        result['is_oversized'] = True
-                        self.issues.append({
-                            'severity': 'important',
-                            'category': 'images',
-                            'message': f'Immagine #{index + 1} troppo grande ({size_kb:.0f}KB, max {max_size}KB)',
-                            'image_src': src[:100],
-                            'recommendation': f'Comprimi l\'immagine (target: {max_size}KB, risparmio: {size_kb - max_size:.0f}KB)',
-                            'impact': 'Alto - Immagini pesanti rallentano caricamento pagina'
-                        })
-            except Exception:
-                # Silently fail se non riesce a scaricare
-                pass
+        # Verifica peso del file (dalla sonda, senza scaricare l'immagine)
+        size_kb = result.get('size_kb')
+        max_size = self.rules.images.max_size_kb
+        if size_kb and size_kb > max_size:
+            result['is_oversized'] = True
+            context.issues.append({
+                'severity': 'important',
+                'category': 'images',
+                'message': f'Immagine #{index + 1} troppo grande ({size_kb:.0f}KB, max {max_size}KB)',
+                'image_src': src[:100],
+                'recommendation': f'Comprimi l\'immagine (target: {max_size}KB, risparmio: {size_kb - max_size:.0f}KB)',
+                'impact': 'Alto - Immagini pesanti rallentano caricamento pagina'
+            })
+        
+        # Verifica peso dei candidati srcset (il browser può scegliere il più pesante)
+        heavy = [candidate for candidate in result.get('srcset', [])
+                 if candidate['size_kb'] and candidate['size_kb'] > max_size]
+        if heavy:
+            heaviest = max(heavy, key=lambda candidate: candidate['size_kb'])
+            result['is_oversized'] = True
+            context.issues.append({
+                'severity': 'important',
+                'category': 'images',
+                'message': f'Immagine #{index + 1}: {len(heavy)} varianti srcset oltre {max_size}KB '
+                           f'(la più pesante: {heaviest["url"][:60]}, {heaviest["size_kb"]:.0f}KB)',
+                'image_src': src[:100],
+                'recommendation': f'Comprimi le varianti srcset (target: {max_size}KB ciascuna)',
+                'impact': 'Alto - Sugli schermi ad alta densità viene scaricata la variante più grande'
+            })
+        
+        # Verifica dimensioni reali rispetto a quelle di visualizzazione
+        rendered_width = self._parse_dimension(width)
+        max_ratio = self.rules.images.max_intrinsic_ratio
+        if (info and info['width'] and rendered_width and not img_tag.get('srcset')
+                and info['width'] > rendered_width * max_ratio):
+            result['is_oversized'] = True
+            context.issues.append({
+                'severity': 'important',
+                'category': 'images',
+                'message': f'Immagine #{index + 1} sovradimensionata ({info["width"]}x{info["height"]}px, '
+                           f'visualizzata a {rendered_width}px)',
+                'image_src': src[:100],
+                'recommendation': f'Ridimensiona a {rendered_width * max_ratio}px di larghezza al massimo '
+                                  f'o usa srcset/sizes per schermi diversi',
+                'impact': 'Medio - Pixel non visualizzati aumentano il peso della pagina'
+            })
         
         return result
     
@@ -250,28 +357,13 @@ class ImageAnalyzer:
         # Rimuovi estensione
         name = os.path.splitext(filename)[0]
         
-        # Pattern ottimizzato: solo minuscole, numeri e trattini
-        pattern = self.config['images']['filenames']['pattern']
-        
-        # Verifica pattern base
-        if not re.match(pattern, filename):
+        # Pattern ottimizzato (images.filenames.pattern): solo minuscole, numeri e trattini
+        if not self.rules.images.filename_pattern.match(filename):
             return False
         
         # Verifica che non sia un nome generico o auto-generato
-        generic_patterns = [
-            r'img\d+',
-            r'image\d+',
-            r'photo\d+',
-            r'picture\d+',
-            r'screenshot\d+',
-            r'[a-f0-9]{8,}',  # Hash-like
-            r'untitled',
-            r'dsc\d+',  # Camera default
-        ]
-        
-        for generic in generic_patterns:
-            if re.search(generic, name.lower()):
-                return False
+        if GENERIC_FILENAME.search(name.lower()):
+            return False
         
         # Verifica presenza di almeno 2 parole separate da trattini
         words = name.split('-')
@@ -280,23 +372,84 @@ class ImageAnalyzer:
         
         return True
     
-    def _check_image_size(self, url: str) -> float:
-        """Scarica e verifica dimensione immagine in KB"""
-        try:
-            response = requests.get(url, timeout=10, stream=True)
-            response.raise_for_status()
+    def _submit_probe(self, context: AnalysisContext, src: str, remote: bool,
+                      local_index: Optional[LocalSiteIndex] = None) -> Union[Future, str, None]:
+        """
+        Avvia la lettura degli header dell'immagine (una sola per file o URL nell'esecuzione)
+        
+        I file locali vengono sempre letti (solo stat e primi KB); le
+        immagini remote solo se remote è True.
+        
+        Returns:
+            Future con i dati della sonda, MISSING_FILE se il file locale non
+            esiste, None se l'immagine non va (o non può essere) verificata
+        """
+        if not src or src.startswith('data:') or not self.rules.images.probe_enabled:
+            return None
+        
+        kind, location = locate_resource(src, context.url, local_index, context.dependencies)
+        if kind is None:
+            page_path = local_index.page_path(context.url) if local_index is not None else None
+            if page_path is not None and local_index.is_local(src):
+                return MISSING_FILE
+            return None
+        if kind == 'url' and not remote:
+            return None
+        if kind == 'file':
+            context.dependencies.add(location)
+        return self.probe.probe(kind, location)
+    
+    @staticmethod
+    def _parse_srcset(srcset: str) -> List:
+        """
+        Candidati di srcset come (url, descrittore), es. ('foto-800.webp', '800w')
+        
+        Segue l'algoritmo dello standard HTML: l'URL arriva fino al primo
+        spazio (può contenere virgole, es. .../w_400,c_fill/foto.jpg) e i
+        descrittori fino alla virgola successiva fuori dalle parentesi.
+        """
+        candidates = []
+        position, length = 0, len(srcset)
+        while True:
+            match = SRCSET_URL.match(srcset, position)
+            if match is None:
+                return candidates
+            url, position = match.group(1), match.end()
             
-            # Ottieni dimensione dal Content-Length header
-            if 'Content-Length' in response.headers:
-                size_bytes = int(response.headers['Content-Length'])
-                return size_bytes / 1024
+            descriptors = ''
+            if url.endswith(','):
+                url = url.rstrip(',')
+            else:
+                depth = 0
+                start = position
+                while position < length and (srcset[position] != ',' or depth > 0):
+                    if srcset[position] == '(':
+                        depth += 1
+                    elif srcset[position] == ')':
+                        depth = max(0, depth - 1)
+                    position += 1
+                descriptors = srcset[start:position]
             
-            # Altrimenti scarica il contenuto
-            content = response.content
-            return len(content) / 1024
+            if url:
+                parts = descriptors.split()
+                candidates.append((url, parts[0] if parts else '1x'))
+    
+    @staticmethod
+    def _probe_result(probe: Union[Future, str, None]) -> Optional[Dict]:
+        if probe is None or probe == MISSING_FILE:
+            return None
+        try:
+            return probe.result()
         except Exception:
+            # Immagine non raggiungibile: nessun dato sulle dimensioni
             return None
     
+    @staticmethod
+    def _parse_dimension(value) -> Optional[int]:
+        """Attributo width/height in pixel (None se assente o non numerico, es. 100%)"""
+        match = re.match(r'^\s*(\d+)(?:px)?\s*$', str(value)) if value else None
+        return int(match.group(1)) if match and int(match.group(1)) > 0 else None
+    
     def _calculate_score(self, results: Dict) -> int:
         """Calcola score totale per le immagini"""
         if results['total_images'] == 0:
@@ -4,36 +4,52 @@ Analizza anchor text, link rotti, struttura linking interna/esterna
 """
 
 import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Union
+from utils.http_client import HTTPClient
+from utils.context import AnalysisContext
+from utils.parser import ParsedDocument
+from utils.rules import SEORules
 from urllib.parse import urlparse, urljoin
-import requests
 from collections import Counter
+from utils.link_checker import LinkChecker
+from utils.local_site import LocalSiteIndex
 
 
 class LinkAnalyzer:
     """Analizzatore per link interni ed esterni"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
-        
-    def analyze(self, html: str, url: str, check_broken: bool = False) -> Dict:
+    def __init__(self, config: Union[Dict, SEORules], http_client: Optional[HTTPClient] = None):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.http = http_client or HTTPClient.from_config(self.rules)
+        # Condiviso tra le pagine: ogni URL viene verificato una sola volta
+        self.link_checker = LinkChecker(self.rules.advanced.link_checking,
+                                        http_client=self.http)
+    
+    def close(self):
+        """Chiude la sessione del link checker"""
+        self.link_checker.close()
+    
+    def analyze(self, html: Union[str, ParsedDocument], url: str, check_broken: bool = False,
+                local_index: Optional[LocalSiteIndex] = None) -> Dict:
         """
         Analizza tutti i link nella pagina
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina (per distinguere interni/esterni)
             check_broken: Se True, verifica link rotti (più lento)
-            
+            local_index: Indice della directory analizzata: i link interni
+                         (e i #fragment) vengono verificati sui file, offline
+        
         Returns:
             Dizionario con risultati analisi link
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
-        links = soup.find_all('a', href=True)
+        links = index.find_all('a', href=True)
         base_domain = urlparse(url).netloc
         
         results = {
@@ -55,6 +71,21 @@ class LinkAnalyzer:
             }
         }
         
+        # Pagina locale: link interni verificati sull'indice della directory
+        page_path = local_index.page_path(url) if local_index is not None else None
+        page_ids = None
+        if page_path is not None:
+            page_ids = frozenset(tag.get('id') for tag in index.find_all(id=True)) | \
+                frozenset(tag.get('name') for tag in index.find_all('a', attrs={'name': True}))
+        
+        # Verifica link rotti in parallelo prima della classificazione
+        broken_status = {}
+        if check_broken:
+            broken_status = self.link_checker.check_many(
+                urljoin(url, href) for href in (link.get('href', '').strip() for link in links)
+                if href and not href.startswith('#') and not href.startswith('javascript:')
+            )
+        
         for idx, link in enumerate(links):
             href = link.get('href', '').strip()
             anchor_text = link.get_text().strip()
@@ -62,6 +93,13 @@ class LinkAnalyzer:
             if isinstance(rel, str):
                 rel = [rel]
             
+            # Ancore nella stessa pagina: verificate solo offline
+            if page_path is not None and href.startswith('#') and \
+                    local_index.check(href, page_path, page_ids, context.dependencies) is not None:
+                self._mark_broken(context, results, {'index': idx, 'href': href, 'absolute_url': url + href,
+                                            'anchor_text': anchor_text, 'is_internal': True,
+                                            'rel': rel, 'is_broken': True}, 'fragment')
+            
             # Salta link vuoti o anchor
             if not href or href.startswith('#') or href.startswith('javascript:'):
                 continue
@@ -73,6 +111,16 @@ class LinkAnalyzer:
             # Classifica link
             is_internal = link_domain == base_domain or link_domain == ''
             
+            local_reason = None
+            if page_path is not None and local_index.is_local(href):
+                is_internal = True
+                target, _ = local_index.resolve(href, page_path)
+                if target is not None:
+                    # URL del file reale (root-relative, directory e URL senza estensione)
+                    fragment = urlparse(href).fragment
+                    absolute_url = local_index.file_url(target) + (f'#{fragment}' if fragment else '')
+                local_reason = local_index.check(href, page_path, page_ids, context.dependencies)
+            
             link_data = {
                 'index': idx,
                 'href': href,
@@ -85,7 +133,7 @@ class LinkAnalyzer:
             }
             
             # Analizza anchor text
-            anchor_analysis = self._analyze_anchor_text(anchor_text, idx)
+            anchor_analysis = self._analyze_anchor_text(context, anchor_text, idx)
             link_data.update(anchor_analysis)
             results['anchor_texts'].append(anchor_analysis)
             
@@ -97,7 +145,7 @@ class LinkAnalyzer:
                 results['summary']['external_count'] += 1
                 
                 # Verifica rel attributes per link esterni
-                self._check_external_link_attributes(link_data, idx)
+                self._check_external_link_attributes(context, link_data, idx)
                 
                 if link_data['has_nofollow']:
                     results['summary']['nofollow_external'] += 1
@@ -108,46 +156,62 @@ class LinkAnalyzer:
             if anchor_analysis['is_descriptive']:
                 results['summary']['descriptive_anchors'] += 1
             
-            # Check broken link (opzionale, lento)
-            if check_broken:
-                is_broken = self._check_broken_link(absolute_url)
-                link_data['is_broken'] = is_broken
-                if is_broken:
-                    results['broken_links'].append(link_data)
-                    results['summary']['broken_count'] += 1
-                    self.issues.append({
-                        'severity': 'critical',
-                        'category': 'links',
-                        'message': f'Link rotto trovato: {href}',
-                        'anchor_text': anchor_text,
-                        'recommendation': 'Rimuovi o aggiorna il link',
-                        'impact': 'Alto - Link rotti danneggiano esperienza utente e SEO'
-                    })
+            # Check broken link: offline sui file locali, altrimenti via rete (opzionale, lento)
+            if local_reason is not None:
+                link_data['is_broken'] = True
+                self._mark_broken(context, results, link_data, local_reason)
+            elif check_broken and broken_status.get(absolute_url, False):
+                link_data['is_broken'] = True
+                self._mark_broken(context, results, link_data)
         
         # Verifica numero di link interni
-        self._check_internal_links_count(results['summary']['internal_count'])
+        self._check_internal_links_count(context, results['summary']['internal_count'])
         
         # Verifica numero di link esterni
-        self._check_external_links_count(results['summary']['external_count'])
+        self._check_external_links_count(context, results['summary']['external_count'])
         
         # Verifica anchor text generici
-        self._check_generic_anchors(results['summary'])
+        self._check_generic_anchors(context, results['summary'])
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
+        results['dependencies'] = sorted(context.dependencies)
         
         return results
     
-    def _analyze_anchor_text(self, anchor: str, index: int) -> Dict:
-        """Analizza qualità dell'anchor text"""
+    def _mark_broken(self, context: AnalysisContext, results: Dict, link_data: Dict, reason: str = 'file'):
+        """Registra un link rotto (file mancante o ancora #fragment inesistente)"""
+        results['broken_links'].append(link_data)
+        results['summary']['broken_count'] += 1
         
-        generic_anchors = self.config['links']['internal']['avoid_generic_anchors']
+        if reason == 'fragment':
+            context.issues.append({
+                'severity': 'important',
+                'category': 'links',
+                'message': f'Ancora non trovata nella pagina di destinazione: {link_data["href"]}',
+                'anchor_text': link_data['anchor_text'],
+                'recommendation': 'Aggiungi l\'id mancante alla pagina o correggi il #fragment del link',
+                'impact': 'Medio - Il link apre la pagina ma non la sezione attesa'
+            })
+            return
+        
+        context.issues.append({
+            'severity': 'critical',
+            'category': 'links',
+            'message': f'Link rotto trovato: {link_data["href"]}',
+            'anchor_text': link_data['anchor_text'],
+            'recommendation': 'Rimuovi o aggiorna il link',
+            'impact': 'Alto - Link rotti danneggiano esperienza utente e SEO'
+        })
+    
+    def _analyze_anchor_text(self, context: AnalysisContext, anchor: str, index: int) -> Dict:
+        """Analizza qualità dell'anchor text"""
         
         result = {
             'text': anchor,
             'length': len(anchor),
-            'is_generic': anchor.lower() in [g.lower() for g in generic_anchors],
+            'is_generic': anchor.lower() in self.rules.links.generic_anchors,
             'is_descriptive': False,
             'has_keywords': False
         }
@@ -158,12 +222,12 @@ class LinkAnalyzer:
             result['is_descriptive'] = True
         
         # Verifica lunghezza
-        min_len = self.config['links']['anchor_text']['length_min']
-        max_len = self.config['links']['anchor_text']['length_max']
+        min_len = self.rules.links.anchor_min_length
+        max_len = self.rules.links.anchor_max_length
         
         if len(anchor) < min_len:
             if not result['is_generic']:  # Generic anchor già segnalato
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'links',
                     'message': f'Anchor text troppo corto: "{anchor}"',
@@ -171,7 +235,7 @@ class LinkAnalyzer:
                     'impact': 'Basso - Anchor descrittivi migliorano contesto per SEO'
                 })
         elif len(anchor) > max_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'links',
                 'message': f'Anchor text troppo lungo: "{anchor[:50]}..."',
@@ -181,11 +245,11 @@ class LinkAnalyzer:
         
         return result
     
-    def _check_external_link_attributes(self, link_data: Dict, index: int):
+    def _check_external_link_attributes(self, context: AnalysisContext, link_data: Dict, index: int):
         """Verifica attributi rel per link esterni"""
         
         if not link_data['rel']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'links',
                 'message': f'Link esterno senza attributo rel: {link_data["href"][:100]}',
@@ -199,7 +263,7 @@ class LinkAnalyzer:
             has_security = any(r in link_data['rel'] for r in recommended_rel)
             
             if not has_security:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'links',
                     'message': f'Link esterno senza rel di sicurezza: {link_data["href"][:100]}',
@@ -207,13 +271,13 @@ class LinkAnalyzer:
                     'impact': 'Basso - Previene vulnerabilità window.opener'
                 })
     
-    def _check_internal_links_count(self, count: int):
+    def _check_internal_links_count(self, context: AnalysisContext, count: int):
         """Verifica il numero di link interni"""
-        min_internal = self.config['links']['internal']['min_per_page']
-        max_internal = self.config['links']['internal']['max_per_page']
+        min_internal = self.rules.links.internal_min
+        max_internal = self.rules.links.internal_max
         
         if count < min_internal:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'links',
                 'message': f'Pochi link interni ({count}, raccomandato: almeno {min_internal})',
@@ -221,7 +285,7 @@ class LinkAnalyzer:
                 'impact': 'Medio - Link interni distribuiscono authority e migliorano SEO'
             })
         elif count > max_internal:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'links',
                 'message': f'Troppi link interni ({count}, raccomandato: max {max_internal})',
@@ -229,12 +293,12 @@ class LinkAnalyzer:
                 'impact': 'Basso - Troppi link possono sembrare spam'
             })
     
-    def _check_external_links_count(self, count: int):
+    def _check_external_links_count(self, context: AnalysisContext, count: int):
         """Verifica il numero di link esterni"""
-        max_external = self.config['links']['external']['max_per_page']
+        max_external = self.rules.links.external_max
         
         if count > max_external:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'links',
                 'message': f'Troppi link esterni ({count}, raccomandato: max {max_external})',
@@ -242,7 +306,7 @@ class LinkAnalyzer:
                 'impact': 'Medio - Troppi link esterni disperdono page rank'
             })
     
-    def _check_generic_anchors(self, summary: Dict):
+    def _check_generic_anchors(self, context: AnalysisContext, summary: Dict):
         """Verifica uso di anchor text generici"""
         total = summary['internal_count'] + summary['external_count']
         if total == 0:
@@ -252,7 +316,7 @@ class LinkAnalyzer:
         generic_ratio = (generic_count / total) * 100
         
         if generic_ratio > 20:  # Più del 20% sono generici
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'links',
                 'message': f'{generic_count} link con anchor text generico ({generic_ratio:.0f}%)',
@@ -262,11 +326,7 @@ class LinkAnalyzer:
     
     def _check_broken_link(self, url: str) -> bool:
         """Verifica se un link è rotto (404, timeout, etc.)"""
-        try:
-            response = requests.head(url, timeout=5, allow_redirects=True)
-            return response.status_code >= 400
-        except requests.RequestException:
-            return True
+        return self.link_checker.check(url)
     
     def _calculate_score(self, results: Dict) -> int:
         """Calcola score totale per i link"""
@@ -281,8 +341,8 @@ class LinkAnalyzer:
         
         # Link interni (peso 40%)
         internal_score = 100
-        min_internal = self.config['links']['internal']['min_per_page']
-        max_internal = self.config['links']['internal']['max_per_page']
+        min_internal = self.rules.links.internal_min
+        max_internal = self.rules.links.internal_max
         
         if summary['internal_count'] < min_internal:
             internal_score = (summary['internal_count'] / min_internal) * 100
@@ -301,7 +361,7 @@ class LinkAnalyzer:
         
         # Link esterni (peso 20%)
         external_score = 100
-        max_external = self.config['links']['external']['max_per_page']
+        max_external = self.rules.links.external_max
         if summary['external_count'] > max_external:
             excess = summary['external_count'] - max_external
             external_score = max(60, 100 - (excess * 5))
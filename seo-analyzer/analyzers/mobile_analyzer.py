@@ -4,30 +4,55 @@ Analizza viewport, touch targets, responsive design, usabilità mobile
 """
 
 import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Tuple, Union
+from utils.css import StyleSheet, StylesheetCache, length_px
+from utils.http_client import HTTPClient
+from utils.local_site import LocalSiteIndex, locate_resource
+from utils.context import AnalysisContext
+from utils.parser import ElementIndex, ParsedDocument
+from utils.rules import SEORules
+
+
+# Pseudo-classi dinamiche: lo stato non cambia l'elemento selezionato
+DYNAMIC_PSEUDO_CLASSES = re.compile(r':(?:hover|focus-visible|focus-within|focus|active|visited|target|link)\b', re.I)
+FLEXIBLE_DISPLAY = {'flex', 'inline-flex', 'grid', 'inline-grid'}
+
+# Catene di @import più lunghe non vengono seguite (il foglio conta come non leggibile)
+MAX_IMPORT_DEPTH = 5
 
 
 class MobileAnalyzer:
     """Analizzatore per compatibilità mobile"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
-        
-    def analyze(self, html: str, url: str) -> Dict:
+    def __init__(self, config: Union[Dict, SEORules], http_client: Optional[HTTPClient] = None):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        
+        # Fogli di stile collegati: letti e parsati una volta sola per esecuzione
+        mobile_rules = self.rules.mobile
+        self.load_linked = mobile_rules.load_linked_stylesheets
+        self.fetch_remote = mobile_rules.fetch_remote_stylesheets
+        self.http = http_client or HTTPClient.from_config(self.rules)
+        self.stylesheets = StylesheetCache(self.http if self.fetch_remote else None,
+                                           max_size_bytes=mobile_rules.max_stylesheet_kb * 1024)
+    
+    def analyze(self, html: Union[str, ParsedDocument], url: str,
+                local_index: Optional[LocalSiteIndex] = None) -> Dict:
         """
         Analizza compatibilità mobile
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina
-            
+            local_index: Indice della directory analizzata (risolve i CSS root-relative)
+        
         Returns:
             Dizionario con risultati analisi mobile
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
+        sheets, missing = self._load_stylesheets(context, local_index)
         
         results = {
             'url': url,
@@ -39,21 +64,22 @@ class MobileAnalyzer:
         }
         
         # Analizza viewport
-        results['viewport'] = self._analyze_viewport(soup)
+        results['viewport'] = self._analyze_viewport(context, index)
         
         # Analizza responsive design
-        results['responsive'] = self._analyze_responsive(soup, html)
+        results['responsive'] = self._analyze_responsive(context, index, sheets, missing)
         
         # Analizza usabilità mobile
-        results['usability'] = self._analyze_usability(soup)
+        results['usability'] = self._analyze_usability(context, index, document, sheets)
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
+        results['dependencies'] = sorted(context.dependencies)
         
         return results
     
-    def _analyze_viewport(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_viewport(self, context: AnalysisContext, index: ElementIndex) -> Dict:
         """Analizza meta viewport tag"""
         
         viewport = {
@@ -63,10 +89,10 @@ class MobileAnalyzer:
             'score': 0
         }
         
-        meta_viewport = soup.find('meta', attrs={'name': 'viewport'})
+        meta_viewport = index.find('meta', attrs={'name': 'viewport'})
         
         if not meta_viewport or not meta_viewport.get('content'):
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'mobile',
                 'message': 'Meta viewport tag mancante',
@@ -79,7 +105,7 @@ class MobileAnalyzer:
         viewport['content'] = meta_viewport.get('content')
         
         # Verifica contenuto viewport
-        recommended = self.config['mobile']['responsive']['viewport_config']
+        recommended = self.rules.mobile.viewport_config
         
         # Controlla attributi essenziali
         has_device_width = 'width=device-width' in viewport['content']
@@ -89,7 +115,7 @@ class MobileAnalyzer:
             viewport['is_valid'] = True
             viewport['score'] = 100
         else:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'mobile',
                 'message': 'Configurazione viewport non ottimale',
@@ -100,7 +126,7 @@ class MobileAnalyzer:
         
         # Verifica problemi comuni
         if 'maximum-scale' in viewport['content'] or 'user-scalable=no' in viewport['content']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'mobile',
                 'message': 'Viewport impedisce zoom (problemi accessibilità)',
@@ -111,34 +137,120 @@ class MobileAnalyzer:
         
         return viewport
     
-    def _analyze_responsive(self, soup: BeautifulSoup, html: str) -> Dict:
+    def _load_stylesheets(self, context: AnalysisContext,
+                          local_index: Optional[LocalSiteIndex]) -> Tuple[List[Tuple[StyleSheet, Optional[str]]], int]:
+        """
+        Fogli di stile della pagina in ordine di documento (con i fogli importati)
+        
+        Returns:
+            ([(foglio parsato, attributo media)], numero di CSS collegati o importati non leggibili)
+        """
+        sheets = []
+        missing = 0
+        
+        for tag in context.index.tags('link', 'style'):
+            if tag.name == 'style':
+                missing += self._add_sheet(context, sheets, self.stylesheets.parse(tag.get_text()),
+                                           tag.get('media'), context.url, local_index, ())
+                continue
+            
+            rel = tag.get('rel') or []
+            if isinstance(rel, str):
+                rel = rel.split()
+            href = (tag.get('href') or '').strip()
+            if 'stylesheet' not in [r.lower() for r in rel] or not href:
+                continue
+            
+            sheet, source = (self._load_linked(context, href, context.url, local_index)
+                             if self.load_linked else (None, None))
+            if sheet is None:
+                missing += 1
+            else:
+                missing += self._add_sheet(context, sheets, sheet, tag.get('media'), source, local_index, (source,))
+        
+        return sheets, missing
+    
+    def _add_sheet(self, context: AnalysisContext, sheets: List[Tuple[StyleSheet, Optional[str]]],
+                   sheet: StyleSheet, media: Optional[str], base_url: str,
+                   local_index: Optional[LocalSiteIndex], chain: Tuple[str, ...]) -> int:
+        """
+        Aggiunge il foglio preceduto dai fogli che importa (@import viene prima nella cascata)
+        
+        Gli @import sono risolti rispetto al foglio che li contiene e ricevono
+        anche il suo media; chain contiene i fogli della catena corrente, per
+        fermare i cicli (a.css -> b.css -> a.css).
+        
+        Returns:
+            Numero di @import non leggibili (o oltre MAX_IMPORT_DEPTH)
+        """
+        missing = 0
+        for href, import_media in sheet.imports:
+            if not self.load_linked or len(chain) >= MAX_IMPORT_DEPTH:
+                missing += 1
+                continue
+            
+            imported, source = self._load_linked(context, href, base_url, local_index)
+            if imported is None:
+                missing += 1
+            elif source not in chain:
+                combined = ' and '.join(m for m in (media, import_media) if m) or None
+                missing += self._add_sheet(context, sheets, imported, combined, source, local_index,
+                                           chain + (source,))
+        
+        sheets.append((sheet, media))
+        return missing
+    
+    def _load_linked(self, context: AnalysisContext, href: str, base_url: str,
+                     local_index: Optional[LocalSiteIndex]) -> Tuple[Optional[StyleSheet], Optional[str]]:
+        """
+        CSS collegato o importato: file locale (anche root-relative con l'indice) o URL remoto
+        
+        Returns:
+            (foglio parsato o None, URL da cui risolvere i suoi @import)
+        """
+        kind, location = locate_resource(href, base_url, local_index, context.dependencies)
+        if kind == 'file':
+            context.dependencies.add(location)
+            return self.stylesheets.load_file(location), f"file://{location}"
+        if kind == 'url' and self.fetch_remote:
+            return self.stylesheets.load_url(location), location
+        return None, None
+    
+    @staticmethod
+    def _applies_to_mobile(*media: Optional[str]) -> bool:
+        """True se le condizioni media valgono su uno schermo piccolo (niente print né min-width)"""
+        condition = ' '.join(m for m in media if m).lower()
+        return 'print' not in condition and 'min-width' not in condition
+    
+    def _analyze_responsive(self, context: AnalysisContext, index: ElementIndex,
+                            sheets: List[Tuple[StyleSheet, Optional[str]]], missing: int) -> Dict:
         """Analizza design responsive"""
         
         responsive = {
             'has_media_queries': False,
+            'media_queries_assumed': False,
             'has_responsive_images': False,
             'has_flexible_layout': False,
+            'stylesheets': {
+                'loaded': len(sheets),
+                'unreadable': missing,
+                'media_queries': sum(len(sheet.media_queries) for sheet, _ in sheets)
+            },
             'score': 0
         }
         
-        # Verifica media queries nei <style> inline
-        style_tags = soup.find_all('style')
-        for style in style_tags:
-            style_content = style.get_text()
-            if '@media' in style_content:
-                responsive['has_media_queries'] = True
-                break
+        # Media queries nei CSS inline e collegati (o nell'attributo media di <link>/<style>)
+        responsive['has_media_queries'] = any(
+            sheet.has_media_queries or (media and '(' in media) for sheet, media in sheets
+        )
         
-        # Verifica media queries nei CSS esterni (non possiamo scaricarli qui)
-        # Assumiamo presente se ci sono CSS link
-        if not responsive['has_media_queries']:
-            css_links = soup.find_all('link', rel='stylesheet')
-            if css_links:
-                # Potenzialmente ha media queries nei CSS esterni
-                responsive['has_media_queries'] = True  # Assunzione ottimistica
+        # CSS collegati non leggibili: potrebbero contenere media queries
+        if not responsive['has_media_queries'] and missing:
+            responsive['has_media_queries'] = True
+            responsive['media_queries_assumed'] = True
         
         if not responsive['has_media_queries']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'mobile',
                 'message': 'Nessuna media query CSS rilevata',
@@ -147,7 +259,7 @@ class MobileAnalyzer:
             })
         
         # Verifica immagini responsive
-        images = soup.find_all('img')
+        images = index.find_all('img')
         responsive_imgs = 0
         
         for img in images:
@@ -160,7 +272,7 @@ class MobileAnalyzer:
             responsive_ratio = (responsive_imgs / len(images)) * 100
             
             if responsive_ratio < 50:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'mobile',
                     'message': f'Solo {responsive_ratio:.0f}% immagini responsive (srcset/picture)',
@@ -168,17 +280,11 @@ class MobileAnalyzer:
                     'impact': 'Medio - Immagini responsive riducono dati mobile'
                 })
         
-        # Verifica layout flessibile (euristica: presenza di flexbox/grid nel CSS inline)
-        flexible_keywords = ['flex', 'grid', 'flex-direction', 'display: flex', 'display: grid']
-        has_flexible = False
-        
-        for style in style_tags:
-            style_content = style.get_text().lower()
-            if any(keyword in style_content for keyword in flexible_keywords):
-                has_flexible = True
-                break
-        
-        responsive['has_flexible_layout'] = has_flexible
+        # Verifica layout flessibile: display flex/grid nei CSS della pagina
+        responsive['has_flexible_layout'] = any(
+            rule.declarations.get('display', '').lower() in FLEXIBLE_DISPLAY
+            for sheet, _ in sheets for rule in sheet.rules
+        )
         
         # Score responsive
         score = 0
@@ -193,7 +299,8 @@ class MobileAnalyzer:
         
         return responsive
     
-    def _analyze_usability(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_usability(self, context: AnalysisContext, index: ElementIndex, document: ParsedDocument,
+                           sheets: List[Tuple[StyleSheet, Optional[str]]]) -> Dict:
         """Analizza usabilità mobile"""
         
         usability = {
@@ -204,11 +311,11 @@ class MobileAnalyzer:
         }
         
         # Analizza touch targets (bottoni, link)
-        buttons = soup.find_all(['button', 'a'])
-        min_touch_size = self.config['mobile']['usability']['touch_target_min_size']
+        buttons = index.find_all(['button', 'a'])
+        min_touch_size = self.rules.mobile.touch_target_min_size
         
         # Verifica se ci sono inline style con dimensioni troppo piccole
-        small_targets = 0
+        small_targets = set()
         for btn in buttons:
             style = btn.get('style', '')
             # Cerca width/height in pixel
@@ -220,10 +327,41 @@ class MobileAnalyzer:
                 height = int(height_match.group(1)) if height_match else min_touch_size
                 
                 if width < min_touch_size or height < min_touch_size:
-                    small_targets += 1
+                    small_targets.add(id(btn))
+        
+        # Regole CSS che dimensionano bottoni e link sotto la soglia
+        interactive = {id(btn) for btn in buttons}
+        matches: Dict[str, list] = {}
+        root_px, body_px = 16.0, None
+        small_text = set()
+        min_text_size = self.rules.mobile.min_text_font_size
+        
+        for sheet, sheet_media in sheets:
+            for rule in sheet.rules:
+                if not self._applies_to_mobile(sheet_media, rule.media):
+                    continue
+                declarations = rule.declarations
+                
+                if self._is_small_target(declarations, min_touch_size, root_px):
+                    small_targets.update(id(element) for element in self._select(document, rule.selectors, matches)
+                                         if id(element) in interactive)
+                
+                font_size = declarations.get('font-size')
+                if not font_size:
+                    continue
+                selectors = {selector.lower() for selector in rule.selectors}
+                if selectors & {'html', ':root'}:
+                    root_px = length_px(font_size, root_px, 16.0) or root_px
+                if 'body' in selectors:
+                    body_px = length_px(font_size, root_px, root_px) or body_px
+                
+                size = length_px(font_size, body_px or root_px, root_px)
+                if size is not None and size < min_text_size:
+                    small_text.update(id(element) for element in self._select(document, rule.selectors, matches))
         
+        small_targets = len(small_targets)
         if small_targets > 0:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'mobile',
                 'message': f'{small_targets} elementi con touch target troppo piccolo',
@@ -235,40 +373,44 @@ class MobileAnalyzer:
         usability['touch_targets']['small_count'] = small_targets
         
         # Analizza font size
-        min_font_size = self.config['mobile']['usability']['readable_font_size']
+        min_font_size = self.rules.mobile.readable_font_size
         
-        # Cerca body font-size nel CSS inline
-        style_tags = soup.find_all('style')
+        # font-size di body (CSS inline e collegati, ultima regola valida su mobile)
         has_readable_font = False
+        if body_px is not None:
+            if body_px >= min_font_size:
+                has_readable_font = True
+            else:
+                context.issues.append({
+                    'severity': 'important',
+                    'category': 'mobile',
+                    'message': f'Font size troppo piccolo ({body_px:g}px, minimo {min_font_size}px)',
+                    'recommendation': f'Usa almeno {min_font_size}px per testo body su mobile',
+                    'impact': 'Medio - Font piccoli difficili da leggere su mobile'
+                })
+                usability['score'] -= 15
         
-        for style in style_tags:
-            style_content = style.get_text()
-            # Cerca body { font-size: XXpx }
-            body_font = re.search(r'body\s*{[^}]*font-size:\s*(\d+)px', style_content)
-            if body_font:
-                font_size = int(body_font.group(1))
-                if font_size >= min_font_size:
-                    has_readable_font = True
-                else:
-                    self.issues.append({
-                        'severity': 'important',
-                        'category': 'mobile',
-                        'message': f'Font size troppo piccolo ({font_size}px, minimo {min_font_size}px)',
-                        'recommendation': f'Usa almeno {min_font_size}px per testo body su mobile',
-                        'impact': 'Medio - Font piccoli difficili da leggere su mobile'
-                    })
-                    usability['score'] -= 15
-                break
+        if small_text:
+            context.issues.append({
+                'severity': 'minor',
+                'category': 'mobile',
+                'message': f'{len(small_text)} elementi con testo sotto {min_text_size}px',
+                'recommendation': f'Evita testo sotto {min_text_size}px, anche per note e didascalie',
+                'impact': 'Basso - Testo minuscolo richiede zoom su mobile'
+            })
+            usability['score'] -= 5
         
         usability['font_size']['is_readable'] = has_readable_font
+        usability['font_size']['body_px'] = body_px
+        usability['font_size']['small_text_count'] = len(small_text)
         
         # Verifica mobile popup interstitials (anti-pattern)
         # Cerca comuni pattern di popup/modal
-        modals = soup.find_all(['div'], class_=re.compile(r'modal|popup|overlay|interstitial', re.I))
+        modals = index.find_all(['div'], class_=re.compile(r'modal|popup|overlay|interstitial', re.I))
         if modals:
             # Verifica se sono "invasivi" (mostrati subito)
             # Questo è un'euristica semplificata
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'mobile',
                 'message': 'Possibili popup interstitial rilevati',
@@ -281,6 +423,35 @@ class MobileAnalyzer:
         
         return usability
     
+    @staticmethod
+    def _is_small_target(declarations: Dict[str, str], min_size: int, root_px: float) -> bool:
+        """True se la regola fissa altezza o larghezza sotto la dimensione minima di tocco"""
+        for dimension in ('height', 'width'):
+            values = [length_px(declarations[name], root_px, root_px)
+                      for name in (dimension, f'min-{dimension}') if name in declarations]
+            values = [value for value in values if value is not None]
+            if values and max(values) < min_size:
+                return True
+        return False
+    
+    @staticmethod
+    def _select(document: ParsedDocument, selectors: List[str], matches: Dict[str, list]) -> list:
+        """Elementi della pagina selezionati dalla regola (memorizzati per selettore)"""
+        elements = []
+        for selector in selectors:
+            if selector not in matches:
+                found = []
+                # Gli pseudo-elementi (::before) non sono l'elemento toccato
+                subject = DYNAMIC_PSEUDO_CLASSES.sub('', selector).strip()
+                if subject and '::' not in subject:
+                    try:
+                        found = document.soup.select(subject)
+                    except Exception:
+                        found = []
+                matches[selector] = found
+            elements.extend(matches[selector])
+        return elements
+    
     def _calculate_score(self, results: Dict) -> int:
         """Calcola score totale mobile"""
         
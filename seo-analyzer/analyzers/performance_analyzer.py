@@ -3,11 +3,17 @@ Performance Analyzer - Analisi Performance e Velocità
 Analizza velocità caricamento, Core Web Vitals, ottimizzazione risorse
 """
 
+import os
 import time
 import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse
+from typing import Dict, List, Optional, Set, Union
+from utils.compression import AssetSizer, BROTLI_AVAILABLE, transfer_size
+from utils.http_client import HTTPClient
+from utils.local_site import LocalSiteIndex, locate_resource
+from utils.context import AnalysisContext
+from utils.parser import ElementIndex, ParsedDocument
+from utils.rules import SEORules
+from urllib.parse import unquote, urljoin, urlparse
 try:
     import requests
     REQUESTS_AVAILABLE = True
@@ -18,58 +24,72 @@ except ImportError:
 class PerformanceAnalyzer:
     """Analizzatore per performance e velocità"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
-        
-    def analyze(self, html: str, url: str, measure_live: bool = False) -> Dict:
+    def __init__(self, config: Union[Dict, SEORules], http_client: Optional[HTTPClient] = None):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.http = http_client or HTTPClient.from_config(self.rules)
+        
+        # Dimensioni compresse reali, condivise tra le pagine dell'esecuzione
+        self.compression_enabled = self.rules.performance.compression_enabled
+        self.sizer = AssetSizer.from_config(self.config, http_client=self.http)
+    
+    def analyze(self, html: Union[str, ParsedDocument], url: str, measure_live: bool = False,
+                local_index: Optional[LocalSiteIndex] = None) -> Dict:
         """
         Analizza performance della pagina
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina
             measure_live: Se True, misura tempi reali (più lento)
-            
+            local_index: Indice della directory analizzata (risolve le risorse root-relative)
+        
         Returns:
             Dizionario con risultati analisi performance
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
         results = {
             'url': url,
             'loading': {},
             'resources': {},
             'caching': {},
+            'transfer': {},
             'core_web_vitals': {},
             'issues': [],
             'score': 0
         }
         
         # Analizza risorse
-        results['resources'] = self._analyze_resources(soup, html)
+        results['resources'] = self._analyze_resources(context, index, document.html)
         
         # Analizza caching (dal HTML)
-        results['caching'] = self._analyze_caching(soup)
+        results['caching'] = self._analyze_caching(context, index)
         
         # Misura tempo di caricamento (se richiesto)
         if measure_live and REQUESTS_AVAILABLE and url.startswith('http'):
-            results['loading'] = self._measure_loading_time(url)
+            results['loading'] = self._measure_loading_time(context, url)
         
         # Analizza CSS e JS
-        self._analyze_css_js(soup)
+        self._analyze_css_js(context, index)
+        
+        # Dimensioni reali (gzip/brotli) di HTML, CSS, JS e font
+        if self.compression_enabled:
+            results['transfer'] = self._measure_transfer(context, results['resources'], local_index)
         
         # Verifica compressione
-        self._check_compression(html)
+        self._check_compression(context, document, results['transfer'])
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
+        results['dependencies'] = sorted(context.dependencies)
         
         return results
     
-    def _analyze_resources(self, soup: BeautifulSoup, html: str) -> Dict:
+    def _analyze_resources(self, context: AnalysisContext, index: ElementIndex, html: str) -> Dict:
         """Analizza risorse (CSS, JS, immagini, font)"""
         
         resources = {
@@ -84,33 +104,33 @@ class PerformanceAnalyzer:
         }
         
         # CSS esterni
-        css_links = soup.find_all('link', rel='stylesheet')
+        css_links = index.find_all('link', rel='stylesheet')
         resources['css_files'] = [link.get('href') for link in css_links if link.get('href')]
         resources['total_css'] = len(resources['css_files'])
         
         # JS esterni
-        js_scripts = soup.find_all('script', src=True)
+        js_scripts = index.find_all('script', src=True)
         resources['js_files'] = [script.get('src') for script in js_scripts]
         resources['total_js'] = len(resources['js_files'])
         
         # CSS inline
-        style_tags = soup.find_all('style')
+        style_tags = index.find_all('style')
         for style in style_tags:
             resources['inline_css_size'] += len(style.get_text())
         
         # JS inline
-        inline_scripts = soup.find_all('script', src=False)
+        inline_scripts = index.find_all('script', src=False)
         for script in inline_scripts:
             resources['inline_js_size'] += len(script.get_text())
         
         # Font files
-        font_links = soup.find_all('link', href=re.compile(r'\.(woff2?|ttf|eot|otf)$', re.I))
+        font_links = index.find_all('link', href=re.compile(r'\.(woff2?|ttf|eot|otf)$', re.I))
         resources['font_files'] = [link.get('href') for link in font_links if link.get('href')]
-        resources['total_fonts'] = len(resources['total_fonts'])
+        resources['total_fonts'] = len(resources['font_files'])
         
         # Raccomandazioni
         if resources['total_css'] > 3:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'performance',
                 'message': f'Troppi file CSS ({resources["total_css"]}, raccomandato: max 2-3)',
@@ -119,7 +139,7 @@ class PerformanceAnalyzer:
             })
         
         if resources['total_js'] > 5:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'performance',
                 'message': f'Troppi file JavaScript ({resources["total_js"]}, raccomandato: max 3-5)',
@@ -132,7 +152,7 @@ class PerformanceAnalyzer:
             # Controlla se almeno un CSS ha .min.css
             minified_css = any('.min.css' in css for css in resources['css_files'])
             if not minified_css:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'important',
                     'category': 'performance',
                     'message': 'CSS non minificato rilevato',
@@ -143,7 +163,7 @@ class PerformanceAnalyzer:
         if resources['total_js'] > 0:
             minified_js = any('.min.js' in js for js in resources['js_files'])
             if not minified_js:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'important',
                     'category': 'performance',
                     'message': 'JavaScript non minificato rilevato',
@@ -153,7 +173,7 @@ class PerformanceAnalyzer:
         
         # Inline CSS/JS eccessivo
         if resources['inline_css_size'] > 5000:  # >5KB
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'performance',
                 'message': f'CSS inline eccessivo ({resources["inline_css_size"]} bytes)',
@@ -162,7 +182,7 @@ class PerformanceAnalyzer:
             })
         
         if resources['inline_js_size'] > 10000:  # >10KB
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'performance',
                 'message': f'JavaScript inline eccessivo ({resources["inline_js_size"]} bytes)',
@@ -172,7 +192,7 @@ class PerformanceAnalyzer:
         
         return resources
     
-    def _analyze_caching(self, soup: BeautifulSoup) -> Dict:
+    def _analyze_caching(self, context: AnalysisContext, index: ElementIndex) -> Dict:
         """Analizza strategia di caching"""
         
         caching = {
@@ -182,7 +202,7 @@ class PerformanceAnalyzer:
         }
         
         # Verifica service worker
-        scripts = soup.find_all('script')
+        scripts = index.find_all('script')
         for script in scripts:
             script_content = script.get_text()
             if 'serviceWorker' in script_content or 'navigator.serviceWorker' in script_content:
@@ -191,10 +211,10 @@ class PerformanceAnalyzer:
                 break
         
         # Verifica cache manifest (obsoleto ma segnaliamo)
-        manifest = soup.find('html', manifest=True)
+        manifest = index.find('html', manifest=True)
         if manifest:
             caching['has_cache_manifest'] = True
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'performance',
                 'message': 'Cache manifest rilevato (tecnologia obsoleta)',
@@ -204,7 +224,7 @@ class PerformanceAnalyzer:
         
         return caching
     
-    def _measure_loading_time(self, url: str) -> Dict:
+    def _measure_loading_time(self, context: AnalysisContext, url: str) -> Dict:
         """Misura tempo di caricamento reale"""
         
         loading = {
@@ -215,7 +235,7 @@ class PerformanceAnalyzer:
         
         try:
             start = time.time()
-            response = requests.get(url, timeout=30)
+            response = self.http.get(url)
             end = time.time()
             
             loading['time_seconds'] = round(end - start, 2)
@@ -223,11 +243,11 @@ class PerformanceAnalyzer:
             loading['size_kb'] = round(len(response.content) / 1024, 2)
             
             # Verifica tempo di caricamento
-            max_time = self.config['performance']['loading']['max_load_time_seconds']
-            optimal_time = self.config['performance']['loading']['optimal_load_time_seconds']
+            max_time = self.rules.performance.max_load_time_seconds
+            optimal_time = self.rules.performance.optimal_load_time_seconds
             
             if loading['time_seconds'] > max_time:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'critical',
                     'category': 'performance',
                     'message': f'Tempo di caricamento eccessivo ({loading["time_seconds"]}s, max {max_time}s)',
@@ -235,17 +255,17 @@ class PerformanceAnalyzer:
                     'impact': 'Critico - Pagine lente aumentano bounce rate del 50%+'
                 })
             elif loading['time_seconds'] > optimal_time:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'important',
                     'category': 'performance',
                     'message': f'Tempo di caricamento migliorabile ({loading["time_seconds"]}s, target {optimal_time}s)',
                     'recommendation': 'Ottimizza performance: lazy loading, comprimi risorse',
                     'impact': 'Medio - Ogni secondo extra riduce conversioni del 7%'
                 })
-            
+        
         except Exception as e:
             loading['error'] = str(e)
-            self.issues.append({
+            context.issues.append({
                 'severity': 'critical',
                 'category': 'performance',
                 'message': f'Impossibile misurare tempo di caricamento: {str(e)[:100]}',
@@ -255,15 +275,15 @@ class PerformanceAnalyzer:
         
         return loading
     
-    def _analyze_css_js(self, soup: BeautifulSoup):
+    def _analyze_css_js(self, context: AnalysisContext, index: ElementIndex):
         """Analizza posizionamento e attributi CSS/JS"""
         
         # Verifica CSS nel <head>
-        head = soup.find('head')
+        head = index.find('head')
         if head:
             css_in_head = head.find_all('link', rel='stylesheet')
             if len(css_in_head) == 0:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'performance',
                     'message': 'Nessun CSS nel <head>',
@@ -272,7 +292,7 @@ class PerformanceAnalyzer:
                 })
         
         # Verifica JS con defer/async
-        scripts = soup.find_all('script', src=True)
+        scripts = index.find_all('script', src=True)
         scripts_without_defer_async = []
         
         for script in scripts:
@@ -280,7 +300,7 @@ class PerformanceAnalyzer:
                 scripts_without_defer_async.append(script.get('src', 'inline')[:50])
         
         if scripts_without_defer_async:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'performance',
                 'message': f'{len(scripts_without_defer_async)} script senza defer/async',
@@ -288,23 +308,129 @@ class PerformanceAnalyzer:
                 'impact': 'Alto - Script bloccanti rallentano il rendering della pagina'
             })
     
-    def _check_compression(self, html: str):
-        """Verifica se il contenuto può beneficiare di compressione"""
+    def _measure_transfer(self, context: AnalysisContext, resources: Dict,
+                          local_index: Optional[LocalSiteIndex]) -> Dict:
+        """
+        Byte trasferiti dalla pagina: HTML e risorse collegate, compressi davvero
         
-        html_size_kb = len(html.encode('utf-8')) / 1024
+        Le compressioni vengono avviate tutte insieme sul pool di thread e
+        raccolte alla fine; i font dichiarati nei CSS (@font-face) vengono
+        aggiunti in una seconda tornata.
+        """
+        url = context.url
+        html_sizes = self.sizer.measure(context.document.html.encode('utf-8'))
+        
+        pending = []
+        seen = set()
+        unresolved = 0
+        
+        def submit(kind_label: str, kind: Optional[str], location: Optional[str]):
+            nonlocal unresolved
+            if kind is None:
+                unresolved += 1
+            elif location not in seen:
+                seen.add(location)
+                if kind == 'file':
+                    context.dependencies.add(location)
+                pending.append((kind_label, kind, location, self.sizer.asset(kind, location)))
+        
+        for kind_label, key in (('css', 'css_files'), ('js', 'js_files'), ('font', 'font_files')):
+            for href in resources.get(key, []):
+                submit(kind_label, *locate_resource(href, url, local_index, context.dependencies))
+        
+        assets = []
+        position = 0
+        while position < len(pending):
+            kind_label, kind, location, future = pending[position]
+            position += 1
+            
+            sizes = future.result()
+            if sizes is None:
+                unresolved += 1
+                continue
+            
+            for font in sizes.get('fonts', []):
+                submit('font', *self._font_location(font, kind, location, local_index, context.dependencies))
+            assets.append({
+                'type': kind_label,
+                'location': location,
+                'raw': sizes['raw'],
+                'gzip': sizes['gzip'],
+                'brotli': sizes['brotli'],
+                'transfer': transfer_size(sizes, kind_label)
+            })
         
-        # Stima risparmio con compressione (gzip tipicamente 70-80%)
-        estimated_compressed = html_size_kb * 0.25
-        savings = html_size_kb - estimated_compressed
+        html_sizes = html_sizes.result()
+        html_entry = {'type': 'html', 'location': url}
+        html_entry.update({key: html_sizes[key] for key in ('raw', 'gzip', 'brotli')})
+        html_entry['transfer'] = transfer_size(html_sizes)
+        
+        entries = [html_entry] + assets
+        return {
+            'html': html_entry,
+            'assets': assets,
+            'unresolved': unresolved,
+            'total_raw': sum(entry['raw'] for entry in entries),
+            'total_gzip': sum(transfer_size(entry, entry['type'], 'gzip') for entry in entries),
+            'total_brotli': sum(transfer_size(entry, entry['type'], 'brotli') for entry in entries)
+            if BROTLI_AVAILABLE else None,
+            'transfer_bytes': sum(entry['transfer'] for entry in entries)
+        }
+    
+    @staticmethod
+    def _font_location(ref: str, kind: str, css_location: str, local_index: Optional[LocalSiteIndex],
+                       dependencies: Optional[Set[str]] = None):
+        """Posizione di un font referenziato da un CSS (relativo al CSS, non alla pagina)"""
+        if kind == 'url' or urlparse(ref).scheme or ref.startswith('//'):
+            absolute_url = urljoin(css_location if kind == 'url' else 'https:', ref)
+            return ('url', absolute_url) if absolute_url.startswith('http') else (None, None)
+        
+        if ref.startswith('/'):
+            # Root-relative: serve la radice del sito
+            target = local_index.resolve(ref, '', dependencies)[0] if local_index is not None else None
+            return ('file', str(local_index.root / target)) if target else (None, None)
+        
+        return 'file', os.path.normpath(os.path.join(os.path.dirname(css_location), unquote(ref)))
+    
+    def _check_compression(self, context: AnalysisContext, document: ParsedDocument, transfer: Dict):
+        """Verifica peso della pagina e risparmio reale della compressione"""
+        
+        html_size_kb = document.size_bytes / 1024
         
         if html_size_kb > 100:  # >100KB di HTML
-            self.issues.append({
+            if transfer:
+                html = transfer['html']
+                compressed = f"gzip {html['gzip'] / 1024:.0f}KB"
+                if html['brotli'] is not None:
+                    compressed += f", brotli {html['brotli'] / 1024:.0f}KB"
+                recommendation = f'Abilita compressione Gzip/Brotli sul server ({compressed})'
+            else:
+                # Senza misura reale: gzip tipicamente 70-80%
+                recommendation = f'Abilita compressione Gzip/Brotli (risparmio stimato: {html_size_kb * 0.75:.0f}KB)'
+            
+            context.issues.append({
                 'severity': 'important',
                 'category': 'performance',
                 'message': f'HTML di grandi dimensioni ({html_size_kb:.0f}KB)',
-                'recommendation': f'Abilita compressione Gzip/Brotli (risparmio stimato: {savings:.0f}KB)',
+                'recommendation': recommendation,
                 'impact': 'Alto - Compressione riduce dimensioni del 70-80%'
             })
+        
+        if not transfer:
+            return
+        
+        max_weight_kb = self.rules.performance.max_page_weight_kb
+        transfer_kb = transfer['transfer_bytes'] / 1024
+        if transfer_kb > max_weight_kb:
+            heaviest = max(transfer['assets'], key=lambda asset: asset['transfer'], default=None)
+            detail = f" (più pesante: {heaviest['location']}, {heaviest['transfer'] / 1024:.0f}KB)" if heaviest else ''
+            context.issues.append({
+                'severity': 'important',
+                'category': 'performance',
+                'message': f'Pagina pesante: {transfer_kb:.0f}KB trasferiti tra HTML, CSS, JS e font{detail}',
+                'recommendation': f'Riduci il peso sotto {max_weight_kb}KB: rimuovi CSS/JS inutilizzati e sottoinsiemi di font',
+                'impact': 'Alto - Ogni KB trasferito rallenta il caricamento su rete mobile'
+            })
     
     def _calculate_score(self, results: Dict) -> int:
         """Calcola score totale performance"""
@@ -332,8 +458,8 @@ class PerformanceAnalyzer:
         loading = results['loading']
         if 'time_seconds' in loading and loading['time_seconds'] > 0:
             load_time = loading['time_seconds']
-            max_time = self.config['performance']['loading']['max_load_time_seconds']
-            optimal = self.config['performance']['loading']['optimal_load_time_seconds']
+            max_time = self.rules.performance.max_load_time_seconds
+            optimal = self.rules.performance.optimal_load_time_seconds
             
             if load_time <= optimal:
                 load_score = 100
@@ -5,30 +5,33 @@ Analizza JSON-LD, Microdata, RDFa per rich snippets
 
 import json
 import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
+from typing import Dict, List, Union
+from utils.context import AnalysisContext
+from utils.parser import ElementIndex, ParsedDocument
+from utils.rules import SEORules
 
 
 class SchemaAnalyzer:
     """Analizzatore per schema markup e dati strutturati"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
+    def __init__(self, config: Union[Dict, SEORules]):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
         
-    def analyze(self, html: str, url: str) -> Dict:
+    def analyze(self, html: Union[str, ParsedDocument], url: str) -> Dict:
         """
         Analizza schema markup
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina
             
         Returns:
             Dizionario con risultati analisi schema
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
         results = {
             'url': url,
@@ -42,13 +45,13 @@ class SchemaAnalyzer:
         }
         
         # Analizza JSON-LD
-        results['json_ld'] = self._analyze_json_ld(soup)
+        results['json_ld'] = self._analyze_json_ld(context, index)
         
         # Analizza Microdata
-        results['microdata'] = self._analyze_microdata(soup)
+        results['microdata'] = self._analyze_microdata(context, index)
         
         # Analizza RDFa
-        results['rdfa'] = self._analyze_rdfa(soup)
+        results['rdfa'] = self._analyze_rdfa(context, index)
         
         # Verifica presenza schema
         results['has_schema'] = len(results['json_ld']) > 0 or \
@@ -64,7 +67,7 @@ class SchemaAnalyzer:
         
         # Verifica se schema è presente
         if not results['has_schema']:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'schema',
                 'message': 'Nessun schema markup rilevato',
@@ -74,21 +77,21 @@ class SchemaAnalyzer:
             })
         else:
             # Verifica tipi appropriati
-            self._check_schema_types(results['schema_types'])
+            self._check_schema_types(context, results['schema_types'])
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
         
         return results
     
-    def _analyze_json_ld(self, soup: BeautifulSoup) -> List[Dict]:
+    def _analyze_json_ld(self, context: AnalysisContext, index: ElementIndex) -> List[Dict]:
         """Analizza JSON-LD schema markup"""
         
         json_ld_schemas = []
         
         # Trova tutti i script type application/ld+json
-        scripts = soup.find_all('script', type='application/ld+json')
+        scripts = index.find_all('script', type='application/ld+json')
         
         for script in scripts:
             try:
@@ -99,7 +102,7 @@ class SchemaAnalyzer:
                     
                     # Valida schema base
                     if '@context' not in schema:
-                        self.issues.append({
+                        context.issues.append({
                             'severity': 'minor',
                             'category': 'schema',
                             'message': 'Schema JSON-LD senza @context',
@@ -108,7 +111,7 @@ class SchemaAnalyzer:
                         })
                     
                     if '@type' not in schema:
-                        self.issues.append({
+                        context.issues.append({
                             'severity': 'minor',
                             'category': 'schema',
                             'message': 'Schema JSON-LD senza @type',
@@ -117,7 +120,7 @@ class SchemaAnalyzer:
                         })
             
             except json.JSONDecodeError as e:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'important',
                     'category': 'schema',
                     'message': f'JSON-LD non valido: {str(e)[:100]}',
@@ -127,13 +130,13 @@ class SchemaAnalyzer:
         
         return json_ld_schemas
     
-    def _analyze_microdata(self, soup: BeautifulSoup) -> List[Dict]:
+    def _analyze_microdata(self, context: AnalysisContext, index: ElementIndex) -> List[Dict]:
         """Analizza Microdata (itemscope, itemprop)"""
         
         microdata_items = []
         
         # Trova tutti gli elementi con itemscope
-        items = soup.find_all(attrs={'itemscope': True})
+        items = index.find_all(attrs={'itemscope': True})
         
         for item in items:
             itemtype = item.get('itemtype', '')
@@ -154,7 +157,7 @@ class SchemaAnalyzer:
         
         if microdata_items:
             # Microdata è meno preferito rispetto a JSON-LD
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'schema',
                 'message': 'Usa Microdata (raccomandato: JSON-LD)',
@@ -164,13 +167,13 @@ class SchemaAnalyzer:
         
         return microdata_items
     
-    def _analyze_rdfa(self, soup: BeautifulSoup) -> List[Dict]:
+    def _analyze_rdfa(self, context: AnalysisContext, index: ElementIndex) -> List[Dict]:
         """Analizza RDFa markup"""
         
         rdfa_items = []
         
         # Trova elementi con attributi RDFa
-        items = soup.find_all(attrs={'typeof': True})
+        items = index.find_all(attrs={'typeof': True})
         
         for item in items:
             typeof = item.get('typeof', '')
@@ -190,7 +193,7 @@ class SchemaAnalyzer:
             rdfa_items.append(rdfa)
         
         if rdfa_items:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'schema',
                 'message': 'Usa RDFa (raccomandato: JSON-LD)',
@@ -200,10 +203,10 @@ class SchemaAnalyzer:
         
         return rdfa_items
     
-    def _check_schema_types(self, schema_types: List[str]):
+    def _check_schema_types(self, context: AnalysisContext, schema_types: List[str]):
         """Verifica tipi di schema appropriati"""
         
-        appropriate_types = self.config['schema']['structured_data'].get('appropriate_types', [])
+        appropriate_types = self.rules.schema.appropriate_types
         
         if not schema_types:
             return
@@ -215,7 +218,7 @@ class SchemaAnalyzer:
         has_common = any(st in common_types for st in schema_types)
         
         if not has_common:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'schema',
                 'message': f'Schema types rilevati: {", ".join(schema_types)}',
@@ -225,7 +228,7 @@ class SchemaAnalyzer:
         
         # Verifica Organization schema
         if 'Organization' not in schema_types and 'LocalBusiness' not in schema_types:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'schema',
                 'message': 'Schema Organization mancante',
@@ -235,7 +238,7 @@ class SchemaAnalyzer:
         
         # Verifica BreadcrumbList per navigazione
         if 'BreadcrumbList' not in schema_types:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'schema',
                 'message': 'Schema BreadcrumbList mancante',
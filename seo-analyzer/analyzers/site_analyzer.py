@@ -0,0 +1,355 @@
+"""
+Site Analyzer - Verifiche SEO a livello di sito
+Confronta le pagine tra loro: title, meta description e H1 duplicati,
+contenuti quasi duplicati (MinHash + LSH) e struttura dei link interni
+(PageRank, profondità di click, pagine orfane)
+"""
+
+import hashlib
+import re
+import unicodedata
+from array import array
+from itertools import combinations
+from typing import Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+from utils.fingerprint import minhash_similarity
+from utils.link_graph import LinkGraph
+from utils.rules import SEORules
+
+
+# Campi confrontati tra pagine: (chiave, categoria issue, etichetta, raccomandazione)
+DUPLICATE_FIELDS = [
+    ('title', 'title', 'Title', 'Scrivi un title unico per ogni pagina con la sua keyword principale'),
+    ('meta_description', 'meta', 'Meta description', 'Scrivi una meta description specifica per ogni pagina'),
+    ('h1', 'headings', 'H1', 'Usa un H1 che descriva il contenuto specifico della pagina'),
+]
+
+# Oltre questa dimensione un bucket LSH viene confrontato a stella (lineare)
+MAX_BUCKET_PAIRS = 50
+
+
+class SiteAnalyzer:
+    """
+    Analizzatore per verifiche che richiedono tutte le pagine del sito
+    
+    Le pagine vengono aggiunte una alla volta (anche in streaming) e
+    ridotte a pochi segnali: per ogni campo resta un indice hash -> pagine,
+    senza conservare HTML né risultati completi.
+    """
+    
+    def __init__(self, config: Union[Dict, SEORules]):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.urls: List[str] = []
+        # campo -> hash del valore normalizzato -> id pagina o [valore, [id pagine]]
+        self._index: Dict[str, Dict[bytes, Union[int, list]]] = {field: {} for field, *_ in DUPLICATE_FIELDS}
+        
+        # Firme MinHash (32 bit per valore) e bucket LSH per banda
+        near_duplicate = self.rules.content.text_content.near_duplicate
+        self.bands = near_duplicate.bands
+        self.similarity_threshold = near_duplicate.similarity_threshold
+        self._signatures: Dict[int, array] = {}
+        self._lsh: Dict[bytes, Union[int, list]] = {}
+        
+        # Grafo dei link interni; home_url è la radice per la profondità di click
+        self.link_graph = LinkGraph()
+        self.home_url: Optional[str] = None
+    
+    @staticmethod
+    def page_signals(results: Dict) -> Dict[str, Optional[str]]:
+        """
+        Segnali confrontabili di una pagina
+        
+        Accetta sia i risultati completi di _analyze_html sia i risultati
+        compatti di summarize_result (che contengono già questi campi).
+        """
+        content = results.get('content')
+        if not isinstance(content, dict) or 'title' not in content:
+            return {field: results.get(field) for field, *_ in DUPLICATE_FIELDS}
+        
+        h1 = content.get('headings', {}).get('h1', [])
+        return {
+            'title': content.get('title', {}).get('content'),
+            'meta_description': content.get('meta_description', {}).get('content'),
+            'h1': h1[0] if h1 else None
+        }
+    
+    @staticmethod
+    def _normalize(value: str) -> str:
+        value = unicodedata.normalize('NFKC', value).lower()
+        return re.sub(r'\s+', ' ', value).strip()
+    
+    @staticmethod
+    def internal_links(results: Dict) -> Optional[List[str]]:
+        """
+        Link interni seguibili della pagina (None per i risultati compatti)
+        
+        I link nofollow e quelli con schema diverso dalla pagina (mailto:,
+        tel:, ...) non fanno parte del grafo.
+        """
+        links = results.get('links')
+        if not isinstance(links, dict) or 'internal_links' not in links:
+            return None
+        
+        scheme = urlparse(results['url']).scheme
+        return [
+            link['absolute_url'] for link in links['internal_links']
+            if not link.get('has_nofollow') and urlparse(link['absolute_url']).scheme == scheme
+        ]
+    
+    def add_page(self, results: Dict, links: Optional[List[str]] = None):
+        """
+        Registra i segnali di una pagina analizzata
+        
+        Args:
+            results: Risultati (completi o compatti) della pagina
+            links: Link interni già estratti (es. dal crawler); se None
+                   vengono letti dai risultati del LinkAnalyzer
+        """
+        if links is None:
+            links = self.internal_links(results)
+        if links is not None:
+            self.link_graph.add_page(results['url'], links)
+        
+        page_id = len(self.urls)
+        self.urls.append(results['url'])
+        
+        for field, value in self.page_signals(results).items():
+            if not value:
+                continue
+            
+            normalized = self._normalize(value)
+            if not normalized:
+                continue
+            
+            key = hashlib.blake2b(normalized.encode('utf-8'), digest_size=12).digest()
+            bucket = self._index[field].get(key)
+            
+            if bucket is None:
+                # Primo valore: solo l'id, il testo serve solo se diventa duplicato
+                self._index[field][key] = page_id
+            elif isinstance(bucket, int):
+                self._index[field][key] = [value, [bucket, page_id]]
+            else:
+                bucket[1].append(page_id)
+        
+        fingerprint = (results.get('content') or {}).get('fingerprint')
+        if fingerprint:
+            self._add_fingerprint(page_id, fingerprint)
+    
+    def _add_fingerprint(self, page_id: int, fingerprint: List[int]):
+        """Indicizza la firma MinHash nei bucket LSH (una chiave per banda)"""
+        signature = array('I', fingerprint)
+        self._signatures[page_id] = signature
+        
+        rows = max(1, len(signature) // self.bands)
+        for band in range(self.bands):
+            chunk = signature[band * rows:(band + 1) * rows]
+            if not chunk:
+                break
+            key = hashlib.blake2b(band.to_bytes(2, 'little') + chunk.tobytes(), digest_size=8).digest()
+            
+            bucket = self._lsh.get(key)
+            if bucket is None:
+                self._lsh[key] = page_id
+            elif isinstance(bucket, int):
+                self._lsh[key] = [bucket, page_id]
+            else:
+                bucket.append(page_id)
+    
+    def near_duplicates(self) -> List[Dict]:
+        """
+        Coppie di pagine con contenuto quasi duplicato
+        
+        Solo le pagine che condividono almeno una banda LSH vengono
+        confrontate: il costo dipende dai candidati, non da tutte le coppie.
+        """
+        candidates = set()
+        for bucket in self._lsh.values():
+            if isinstance(bucket, int):
+                continue
+            if len(bucket) <= MAX_BUCKET_PAIRS:
+                candidates.update(combinations(bucket, 2))
+            else:
+                candidates.update((bucket[0], other) for other in bucket[1:])
+        
+        pairs = []
+        for first, second in candidates:
+            similarity = minhash_similarity(self._signatures[first], self._signatures[second])
+            if similarity >= self.similarity_threshold:
+                pairs.append({
+                    'urls': [self.urls[first], self.urls[second]],
+                    'similarity': round(similarity, 2)
+                })
+        
+        pairs.sort(key=lambda pair: pair['similarity'], reverse=True)
+        return pairs
+    
+    @property
+    def page_count(self) -> int:
+        return len(self.urls)
+    
+    def _guess_home(self) -> Optional[str]:
+        """Home del sito: la pagina radice ('/' o index.html) meno profonda"""
+        graph = self.link_graph
+        candidates = [
+            url for node, url in enumerate(graph.urls)
+            if graph.analyzed[node] and (urlparse(url).path in ('', '/') or urlparse(url).path.endswith('/index.html'))
+        ]
+        if not candidates:
+            return next((url for node, url in enumerate(graph.urls) if graph.analyzed[node]), None)
+        return min(candidates, key=lambda url: urlparse(url).path.count('/'))
+    
+    def link_structure(self) -> Dict:
+        """
+        PageRank, profondità di click, pagine orfane e link uscenti eccessivi
+        
+        Le metriche riguardano le pagine analizzate; gli URL solo scoperti
+        (linkati ma non analizzati) partecipano al PageRank come nodi.
+        """
+        graph = self.link_graph
+        graph_rules = self.rules.links.graph
+        max_outbound = self.rules.links.internal_max
+        home = self.home_url or self._guess_home()
+        
+        ranks = graph.pagerank(damping=graph_rules.damping_factor,
+                               max_iterations=graph_rules.max_iterations,
+                               tolerance=graph_rules.tolerance)
+        depths = graph.click_depths(home) if home else [-1] * graph.node_count
+        in_degrees = graph.in_degrees()
+        out_degrees = graph.out_degrees()
+        home_id = graph.find(home) if home else None
+        
+        pages = [node for node in range(graph.node_count) if graph.analyzed[node]]
+        top = sorted(pages, key=lambda node: ranks[node], reverse=True)[:graph_rules.top_pages]
+        
+        depth_counts: Dict[int, int] = {}
+        for node in pages:
+            depth_counts[depths[node]] = depth_counts.get(depths[node], 0) + 1
+        
+        return {
+            'home': home,
+            'pages': len(pages),
+            'urls': graph.node_count,
+            'edges': graph.edge_count,
+            'top_pages': [{'url': graph.urls[node], 'pagerank': round(ranks[node], 6),
+                           'inbound': in_degrees[node], 'depth': depths[node]} for node in top],
+            'depth_distribution': dict(sorted(depth_counts.items())),
+            'orphans': [graph.urls[node] for node in pages
+                        if in_degrees[node] == 0 and node != home_id],
+            'unreachable': [graph.urls[node] for node in pages
+                            if depths[node] < 0 and in_degrees[node] > 0],
+            'deep_pages': [graph.urls[node] for node in pages
+                           if depths[node] > graph_rules.max_click_depth],
+            'excessive_outbound': [{'url': graph.urls[node], 'count': out_degrees[node]} for node in pages
+                                   if out_degrees[node] > max_outbound]
+        }
+    
+    def analyze(self) -> Dict:
+        """
+        Cluster di pagine con title, description o H1 identici e coppie di
+        pagine con contenuto quasi duplicato
+        
+        Returns:
+            Dizionario con cluster duplicati per campo, quasi duplicati e
+            issue a livello sito
+        """
+        results = {
+            'pages': self.page_count,
+            'duplicates': {},
+            'issues': []
+        }
+        
+        checks = {
+            'title': self.rules.content.title.unique_per_page,
+            'meta_description': self.rules.content.meta_description.unique_per_page,
+            'h1': True
+        }
+        
+        for field, category, label, recommendation in DUPLICATE_FIELDS:
+            clusters = [
+                {'value': bucket[0], 'count': len(bucket[1]), 'urls': [self.urls[i] for i in bucket[1]]}
+                for bucket in self._index[field].values()
+                if not isinstance(bucket, int)
+            ]
+            clusters.sort(key=lambda cluster: cluster['count'], reverse=True)
+            results['duplicates'][field] = clusters
+            
+            if not checks[field]:
+                continue
+            
+            for cluster in clusters:
+                results['issues'].append({
+                    'severity': 'minor' if field == 'h1' else 'important',
+                    'category': category,
+                    'scope': 'site',
+                    'message': f'{label} duplicato su {cluster["count"]} pagine: "{cluster["value"][:80]}"',
+                    'url': cluster['urls'][0],
+                    'urls': cluster['urls'],
+                    'recommendation': recommendation,
+                    'impact': 'Medio - Pagine con segnali identici competono tra loro nei risultati'
+                })
+        
+        results['near_duplicates'] = self.near_duplicates()
+        
+        if self.link_graph.page_count > 1:
+            results['link_graph'] = self._link_graph_issues(self.link_structure(), results['issues'])
+        
+        if self.rules.content.text_content.avoid_duplicate_content:
+            for pair in results['near_duplicates']:
+                results['issues'].append({
+                    'severity': 'important',
+                    'category': 'content',
+                    'scope': 'site',
+                    'message': f'Contenuto quasi duplicato (similarità {pair["similarity"]:.0%})',
+                    'url': pair['urls'][0],
+                    'urls': pair['urls'],
+                    'recommendation': 'Differenzia i contenuti o indica la versione principale con rel="canonical"',
+                    'impact': 'Alto - Contenuti duplicati dividono il ranking tra più pagine'
+                })
+        
+        return results
+    
+    def _link_graph_issues(self, structure: Dict, issues: List[Dict]) -> Dict:
+        """Aggiunge le issue sulla struttura dei link interni (una per tipo)"""
+        graph_rules = self.rules.links.graph
+        max_depth = graph_rules.max_click_depth
+        max_outbound = self.rules.links.internal_max
+        
+        checks = [
+            ('orphans', 'important', graph_rules.report_orphans,
+             'pagine orfane (nessun link interno in entrata)',
+             'Collega le pagine orfane da pagine correlate, menu o hub di categoria',
+             'Alto - Pagine senza link interni vengono scoperte e valutate poco dai motori'),
+            ('unreachable', 'important', True,
+             f'pagine non raggiungibili dalla home ({structure["home"]})',
+             'Aggiungi un percorso di link dalla home verso queste pagine',
+             'Medio - I crawler che partono dalla home non trovano queste pagine'),
+            ('deep_pages', 'minor', True,
+             f'pagine a più di {max_depth} click dalla home',
+             'Avvicina le pagine importanti alla home con link da categorie e hub',
+             'Medio - Le pagine profonde ricevono meno crawl e meno PageRank interno'),
+            ('excessive_outbound', 'minor', True,
+             f'pagine con più di {max_outbound} link interni distinti',
+             'Riduci i link di navigazione ripetuti e privilegia i link contestuali',
+             'Basso - Troppi link diluiscono il PageRank trasmesso a ciascuna pagina'),
+        ]
+        
+        for key, severity, enabled, label, recommendation, impact in checks:
+            entries = structure[key]
+            if not enabled or not entries:
+                continue
+            urls = [entry['url'] if isinstance(entry, dict) else entry for entry in entries]
+            issues.append({
+                'severity': severity,
+                'category': 'links',
+                'scope': 'site',
+                'message': f'{len(urls)} {label}',
+                'url': urls[0],
+                'urls': urls,
+                'recommendation': recommendation,
+                'impact': impact
+            })
+        
+        return structure
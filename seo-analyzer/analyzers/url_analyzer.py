@@ -4,33 +4,53 @@ Analizza URL SEO-friendly, canonical tags, sitemap.xml, robots.txt
 """
 
 import re
-from typing import Dict, List
-from bs4 import BeautifulSoup
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple, Union
+from utils.http_client import HTTPClient
+from utils.context import AnalysisContext
+from utils.parser import ElementIndex, ParsedDocument
+from utils.rate_limiter import HostRateLimiter
+from utils.rules import SEORules
+from utils.sitemap import count_sitemap_entries
 from urllib.parse import urlparse, urljoin
-import requests
 
 
 class URLAnalyzer:
     """Analizzatore per struttura URL e configurazione sito"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.issues = []
-        self.score = 0
-        
-    def analyze(self, html: str, url: str, check_sitemap: bool = True) -> Dict:
+    def __init__(self, config: Union[Dict, SEORules], http_client: Optional[HTTPClient] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.http = http_client or HTTPClient.from_config(self.rules)
+        # robots.txt già scaricato dal limiter per il Crawl-delay (None = download tramite cache HTTP)
+        self.rate_limiter = rate_limiter
+        
+        # Verifica per origine di sitemap.xml e robots.txt (una per sito): le
+        # pagine dello stesso sito attendono il Future della prima verifica
+        self.site_cache_ttl = self.rules.advanced.site_checks.cache_ttl_seconds
+        self._site_cache: Dict[str, Tuple[float, Future]] = {}
+        self._site_lock = threading.Lock()
+        # Problemi a livello sito, riportati una sola volta per origine
+        self.site_issues: Dict[str, List[Dict]] = {}
+        
+    def analyze(self, html: Union[str, ParsedDocument], url: str, check_sitemap: bool = True) -> Dict:
         """
         Analizza struttura URL e configurazione
         
         Args:
-            html: Contenuto HTML della pagina
+            html: Contenuto HTML della pagina o ParsedDocument già parsato
             url: URL della pagina analizzata
             check_sitemap: Se True, verifica esistenza sitemap.xml
             
         Returns:
             Dizionario con risultati analisi URL
         """
-        soup = BeautifulSoup(html, 'lxml')
+        document = ParsedDocument.ensure(html, url)
+        context = AnalysisContext(document, url)
+        index = document.index
         
         results = {
             'url': url,
@@ -43,23 +63,22 @@ class URLAnalyzer:
         }
         
         # Analizza struttura URL
-        results['url_structure'] = self._analyze_url_structure(url)
+        results['url_structure'] = self._analyze_url_structure(context, url)
         
         # Analizza canonical tag
-        results['canonical'] = self._analyze_canonical(soup, url)
+        results['canonical'] = self._analyze_canonical(context, index, url)
         
         # Verifica sitemap (se richiesto)
         if check_sitemap:
-            results['sitemap'] = self._check_sitemap(url)
-            results['robots'] = self._check_robots(url)
+            results['sitemap'], results['robots'] = self._check_site(context, url)
         
         # Calcola score
         results['score'] = self._calculate_score(results)
-        results['issues'] = self.issues
+        results['issues'] = context.issues
         
         return results
     
-    def _analyze_url_structure(self, url: str) -> Dict:
+    def _analyze_url_structure(self, context: AnalysisContext, url: str) -> Dict:
         """Analizza la struttura dell'URL"""
         
         parsed = urlparse(url)
@@ -86,11 +105,11 @@ class URLAnalyzer:
             structure['depth'] = len([p for p in path.split('/') if p])
         
         # Verifica lunghezza
-        max_len = self.config['urls']['structure']['max_length']
-        optimal_len = self.config['urls']['structure']['optimal_length']
+        max_len = self.rules.urls.max_length
+        optimal_len = self.rules.urls.optimal_length
         
         if structure['length'] > max_len:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'url',
                 'message': f'URL troppo lungo ({structure["length"]} caratteri, max {max_len})',
@@ -102,9 +121,9 @@ class URLAnalyzer:
             structure['is_clean'] = False
         
         # Verifica profondità
-        max_depth = self.config['urls']['structure']['max_depth']
+        max_depth = self.rules.urls.max_depth
         if structure['depth'] > max_depth:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'url',
                 'message': f'URL troppo profondo ({structure["depth"]} livelli, max {max_depth})',
@@ -117,7 +136,7 @@ class URLAnalyzer:
         # Verifica lowercase
         if path != path.lower():
             structure['is_lowercase'] = False
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'url',
                 'message': 'URL contiene maiuscole',
@@ -131,7 +150,7 @@ class URLAnalyzer:
         # Verifica uso trattini vs underscore
         if '_' in path:
             structure['uses_hyphens'] = False
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'url',
                 'message': 'URL usa underscore (_) invece di trattini (-)',
@@ -142,10 +161,9 @@ class URLAnalyzer:
             structure['score'] -= 5
         
         # Verifica caratteri speciali
-        pattern = self.config['urls']['structure']['pattern']
-        if not re.match(pattern, path) and path != '/':
+        if not self.rules.urls.pattern.match(path) and path != '/':
             structure['has_special_chars'] = True
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'url',
                 'message': 'URL contiene caratteri speciali o non validi',
@@ -158,9 +176,8 @@ class URLAnalyzer:
         
         # Verifica parametri query (evitare se possibile)
         if structure['has_query_params']:
-            avoid_params = self.config['urls']['structure'].get('avoid_parameters', True)
-            if avoid_params:
-                self.issues.append({
+            if self.rules.urls.avoid_parameters:
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'url',
                     'message': 'URL contiene parametri query (?param=value)',
@@ -176,7 +193,7 @@ class URLAnalyzer:
         if len(words) >= 2:
             structure['has_keywords'] = True
         else:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'url',
                 'message': 'URL non contiene parole chiave descrittive',
@@ -189,7 +206,7 @@ class URLAnalyzer:
         structure['score'] = max(0, structure['score'])
         return structure
     
-    def _analyze_canonical(self, soup: BeautifulSoup, url: str) -> Dict:
+    def _analyze_canonical(self, context: AnalysisContext, index: ElementIndex, url: str) -> Dict:
         """Analizza canonical tag"""
         
         canonical = {
@@ -200,10 +217,10 @@ class URLAnalyzer:
             'score': 0
         }
         
-        link_canonical = soup.find('link', rel='canonical')
+        link_canonical = index.find('link', rel='canonical')
         
         if not link_canonical or not link_canonical.get('href'):
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'url',
                 'message': 'Tag canonical mancante',
@@ -235,7 +252,7 @@ class URLAnalyzer:
             canonical['score'] = 100
         else:
             # Canonical punta altrove (potrebbe essere intenzionale)
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'url',
                 'message': f'Canonical punta a URL diverso: {canonical_url}',
@@ -247,7 +264,7 @@ class URLAnalyzer:
         
         # Verifica che canonical sia assoluto
         if not canonical_url.startswith('http'):
-            self.issues.append({
+            context.issues.append({
                 'severity': 'minor',
                 'category': 'url',
                 'message': 'Canonical usa URL relativo (meglio assoluto)',
@@ -259,7 +276,50 @@ class URLAnalyzer:
         
         return canonical
     
-    def _check_sitemap(self, url: str) -> Dict:
+    def _check_site(self, context: AnalysisContext, url: str) -> Tuple[Dict, Dict]:
+        """
+        Verifica sitemap.xml e robots.txt una sola volta per origine
+        
+        I risultati restano in cache per tutta l'esecuzione (o per
+        advanced.site_checks.cache_ttl_seconds se > 0). I problemi trovati
+        vengono marcati con scope 'site' e raccolti in site_issues, non
+        nei problemi delle pagine. Il lock protegge solo la tabella dei
+        Future: le verifiche di origini diverse procedono in parallelo.
+        """
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}".lower()
+        
+        with self._site_lock:
+            cached = self._site_cache.get(origin)
+            if cached and (not cached[1].done() or self.site_cache_ttl <= 0 or
+                           time.monotonic() - cached[0] < self.site_cache_ttl):
+                pending = cached[1]
+            else:
+                pending = None
+                check = Future()
+                self._site_cache[origin] = (time.monotonic(), check)
+        
+        if pending is not None:
+            sitemap, robots = pending.result()
+            return dict(sitemap), dict(robots)
+        
+        try:
+            site_context = AnalysisContext(context.document, url)
+            sitemap = self._check_sitemap(site_context, url)
+            robots = self._check_robots(site_context, url)
+        except BaseException as e:
+            with self._site_lock:
+                self._site_cache.pop(origin, None)
+            check.set_exception(e)
+            raise
+        
+        for issue in site_context.issues:
+            issue['scope'] = 'site'
+        self.site_issues[origin] = site_context.issues
+        check.set_result((sitemap, robots))
+        return dict(sitemap), dict(robots)
+    
+    def _check_sitemap(self, context: AnalysisContext, url: str) -> Dict:
         """Verifica esistenza e validità sitemap.xml"""
         
         sitemap = {
@@ -267,6 +327,8 @@ class URLAnalyzer:
             'url': '',
             'is_valid': False,
             'page_count': 0,
+            'is_index': False,
+            'sitemap_count': 0,
             'score': 0
         }
         
@@ -275,23 +337,26 @@ class URLAnalyzer:
         sitemap_url = f"{base_url}/sitemap.xml"
         
         try:
-            response = requests.get(sitemap_url, timeout=10)
+            with self.http.cached_stream(sitemap_url) as (status_code, body):
+                # Verifica XML valido contando le voci in streaming (anche gzip e sitemap index)
+                counts = None
+                if status_code == 200:
+                    try:
+                        counts = count_sitemap_entries(body)
+                    except (ValueError, SyntaxError):
+                        counts = None
             
-            if response.status_code == 200:
+            if status_code == 200:
                 sitemap['exists'] = True
                 sitemap['url'] = sitemap_url
                 
-                # Verifica se è XML valido
-                content = response.text
-                if '<?xml' in content and '<urlset' in content:
+                if counts is not None:
                     sitemap['is_valid'] = True
-                    
-                    # Conta pagine (conteggio approssimativo)
-                    sitemap['page_count'] = content.count('<url>')
+                    sitemap.update(counts)
                     
                     sitemap['score'] = 100
                 else:
-                    self.issues.append({
+                    context.issues.append({
                         'severity': 'important',
                         'category': 'url',
                         'message': 'sitemap.xml esiste ma non è valido',
@@ -301,7 +366,7 @@ class URLAnalyzer:
                     })
                     sitemap['score'] = 30
             else:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'critical',
                     'category': 'url',
                     'message': 'sitemap.xml non trovato',
@@ -311,7 +376,7 @@ class URLAnalyzer:
                 })
         
         except Exception as e:
-            self.issues.append({
+            context.issues.append({
                 'severity': 'important',
                 'category': 'url',
                 'message': f'Errore verifica sitemap: {str(e)[:100]}',
@@ -322,7 +387,7 @@ class URLAnalyzer:
         
         return sitemap
     
-    def _check_robots(self, url: str) -> Dict:
+    def _check_robots(self, context: AnalysisContext, url: str) -> Dict:
         """Verifica esistenza robots.txt"""
         
         robots = {
@@ -337,9 +402,14 @@ class URLAnalyzer:
         robots_url = f"{base_url}/robots.txt"
         
         try:
-            response = requests.get(robots_url, timeout=10)
+            if self.rate_limiter is not None:
+                response = self.rate_limiter.robots(base_url, self.site_cache_ttl or None)
+            else:
+                response = self.http.cached_get(robots_url)
             
-            if response.status_code == 200:
+            if response is None:
+                robots['score'] = 50
+            elif response.status_code == 200:
                 robots['exists'] = True
                 robots['url'] = robots_url
                 robots['score'] = 100
@@ -350,7 +420,7 @@ class URLAnalyzer:
                 if 'Sitemap:' in content:
                     robots['has_sitemap_reference'] = True
                 else:
-                    self.issues.append({
+                    context.issues.append({
                         'severity': 'minor',
                         'category': 'url',
                         'message': 'robots.txt non referenzia sitemap.xml',
@@ -360,7 +430,7 @@ class URLAnalyzer:
                     })
                     robots['score'] = 80
             else:
-                self.issues.append({
+                context.issues.append({
                     'severity': 'minor',
                     'category': 'url',
                     'message': 'robots.txt non trovato',
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark Crawling - Frontiera O(1) su grafo di link sintetico
+Confronta la vecchia coda a lista (pop(0) + "link not in to_visit") con
+CrawlFrontier e misura un crawl reale contro un server fixture locale
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.crawler import Crawler
+from utils.frontier import CrawlFrontier
+from utils.rate_limiter import HostRateLimiter
+
+
+def page_links(page: int, total: int, out_degree: int):
+    """Link uscenti deterministici della pagina (con varianti dello stesso URL)"""
+    rng = random.Random(page)
+    targets = [(page + 1) % total] + [rng.randrange(total) for _ in range(out_degree - 1)]
+    variants = ['/page/{}', '/page/{}/', '/page/{}?b=2&a=1', '/page/{}?a=1&b=2']
+    return [rng.choice(variants).format(target) for target in targets]
+
+
+def make_handler(total: int, out_degree: int):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        """Server fixture: /page/N con link verso altre pagine del grafo"""
+        
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            try:
+                page = int(self.path.split('?')[0].strip('/').split('/')[-1])
+            except ValueError:
+                page = 0
+            
+            links = ''.join(f'<a href="{href}">Pagina collegata</a>'
+                            for href in page_links(page % total, total, out_degree))
+            body = f'<html><head><title>Pagina {page}</title></head><body>{links}</body></html>'.encode('utf-8')
+            
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    return FixtureHandler
+
+
+def bench_list_frontier(total: int, out_degree: int) -> float:
+    """Vecchia frontiera: lista con pop(0) e ricerca lineare"""
+    start = time.perf_counter()
+    visited, to_visit = set(), ['/page/0']
+    while to_visit and len(visited) < total:
+        url = to_visit.pop(0)
+        if url in visited:
+            continue
+        visited.add(url)
+        page = int(url.split('?')[0].strip('/').split('/')[-1])
+        for link in page_links(page, total, out_degree):
+            if link not in visited and link not in to_visit:
+                to_visit.append(link)
+    return time.perf_counter() - start
+
+
+def bench_deque_frontier(total: int, out_degree: int, probabilistic: bool) -> float:
+    """Nuova frontiera: deque + seen-set su URL normalizzati"""
+    start = time.perf_counter()
+    frontier = CrawlFrontier({'probabilistic': probabilistic, 'expected_urls': total * 2})
+    frontier.add('/page/0')
+    visited = 0
+    while frontier and visited < total:
+        url = frontier.pop()
+        visited += 1
+        page = int(url.split('?')[0].strip('/').split('/')[-1])
+        for link in page_links(page, total, out_degree):
+            frontier.add(link)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark frontiera di crawling')
+    parser.add_argument('--pages', type=int, default=100_000,
+                        help='Pagine del grafo sintetico (default: 100000)')
+    parser.add_argument('--out-degree', type=int, default=8, help='Link per pagina (default: 8)')
+    parser.add_argument('--list-limit', type=int, default=20_000,
+                        help='Max pagine per la vecchia frontiera a lista (quadratica)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Richieste in volo nel crawl live')
+    parser.add_argument('--skip-live', action='store_true', help='Salta il crawl contro il server locale')
+    args = parser.parse_args()
+    
+    print("⏱️  Benchmark frontiera di crawling")
+    print("=" * 70)
+    
+    list_pages = min(args.pages, args.list_limit)
+    list_time = bench_list_frontier(list_pages, args.out_degree)
+    deque_small = bench_deque_frontier(list_pages, args.out_degree, probabilistic=False)
+    print(f"\n📋 {list_pages} pagine - lista (pop(0) + in lineare): {list_time:8.2f} s")
+    print(f"📋 {list_pages} pagine - CrawlFrontier (deque + set):  {deque_small:8.2f} s")
+    
+    deque_time = bench_deque_frontier(args.pages, args.out_degree, probabilistic=False)
+    bloom_time = bench_deque_frontier(args.pages, args.out_degree, probabilistic=True)
+    print(f"\n📋 {args.pages} pagine - CrawlFrontier (set):   {deque_time:8.2f} s")
+    print(f"📋 {args.pages} pagine - CrawlFrontier (bloom): {bloom_time:8.2f} s")
+    
+    if args.skip_live:
+        return
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.pages, args.out_degree))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start_url = f'http://127.0.0.1:{server.server_address[1]}/page/0'
+    
+    crawler = Crawler({'concurrent_requests': args.concurrency}, rate_limiter=HostRateLimiter({'enabled': False}))
+    start = time.perf_counter()
+    crawled = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in crawler.iter_pages(start_url, max_pages=args.pages):
+            crawled += 1
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    
+    print(f"\n🌐 Crawl live: {crawled} pagine in {elapsed:.1f} s ({crawled / elapsed:.0f} pagine/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark Parsing - Costo di parsing per pagina
+Confronta il vecchio flusso (ogni analyzer riparsa l'HTML) con il
+ParsedDocument condiviso (un solo parse per pagina)
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import yaml
+from bs4 import BeautifulSoup
+
+from analyzers.content_analyzer import ContentAnalyzer
+from analyzers.image_analyzer import ImageAnalyzer
+from analyzers.link_analyzer import LinkAnalyzer
+from analyzers.performance_analyzer import PerformanceAnalyzer
+from analyzers.mobile_analyzer import MobileAnalyzer
+from analyzers.url_analyzer import URLAnalyzer
+from analyzers.schema_analyzer import SchemaAnalyzer
+from utils.parser import ParsedDocument
+
+ANALYZER_COUNT = 7
+
+
+def build_synthetic_page(sections: int) -> str:
+    """Genera una pagina HTML sintetica di dimensioni realistiche"""
+    body = []
+    for i in range(sections):
+        body.append(f"""
+        <section id="sezione-{i}">
+            <h2>Sezione {i} - Guida completa</h2>
+            <p>Paragrafo di esempio numero {i} con testo descrittivo per l'analisi
+            SEO dei contenuti, delle immagini e dei link della pagina.</p>
+            <img src="/img/immagine-sezione-{i}.webp" alt="Immagine descrittiva sezione {i}"
+                 loading="lazy" width="800" height="600">
+            <a href="/pagina-{i}">Approfondimento sezione {i}</a>
+            <a href="https://esterno.example.com/{i}" rel="noopener">Fonte esterna {i}</a>
+            <button style="width: 40px">OK</button>
+        </section>""")
+    
+    return f"""<!DOCTYPE html>
+<html lang="it">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Pagina di benchmark - Analisi SEO completa</title>
+    <meta name="description" content="Pagina sintetica usata per misurare il costo di parsing degli analyzer SEO.">
+    <link rel="canonical" href="https://example.com/benchmark">
+    <link rel="stylesheet" href="/css/styles.min.css">
+    <style>@media (max-width: 768px) {{ body {{ font-size: 16px; }} }}</style>
+    <script type="application/ld+json">{{"@context": "https://schema.org", "@type": "WebPage"}}</script>
+</head>
+<body>
+    <h1>Benchmark parsing</h1>
+    {''.join(body)}
+    <script src="/js/app.min.js" defer></script>
+</body>
+</html>"""
+
+
+def run_analyzers(analyzers, page, url: str):
+    """Esegue i sette analyzer in modalità rapida (senza rete)"""
+    content, images, links, performance, mobile, structure, schema = analyzers
+    content.analyze(page, url)
+    images.analyze(page, url, check_image_size=False)
+    links.analyze(page, url, check_broken=False)
+    performance.analyze(page, url, measure_live=False)
+    mobile.analyze(page, url)
+    structure.analyze(page, url, check_sitemap=False)
+    schema.analyze(page, url)
+
+
+def make_analyzers(config):
+    return (
+        ContentAnalyzer(config),
+        ImageAnalyzer(config),
+        LinkAnalyzer(config),
+        PerformanceAnalyzer(config),
+        MobileAnalyzer(config),
+        URLAnalyzer(config),
+        SchemaAnalyzer(config),
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    """Tempo medio per iterazione in millisecondi"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark costo di parsing per pagina')
+    parser.add_argument('--file', help='File HTML da usare (default: pagina sintetica)')
+    parser.add_argument('--sections', type=int, default=300,
+                        help='Sezioni della pagina sintetica (default: 300)')
+    parser.add_argument('--repeat', type=int, default=5, help='Ripetizioni (default: 5)')
+    parser.add_argument('--config', default=str(Path(__file__).resolve().parent.parent / 'config' / 'seo_rules.yaml'))
+    args = parser.parse_args()
+    
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    
+    if args.file:
+        html = Path(args.file).read_text(encoding='utf-8')
+    else:
+        html = build_synthetic_page(args.sections)
+    url = 'https://example.com/benchmark'
+    
+    print("⏱️  Benchmark parsing per pagina")
+    print("=" * 70)
+    print(f"Dimensione pagina: {len(html.encode('utf-8')) / 1024:.0f}KB - ripetizioni: {args.repeat}")
+    
+    parse_once = timed(lambda: BeautifulSoup(html, 'lxml'), args.repeat)
+    print(f"\n📄 Singolo parse lxml:            {parse_once:8.1f} ms")
+    print(f"   Prima  ({ANALYZER_COUNT} parse per pagina):  {parse_once * ANALYZER_COUNT:8.1f} ms")
+    print(f"   Dopo   (1 parse per pagina):    {parse_once:8.1f} ms")
+    
+    before = timed(lambda: run_analyzers(make_analyzers(config), html, url), args.repeat)
+    after = timed(lambda: run_analyzers(make_analyzers(config), ParsedDocument(html, url), url), args.repeat)
+    
+    print(f"\n🔍 Analisi completa (stringa HTML):     {before:8.1f} ms/pagina")
+    print(f"🔍 Analisi completa (ParsedDocument):   {after:8.1f} ms/pagina")
+    print(f"🚀 Speedup: {before / after:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -22,6 +22,9 @@ def esempio_1_analisi_url():
     
     # Analizza URL
     results = analyzer.analyze_url('https://example.com', deep=False)
+    if results is None:
+        print(f"❌ Download non riuscito: {analyzer.download_errors[-1]['error']}")
+        return
     
     # Accedi ai risultati
     print(f"\n📊 Score Globale: {results['global_score']}/100")
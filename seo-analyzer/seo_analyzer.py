@@ -8,9 +8,9 @@ import argparse
 import sys
 import os
 from pathlib import Path
-import yaml
 import time
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Set, Union
 
 # Import analyzers
 from analyzers.content_analyzer import ContentAnalyzer
@@ -20,10 +20,21 @@ from analyzers.performance_analyzer import PerformanceAnalyzer
 from analyzers.mobile_analyzer import MobileAnalyzer
 from analyzers.url_analyzer import URLAnalyzer
 from analyzers.schema_analyzer import SchemaAnalyzer
+from analyzers.site_analyzer import SiteAnalyzer
 
 # Import utilities
 from utils.crawler import Crawler
-from utils.parser import HTMLParser
+from utils.http_cache import HTTPCache
+from utils.http_client import HTTPClient
+from utils.link_graph import LinkGraph
+from utils.local_site import LocalSiteIndex
+from utils.rate_limiter import HostRateLimiter
+from utils.result_cache import ResultCache, config_fingerprint
+from utils.rules import RulesError, SEORules
+from utils.scheduler import AnalysisTask, TaskScheduler
+from utils.sitemap import SitemapReader
+from utils.watcher import FileWatcher
+from utils.parser import HTMLParser, ParsedDocument
 from utils.scorer import SEOScorer
 from utils.reporter import SEOReporter
 
@@ -38,39 +49,68 @@ except ImportError:
 class SEOAnalyzer:
     """Agente principale per analisi SEO"""
     
-    def __init__(self, config_path: str = 'config/seo_rules.yaml'):
+    def __init__(self, config_path: str = 'config/seo_rules.yaml', cache_dir: Optional[str] = None):
         """
         Inizializza SEO Analyzer
         
         Args:
             config_path: Percorso file configurazione YAML
+            cache_dir: Directory della cache delle regole (default: .seo_cache accanto al file)
         """
-        self.config = self._load_config(config_path)
+        self.config_path = config_path
+        self.cache_dir = cache_dir
+        # Regole validate una volta all'avvio e condivise da analyzer e scorer
+        self.rules = self._load_rules(config_path)
+        self.config = self.rules.config
+        
+        # Client HTTP condiviso (keep-alive, pool, retry) per tutte le verifiche di rete
+        self.http = HTTPClient.from_config(self.rules)
+        
+        # Limite di richieste adattivo per host (sitemap, crawl e sonde delle immagini)
+        self.rate_limiter = HostRateLimiter(self.rules.advanced.rate_limit, http_client=self.http)
         
         # Inizializza analyzer
-        self.content_analyzer = ContentAnalyzer(self.config)
-        self.image_analyzer = ImageAnalyzer(self.config)
-        self.link_analyzer = LinkAnalyzer(self.config)
-        self.performance_analyzer = PerformanceAnalyzer(self.config)
-        self.mobile_analyzer = MobileAnalyzer(self.config)
-        self.url_analyzer = URLAnalyzer(self.config)
-        self.schema_analyzer = SchemaAnalyzer(self.config)
+        self.content_analyzer = ContentAnalyzer(self.rules)
+        self.image_analyzer = ImageAnalyzer(self.rules, http_client=self.http, rate_limiter=self.rate_limiter)
+        self.link_analyzer = LinkAnalyzer(self.rules, http_client=self.http)
+        self.performance_analyzer = PerformanceAnalyzer(self.rules, http_client=self.http)
+        self.mobile_analyzer = MobileAnalyzer(self.rules, http_client=self.http)
+        self.url_analyzer = URLAnalyzer(self.rules, http_client=self.http, rate_limiter=self.rate_limiter)
+        self.schema_analyzer = SchemaAnalyzer(self.rules)
         
         # Utilities
-        self.crawler = Crawler(self.config.get('advanced', {}).get('crawling', {}))
+        self.crawler = Crawler(self.rules.advanced.crawling,
+                               http_client=self.http, rate_limiter=self.rate_limiter)
         self.parser = HTMLParser()
-        self.scorer = SEOScorer(self.config)
+        self.scheduler = TaskScheduler.from_config(self.rules)
+        self.scorer = SEOScorer(self.rules)
         self.reporter = SEOReporter(self.config)
         
-    def _load_config(self, config_path: str) -> Dict:
-        """Carica configurazione da file YAML"""
+        # Segnali di sito e grafo dei link dell'ultima analisi multi-pagina
+        self.site_analyzer = SiteAnalyzer(self.rules)
+        
+        # Indice dei file per la verifica offline dei link (vedi analyze_directory)
+        self.local_index: Optional[LocalSiteIndex] = None
+        
+        # Pagine non scaricate ({'url', 'error'}) dall'ultima analisi di URL o sitemap
+        self.download_errors: List[Dict] = []
+    
+    @property
+    def link_graph(self) -> LinkGraph:
+        """Grafo dei link interni dell'ultima analisi multi-pagina"""
+        return self.site_analyzer.link_graph
+    
+    def _load_rules(self, config_path: str) -> SEORules:
+        """Carica e valida la configurazione YAML (parsing in cache per hash del file)"""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return SEORules.load(config_path, cache_dir=self.cache_dir)
         except FileNotFoundError:
             print(f"❌ File configurazione non trovato: {config_path}")
             print("💡 Uso configurazione di default...")
-            return self._default_config()
+            return SEORules(self._default_config())
+        except RulesError as e:
+            print(f"❌ Configurazione non valida: {e}")
+            sys.exit(1)
         except Exception as e:
             print(f"❌ Errore caricamento configurazione: {e}")
             sys.exit(1)
@@ -100,16 +140,17 @@ class SEOAnalyzer:
             }
         }
     
-    def analyze_url(self, url: str, deep: bool = True) -> Dict:
+    def analyze_url(self, url: str, deep: bool = True) -> Optional[Dict]:
         """
         Analizza una singola URL
         
         Args:
             url: URL da analizzare
             deep: Se True, esegue analisi approfondita (più lenta)
-            
+        
         Returns:
-            Dizionario con risultati completi
+            Dizionario con risultati completi, None se il download fallisce
+            (l'errore resta in self.download_errors)
         """
         if not REQUESTS_AVAILABLE:
             print("❌ Modulo 'requests' richiesto per analizzare URL")
@@ -121,16 +162,25 @@ class SEOAnalyzer:
         # Scarica HTML
         print("📥 Download HTML...")
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            html = response.text
+            html = self._download(url)
         except Exception as e:
-            print(f"❌ Errore download: {e}")
-            sys.exit(1)
+            self._record_download_error(url, e)
+            return None
         
         # Esegui analisi
         return self._analyze_html(html, url, deep)
     
+    def _download(self, url: str) -> str:
+        """HTML della pagina, scaricato attraverso il limite del suo host"""
+        response = self.rate_limiter.fetch(url, self.http)
+        response.raise_for_status()
+        return response.text
+    
+    def _record_download_error(self, url: str, error: Exception):
+        """Registra una pagina non scaricata invece di interrompere l'analisi"""
+        print(f"❌ Errore download {url}: {error}")
+        self.download_errors.append({'url': url, 'error': str(error)})
+    
     def analyze_file(self, file_path: str, url: str = None) -> Dict:
         """
         Analizza file HTML locale
@@ -138,7 +188,7 @@ class SEOAnalyzer:
         Args:
             file_path: Percorso file HTML
             url: URL simulato (opzionale)
-            
+        
         Returns:
             Dizionario con risultati completi
         """
@@ -157,16 +207,19 @@ class SEOAnalyzer:
         
         return self._analyze_html(html, url, deep=False)
     
-    def analyze_directory(self, dir_path: str, recursive: bool = True) -> List[Dict]:
+    def analyze_directory(self, dir_path: str, recursive: bool = True, workers: int = 1,
+                          cache_file: Optional[str] = None) -> List[Dict]:
         """
         Analizza tutti i file HTML in una directory
         
         Args:
             dir_path: Percorso directory
             recursive: Se True, analizza subdirectory
-            
+            workers: Numero di processi paralleli (1 = analisi seriale)
+            cache_file: Cache dei risultati per analisi incrementale (solo file modificati)
+        
         Returns:
-            Lista di risultati per ogni file
+            Lista di risultati per ogni file (inclusi quelli riutilizzati dalla cache)
         """
         print(f"\n🔍 Analisi directory: {dir_path}")
         print("=" * 70)
@@ -183,10 +236,180 @@ class SEOAnalyzer:
         
         print(f"📁 Trovati {total} file HTML\n")
         
-        for idx, file_path in enumerate(html_files, 1):
-            print(f"[{idx}/{total}] Analisi: {file_path.name}")
-            result = self.analyze_file(str(file_path))
-            results.append(result)
+        # Link interni verificati sui file della directory, senza rete
+        self.local_index = self._build_local_index(dir_path)
+        
+        results = [None] * total
+        # File aggiunti o rimossi invalidano solo le pagine che li hanno provati
+        # (result['dependencies'] include anche le destinazioni mancanti dei link)
+        cache = ResultCache(cache_file, config_fingerprint(self.config)) if cache_file else None
+        
+        if cache is not None:
+            for position, file_path in enumerate(html_files):
+                results[position] = cache.get(file_path)
+            print(f"♻️  {cache.hits} file invariati riutilizzati dalla cache, "
+                  f"{total - cache.hits} da analizzare\n")
+        
+        pending = [position for position, result in enumerate(results) if result is None]
+        pending_files = [html_files[position] for position in pending]
+        
+        if workers > 1 and len(pending_files) > 1:
+            analyzed = self._analyze_files_parallel(pending_files, workers)
+        else:
+            analyzed = []
+            for idx, file_path in enumerate(pending_files, 1):
+                print(f"[{idx}/{len(pending_files)}] Analisi: {file_path.name}")
+                analyzed.append(self.analyze_file(str(file_path)))
+        
+        for position, result in zip(pending, analyzed):
+            results[position] = result
+            if cache is not None:
+                cache.put(html_files[position], result)
+        
+        if cache is not None:
+            cache.prune(dir_path, html_files)
+            cache.save()
+        
+        return results
+    
+    def _build_local_index(self, dir_path: str) -> Optional[LocalSiteIndex]:
+        """Indice dei file per advanced.local_site (None se la verifica offline è disattivata)"""
+        if not self.rules.advanced.local_site.check_links:
+            return None
+        return LocalSiteIndex.from_config(dir_path, self.rules)
+    
+    def watch_directory(self, dir_path: str, recursive: bool = True, interval: Optional[float] = None,
+                        initial_results: Optional[List[Dict]] = None,
+                        max_cycles: Optional[int] = None, cycle_timeout: Optional[float] = None) -> Dict[str, int]:
+        """
+        Modalità watch: rianalizza le pagine a ogni modifica di HTML/CSS/JS
+        
+        Config e analyzer restano in memoria tra i cicli. Ogni modifica a un
+        file locale (CSS/JS, immagini, font, pagine di cui si verificano le
+        ancore) rianalizza solo le pagine che lo usano; i cali di
+        score oltre advanced.monitoring.alert_on_score_drop vengono segnalati.
+        
+        Args:
+            dir_path: Directory da osservare
+            recursive: Se True, osserva anche le subdirectory
+            interval: Intervallo di polling se inotify non è disponibile
+                      (default: advanced.monitoring.check_interval_seconds)
+            initial_results: Risultati già calcolati (evita l'analisi iniziale)
+            max_cycles: Numero massimo di cicli di modifiche (None = infinito)
+            cycle_timeout: Attesa massima di un ciclo senza modifiche (None = infinita)
+        
+        Returns:
+            Score correnti per percorso della pagina
+        """
+        monitoring = self.rules.advanced.monitoring
+        interval = interval or monitoring.check_interval_seconds
+        alert_drop = monitoring.alert_on_score_drop
+        root = Path(dir_path).resolve()
+        
+        scores: Dict[Path, int] = {}
+        page_assets: Dict[Path, Set[Path]] = {}
+        
+        def record(page: Path, result: Dict):
+            scores[page] = result['global_score']
+            page_assets[page] = self._local_assets(page, root, result) | \
+                {Path(dependency).resolve() for dependency in result.get('dependencies', [])}
+        
+        if initial_results is None:
+            initial_results = self.analyze_directory(str(root), recursive=recursive)
+        for result in initial_results:
+            record(Path(result['url'][len('file://'):]).resolve(), result)
+        
+        if self.local_index is None or self.local_index.root != root:
+            self.local_index = self._build_local_index(str(root))
+        
+        watcher = FileWatcher(str(root), recursive=recursive, poll_interval=interval)
+        print(f"\n👀 Watch attivo su {root} ({watcher.mode}, {len(scores)} pagine) - Ctrl+C per uscire")
+        
+        cycles = 0
+        try:
+            while max_cycles is None or cycles < max_cycles:
+                changed = watcher.wait_for_changes(timeout=cycle_timeout)
+                if not changed:
+                    if cycle_timeout is not None:
+                        break
+                    continue
+                
+                cycles += 1
+                started = time.monotonic()
+                if self.local_index is not None:
+                    self.local_index.refresh(changed)
+                
+                # Pagine modificate + pagine che dipendono dai file modificati
+                affected = {path for path in changed if path.suffix.lower() == '.html'}
+                affected |= {page for page, assets in page_assets.items() if assets & changed}
+                
+                for page in sorted(affected):
+                    if not page.exists():
+                        scores.pop(page, None)
+                        page_assets.pop(page, None)
+                        print(f"🗑️  Rimossa: {page.relative_to(root)}")
+                        continue
+                    
+                    previous = scores.get(page)
+                    result = self.analyze_file(str(page))
+                    record(page, result)
+                    
+                    if previous is not None and previous - result['global_score'] > alert_drop:
+                        print(f"🚨 ALERT: {page.relative_to(root)} score sceso da "
+                              f"{previous} a {result['global_score']}/100")
+                
+                print(f"🔄 {len(affected)} pagine rianalizzate in {time.monotonic() - started:.2f}s "
+                      f"({len(changed)} file modificati)")
+        except KeyboardInterrupt:
+            print("\n👋 Watch interrotto")
+        finally:
+            watcher.close()
+        
+        return {str(page): score for page, score in scores.items()}
+    
+    @staticmethod
+    def _local_assets(page: Path, root: Path, result: Dict) -> Set[Path]:
+        """CSS e JS locali inclusi dalla pagina (per la rianalisi in watch mode)"""
+        resources = result.get('performance', {}).get('resources', {})
+        assets = set()
+        
+        for ref in resources.get('css_files', []) + resources.get('js_files', []):
+            if not ref or '://' in ref or ref.startswith(('//', 'data:')):
+                continue
+            ref = ref.split('#')[0].split('?')[0]
+            target = root / ref.lstrip('/') if ref.startswith('/') else page.parent / ref
+            assets.add(target.resolve())
+        
+        return assets
+    
+    def _analyze_files_parallel(self, html_files: List[Path], workers: int) -> List[Dict]:
+        """
+        Distribuisce i file su un pool di processi
+        
+        Ogni processo crea il proprio SEOAnalyzer (analyzer puliti, stato
+        non condiviso). I risultati vengono mostrati appena completati e
+        restituiti nell'ordine originale dei file.
+        """
+        total = len(html_files)
+        workers = min(workers, total)
+        print(f"⚙️  Analisi parallela con {workers} processi\n")
+        
+        results: List[Dict] = [None] * total
+        
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(self.config_path, self.local_index.root if self.local_index else None,
+                                           self.cache_dir)) as executor:
+            futures = {
+                executor.submit(_analyze_file_in_worker, str(file_path)): position
+                for position, file_path in enumerate(html_files)
+            }
+            
+            for idx, future in enumerate(as_completed(futures), 1):
+                position = futures[future]
+                result = future.result()
+                results[position] = result
+                print(f"[{idx}/{total}] {result['global_score']}/100 - {html_files[position].name}")
         
         return results
     
@@ -197,23 +420,17 @@ class SEOAnalyzer:
         Args:
             sitemap_url: URL del sitemap.xml
             max_pages: Numero massimo di pagine da analizzare
-            
+        
         Returns:
             Lista di risultati per ogni pagina
         """
         print(f"\n🔍 Analisi da sitemap: {sitemap_url}")
         print("=" * 70)
         
-        # Parse sitemap
+        # Parse sitemap in streaming (si ferma a max_pages, segue le sitemap index)
         try:
-            response = requests.get(sitemap_url, timeout=30)
-            response.raise_for_status()
-            
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(response.text, 'xml')
-            
-            urls = [loc.text for loc in soup.find_all('loc')]
-            urls = urls[:max_pages]
+            reader = SitemapReader(self.http)
+            urls = list(reader.iter_urls(sitemap_url, max_urls=max_pages))
             
             print(f"📄 Trovate {len(urls)} URL nel sitemap\n")
         
@@ -221,25 +438,130 @@ class SEOAnalyzer:
             print(f"❌ Errore parsing sitemap: {e}")
             return []
         
-        # Analizza ogni URL
-        results = []
-        for idx, url in enumerate(urls, 1):
-            print(f"\n[{idx}/{len(urls)}] Analisi: {url}")
-            result = self.analyze_url(url, deep=False)
-            results.append(result)
-            time.sleep(1)  # Rate limiting
+        # Download concorrenti dietro al limite per host: host diversi si sovrappongono,
+        # ogni host resta al ritmo del proprio token bucket. L'analisi gira nel thread
+        # principale (analyzer condivisi) man mano che le pagine arrivano.
+        self.download_errors = []
+        results: List[Optional[Dict]] = [None] * len(urls)
+        workers = max(1, min(self.rules.advanced.crawling.concurrent_requests, len(urls)))
         
-        return results
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sitemap')
+        try:
+            futures = {executor.submit(self._download, url): position for position, url in enumerate(urls)}
+            
+            for idx, future in enumerate(as_completed(futures), 1):
+                position = futures[future]
+                url = urls[position]
+                print(f"\n[{idx}/{len(urls)}] Analisi: {url}")
+                try:
+                    html = future.result()
+                except Exception as e:
+                    self._record_download_error(url, e)
+                    continue
+                results[position] = self._analyze_html(html, url, deep=False)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Ordine del sitemap, senza le pagine non scaricate
+        return [result for result in results if result is not None]
     
-    def _analyze_html(self, html: str, url: str, deep: bool = True) -> Dict:
+    def analyze_site(self, start_url: str, max_pages: int = 100, deep: bool = False,
+                     on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Crawla e analizza un sito in streaming
+        
+        Ogni pagina viene analizzata appena scaricata e il suo HTML scartato:
+        restano in memoria solo i risultati compatti (summarize_result), gli
+        archi del grafo dei link interni (self.link_graph) e i segnali per le
+        verifiche a livello sito (self.site_analyzer).
+        
+        Args:
+            start_url: URL di partenza del crawl
+            max_pages: Numero massimo di pagine da analizzare
+            deep: Analisi approfondita per ogni pagina
+            on_result: Callback opzionale con i risultati completi di ogni pagina
+        
+        Returns:
+            Lista di risultati compatti per ogni pagina
+        """
+        print(f"\n🔍 Crawl e analisi sito: {start_url}")
+        print("=" * 70)
+        
+        self.site_analyzer = SiteAnalyzer(self.rules)
+        self.site_analyzer.home_url = start_url
+        summaries = []
+        
+        for page in self.crawler.iter_pages(start_url, max_pages=max_pages):
+            result = self._analyze_html(page['document'], page['url'], deep)
+            self.site_analyzer.add_page(result, links=page['links'])
+            
+            if on_result:
+                on_result(result)
+            summaries.append(self.summarize_result(result))
+        
+        return summaries
+    
+    @staticmethod
+    def summarize_result(results: Dict) -> Dict:
+        """Riduce i risultati di una pagina ai campi necessari ai riepiloghi di sito"""
+        issue_counts = {'critical': 0, 'important': 0, 'minor': 0}
+        for issue in results['all_issues']:
+            severity = issue.get('severity', 'minor')
+            issue_counts[severity] = issue_counts.get(severity, 0) + 1
+        
+        summary = {
+            'url': results['url'],
+            'global_score': results['global_score'],
+            'rating': results['rating'],
+            'category_scores': dict(results['category_scores']),
+            'issue_counts': issue_counts,
+            'transfer_bytes': results.get('performance', {}).get('transfer', {}).get('transfer_bytes')
+        }
+        summary.update(SiteAnalyzer.page_signals(results))
+        
+        return summary
+    
+    def site_report(self, results: Optional[List[Dict]] = None) -> Dict:
+        """
+        Verifiche a livello sito (title, description e H1 duplicati,
+        contenuti quasi duplicati, struttura dei link interni)
+        
+        Args:
+            results: Risultati (completi o compatti) delle pagine; se None usa
+                     le pagine registrate durante l'ultimo analyze_site.
+                     Il grafo dei link richiede i risultati completi.
+        """
+        if results is not None:
+            self.site_analyzer = SiteAnalyzer(self.rules)
+            for result in results:
+                self.site_analyzer.add_page(result)
+        
+        return self.site_analyzer.analyze()
+    
+    def enable_http_cache(self, directory: str):
+        """Attiva la cache HTTP su disco per download di pagine, sitemap e immagini"""
+        self.http.cache = HTTPCache.from_config(self.rules, directory=directory)
+    
+    def close(self):
+        """Rilascia connessioni e thread condivisi (link checker, sonde, compressione, client HTTP)"""
+        self.link_analyzer.close()
+        self.image_analyzer.probe.close()
+        self.performance_analyzer.sizer.close()
+        self.http.close()
+    
+    def site_issues(self) -> List[Dict]:
+        """Problemi a livello sito (sitemap.xml, robots.txt) di tutte le origini analizzate"""
+        return [issue for issues in self.url_analyzer.site_issues.values() for issue in issues]
+    
+    def _analyze_html(self, html: Union[str, ParsedDocument], url: str, deep: bool = True) -> Dict:
         """
         Analizza HTML con tutti gli analyzer
         
         Args:
-            html: Contenuto HTML
+            html: Contenuto HTML o documento già parsato (es. dal crawler)
             url: URL della pagina
             deep: Analisi approfondita
-            
+        
         Returns:
             Risultati completi analisi
         """
@@ -257,50 +579,49 @@ class SEOAnalyzer:
             'global_score': 0,
             'rating': '',
             'rating_emoji': '',
-            'all_issues': []
+            'all_issues': [],
+            'dependencies': []
         }
         
-        # 1. Analisi Contenuti
-        print("📝 Analisi contenuti...")
-        results['content'] = self.content_analyzer.analyze(html, url)
-        results['category_scores']['content'] = results['content']['score']
-        results['all_issues'].extend(results['content']['issues'])
-        
-        # 2. Analisi Immagini
-        print("🖼️  Analisi immagini...")
-        results['images'] = self.image_analyzer.analyze(html, url, check_image_size=deep)
-        results['category_scores']['images'] = results['images']['score']
-        results['all_issues'].extend(results['images']['issues'])
-        
-        # 3. Analisi Link
-        print("🔗 Analisi link...")
-        results['links'] = self.link_analyzer.analyze(html, url, check_broken=deep)
-        results['category_scores']['links'] = results['links']['score']
-        results['all_issues'].extend(results['links']['issues'])
-        
-        # 4. Analisi Performance
-        print("⚡ Analisi performance...")
-        results['performance'] = self.performance_analyzer.analyze(html, url, measure_live=deep)
-        results['category_scores']['performance'] = results['performance']['score']
-        results['all_issues'].extend(results['performance']['issues'])
-        
-        # 5. Analisi Mobile
-        print("📱 Analisi mobile...")
-        results['mobile'] = self.mobile_analyzer.analyze(html, url)
-        results['category_scores']['mobile'] = results['mobile']['score']
-        results['all_issues'].extend(results['mobile']['issues'])
-        
-        # 6. Analisi Struttura URL
-        print("🔍 Analisi struttura URL...")
-        results['structure'] = self.url_analyzer.analyze(html, url, check_sitemap=deep)
-        results['category_scores']['structure'] = results['structure']['score']
-        results['all_issues'].extend(results['structure']['issues'])
-        
-        # 7. Analisi Schema Markup
-        print("📊 Analisi schema markup...")
-        results['schema'] = self.schema_analyzer.analyze(html, url)
-        # Schema non ha peso diretto nel category_scores, ma contribuisce al contenuto
-        results['all_issues'].extend(results['schema']['issues'])
+        # Parse unico condiviso da tutti gli analyzer (indice costruito prima di avviare i thread)
+        document = html if isinstance(html, ParsedDocument) else self.parser.parse_document(html, url)
+        document.index
+        
+        # Le verifiche di rete (link rotti, sonde immagini, tempo di caricamento, sitemap,
+        # CSS e risorse remote) si sovrappongono; le analisi solo CPU girano nel frattempo
+        remote = url.startswith(('http://', 'https://'))
+        tasks = [
+            AnalysisTask('content', lambda: self.content_analyzer.analyze(document, url),
+                         label="📝 Analisi contenuti..."),
+            AnalysisTask('images', lambda: self.image_analyzer.analyze(document, url, check_image_size=deep,
+                                                                       local_index=self.local_index),
+                         network=deep and remote, label="🖼️  Analisi immagini..."),
+            AnalysisTask('links', lambda: self.link_analyzer.analyze(document, url, check_broken=deep,
+                                                                     local_index=self.local_index),
+                         network=deep, label="🔗 Analisi link..."),
+            AnalysisTask('performance', lambda: self.performance_analyzer.analyze(document, url, measure_live=deep,
+                                                                                  local_index=self.local_index),
+                         network=deep or remote, label="⚡ Analisi performance..."),
+            AnalysisTask('mobile', lambda: self.mobile_analyzer.analyze(document, url, local_index=self.local_index),
+                         network=remote, label="📱 Analisi mobile..."),
+            AnalysisTask('structure', lambda: self.url_analyzer.analyze(document, url, check_sitemap=deep),
+                         network=deep, label="🔍 Analisi struttura URL..."),
+            AnalysisTask('schema', lambda: self.schema_analyzer.analyze(document, url),
+                         label="📊 Analisi schema markup..."),
+        ]
+        analyses = self.scheduler.run(tasks)
+        
+        # Unione in ordine fisso: all_issues non dipende dall'ordine di completamento
+        dependencies = set()
+        for category in ('content', 'images', 'links', 'performance', 'mobile', 'structure', 'schema'):
+            results[category] = analyses[category]
+            results['all_issues'].extend(analyses[category]['issues'])
+            dependencies.update(analyses[category].get('dependencies', []))
+            # Schema non ha peso diretto nel category_scores, ma contribuisce al contenuto
+            if category != 'schema':
+                results['category_scores'][category] = analyses[category]['score']
+        # File locali letti dagli analyzer: invalidano la cache incrementale e guidano la watch mode
+        results['dependencies'] = sorted(dependencies)
         
         # Calcola score globale
         results['global_score'] = self.scorer.calculate_global_score(results['category_scores'])
@@ -351,6 +672,70 @@ class SEOAnalyzer:
             print(f"❌ Formato non supportato: {format}")
 
 
+# Stato per-processo del pool di analisi parallela
+_worker_analyzer = None
+
+
+def _init_worker(config_path: str, local_root: Optional[Path] = None, cache_dir: Optional[str] = None):
+    """Inizializza un SEOAnalyzer dedicato per ogni processo worker"""
+    global _worker_analyzer
+    # L'avanzamento è riportato dal processo principale
+    sys.stdout = open(os.devnull, 'w', encoding='utf-8')
+    _worker_analyzer = SEOAnalyzer(config_path=config_path, cache_dir=cache_dir)
+    if local_root is not None:
+        _worker_analyzer.local_index = _worker_analyzer._build_local_index(str(local_root))
+
+
+def _analyze_file_in_worker(file_path: str) -> Dict:
+    """Analizza un file nel processo worker"""
+    return _worker_analyzer.analyze_file(file_path)
+
+
+def _print_site_issues(issues: List[Dict]):
+    """Stampa una sola volta i problemi a livello sito"""
+    if not issues:
+        return
+    
+    print(f"\n🌐 Problemi a livello sito:")
+    for issue in issues:
+        urls = issue.get('urls')
+        if urls:
+            print(f"  [{issue['severity']}] {issue['message']}")
+            for url in urls[:5]:
+                print(f"      - {url}")
+            if len(urls) > 5:
+                print(f"      ... e altre {len(urls) - 5}")
+        else:
+            print(f"  [{issue['severity']}] {issue['message']} - {issue.get('url', '')}")
+
+
+def _print_transfer_summary(results: List[Dict]):
+    """Stampa il peso medio trasferito per pagina (HTML + CSS + JS + font compressi)"""
+    sizes = [
+        r.get('transfer_bytes') if 'transfer_bytes' in r else r.get('performance', {}).get('transfer', {}).get('transfer_bytes')
+        for r in results
+    ]
+    sizes = [size for size in sizes if size is not None]
+    if sizes:
+        print(f"Peso medio trasferito: {sum(sizes) / len(sizes) / 1024:.1f}KB per pagina "
+              f"(max {max(sizes) / 1024:.1f}KB)")
+
+
+def _print_link_structure(structure: Optional[Dict]):
+    """Stampa PageRank interno e distribuzione della profondità di click"""
+    if not structure:
+        return
+    
+    print(f"\n🕸️  Link interni: {structure['edges']} link tra {structure['urls']} URL "
+          f"(home: {structure['home']})")
+    depths = ', '.join(f"{depth if depth >= 0 else 'irraggiungibili'}: {count}"
+                       for depth, count in structure['depth_distribution'].items())
+    print(f"  Profondità di click: {depths}")
+    print(f"  PageRank interno più alto:")
+    for page in structure['top_pages'][:5]:
+        print(f"    {page['pagerank']:.4f} - {page['url']} ({page['inbound']} link in entrata)")
+
+
 def main():
     """Entry point CLI"""
     parser = argparse.ArgumentParser(
@@ -362,7 +747,12 @@ Esempi:
   %(prog)s --url https://example.com --output html --save report.html
   %(prog)s --file index.html
   %(prog)s --local-dir ./build --recursive
+  %(prog)s --local-dir ./build --recursive --workers 8
+  %(prog)s --local-dir ./build --recursive --incremental
+  %(prog)s --watch ./public --interval 30
   %(prog)s --sitemap https://example.com/sitemap.xml
+  %(prog)s --crawl https://example.com --max-pages 5000
+  %(prog)s --crawl https://example.com --cache-dir .seo_cache
   %(prog)s --url https://example.com --quick
         """
     )
@@ -373,6 +763,8 @@ Esempi:
     input_group.add_argument('--file', help='File HTML locale da analizzare')
     input_group.add_argument('--local-dir', help='Directory con file HTML')
     input_group.add_argument('--sitemap', help='URL sitemap.xml')
+    input_group.add_argument('--crawl', help='URL di partenza per crawl e analisi del sito')
+    input_group.add_argument('--watch', help='Directory da osservare: rianalizza a ogni modifica')
     
     # Opzioni analisi
     parser.add_argument('--recursive', action='store_true', 
@@ -381,6 +773,17 @@ Esempi:
                         help='Analisi veloce (salta verifiche lente)')
     parser.add_argument('--max-pages', type=int, default=100,
                         help='Max pagine da analizzare (default: 100)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Processi paralleli per --local-dir (default: 1)')
+    parser.add_argument('--interval', type=float,
+                        help='Intervallo di polling in secondi per --watch senza inotify '
+                             '(default: advanced.monitoring.check_interval_seconds)')
+    parser.add_argument('--incremental', nargs='?', const='.seo_cache/results.json', metavar='FILE',
+                        help='Con --local-dir rianalizza solo i file modificati '
+                             '(default: .seo_cache/results.json)')
+    parser.add_argument('--cache-dir',
+                        help='Cache HTTP su disco con rivalidazione ETag/Last-Modified '
+                             '(anche per il parsing delle regole)')
     
     # Output
     parser.add_argument('--output', choices=['console', 'json', 'html', 'pdf'],
@@ -394,19 +797,32 @@ Esempi:
     args = parser.parse_args()
     
     # Inizializza analyzer
-    analyzer = SEOAnalyzer(config_path=args.config)
+    analyzer = SEOAnalyzer(config_path=args.config, cache_dir=args.cache_dir)
+    if args.cache_dir:
+        analyzer.enable_http_cache(args.cache_dir)
     
+    try:
+        _run_cli(analyzer, args)
+    finally:
+        analyzer.close()
+
+
+def _run_cli(analyzer: SEOAnalyzer, args):
+    """Esegue l'analisi richiesta da riga di comando"""
     # Esegui analisi
     results = None
     
     if args.url:
         results = analyzer.analyze_url(args.url, deep=not args.quick)
+        if results is None:
+            sys.exit(1)
     
     elif args.file:
         results = analyzer.analyze_file(args.file)
     
     elif args.local_dir:
-        all_results = analyzer.analyze_directory(args.local_dir, recursive=args.recursive)
+        all_results = analyzer.analyze_directory(args.local_dir, recursive=args.recursive,
+                                                 workers=args.workers, cache_file=args.incremental)
         
         # Genera report aggregato
         if all_results:
@@ -415,6 +831,7 @@ Esempi:
             print("=" * 70)
             print(f"File analizzati: {len(all_results)}")
             print(f"Score medio: {avg_score:.1f}/100")
+            _print_transfer_summary(all_results)
             
             # Mostra top/worst performing
             sorted_results = sorted(all_results, key=lambda x: x['global_score'], reverse=True)
@@ -425,9 +842,21 @@ Esempi:
             print(f"\n⚠️  Da migliorare:")
             for r in sorted_results[-3:]:
                 print(f"  {r['global_score']}/100 - {Path(r['url']).name}")
+            
+            report = analyzer.site_report(all_results)
+            _print_link_structure(report.get('link_graph'))
+            _print_site_issues(report['issues'])
+        
+        if analyzer.rules.advanced.monitoring.watch_mode:
+            analyzer.watch_directory(args.local_dir, recursive=args.recursive,
+                                     interval=args.interval, initial_results=all_results)
         
         return
     
+    elif args.watch:
+        analyzer.watch_directory(args.watch, interval=args.interval)
+        return
+    
     elif args.sitemap:
         all_results = analyzer.analyze_sitemap(args.sitemap, max_pages=args.max_pages)
         
@@ -436,13 +865,42 @@ Esempi:
             print(f"\n📊 RIEPILOGO SITEMAP")
             print("=" * 70)
             print(f"Pagine analizzate: {len(all_results)}")
+            if analyzer.download_errors:
+                print(f"Pagine non scaricate: {len(analyzer.download_errors)}")
             print(f"Score medio: {avg_score:.1f}/100")
+            _print_transfer_summary(all_results)
+            report = analyzer.site_report(all_results)
+            _print_link_structure(report.get('link_graph'))
+            _print_site_issues(analyzer.site_issues() + report['issues'])
+        
+        return
+    
+    elif args.crawl:
+        all_results = analyzer.analyze_site(args.crawl, max_pages=args.max_pages,
+                                            deep=not args.quick)
+        
+        if all_results:
+            avg_score = sum(r['global_score'] for r in all_results) / len(all_results)
+            print(f"\n📊 RIEPILOGO SITO")
+            print("=" * 70)
+            print(f"Pagine analizzate: {len(all_results)}")
+            print(f"Score medio: {avg_score:.1f}/100")
+            _print_transfer_summary(all_results)
+            report = analyzer.site_report()
+            _print_link_structure(report.get('link_graph'))
+            _print_site_issues(analyzer.site_issues() + report['issues'])
+            
+            sorted_results = sorted(all_results, key=lambda x: x['global_score'])
+            print(f"\n⚠️  Da migliorare:")
+            for r in sorted_results[:5]:
+                print(f"  {r['global_score']}/100 - {r['url']}")
         
         return
     
     # Genera report
     if results:
         analyzer.generate_report(results, format=args.output, output_file=args.save)
+        _print_site_issues(analyzer.site_issues())
 
 
 if __name__ == '__main__':
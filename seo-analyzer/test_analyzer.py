@@ -29,6 +29,7 @@ except ImportError as e:
 print("\n📦 Test 2: Utility Modules")
 try:
     from utils.crawler import Crawler
+    from utils.rate_limiter import HostRateLimiter
     from utils.parser import HTMLParser
     from utils.scorer import SEOScorer
     from utils.reporter import SEOReporter
@@ -216,6 +217,1659 @@ except Exception as e:
     print(f"❌ Errore analisi file: {e}")
     sys.exit(1)
 
+# Test documento condiviso
+print("\n📦 Test 10: ParsedDocument Condiviso")
+try:
+    from utils.parser import ParsedDocument
+    
+    document = ParsedDocument(html_test, 'https://test.com')
+    from_string = ContentAnalyzer(config).analyze(html_test, 'https://test.com')
+    from_document = ContentAnalyzer(config).analyze(document, 'https://test.com')
+    
+    assert from_string['score'] == from_document['score']
+    assert from_string['headings'] == from_document['headings']
+    assert ParsedDocument.ensure(document) is document
+    
+    # L'indice deve restituire gli stessi elementi di find_all
+    assert document.text == document.soup.get_text()
+    assert document.index.find_all('h2') == document.soup.find_all('h2')
+    assert document.index.find('meta', {'name': 'description'}) is \
+        document.soup.find('meta', {'name': 'description'})
+    assert document.index.find_all(['h1', 'h2']) == document.soup.find_all(['h1', 'h2'])
+    
+    mobile_results = MobileAnalyzer(config).analyze(document, 'https://test.com')
+    assert mobile_results['score'] >= 0
+    
+    # Pipeline completa su file temporaneo
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        page_path = Path(tmp_dir) / 'pagina-test.html'
+        page_path.write_text(html_test, encoding='utf-8')
+        page_results = SEOAnalyzer().analyze_file(str(page_path))
+    assert page_results['global_score'] > 0
+    assert page_results['performance']['resources']['total_fonts'] == 0
+    
+    print("✅ ParsedDocument condiviso tra analyzer (un solo parse per pagina)")
+except Exception as e:
+    print(f"❌ Errore ParsedDocument: {e}")
+    sys.exit(1)
+
+# Test analisi directory parallela
+print("\n📦 Test 11: Analisi Directory Parallela")
+try:
+    import io
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name in ['pagina-uno', 'pagina-due', 'pagina-tre']:
+            (Path(tmp_dir) / f'{name}.html').write_text(html_test, encoding='utf-8')
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = SEOAnalyzer().analyze_directory(tmp_dir)
+            parallel = SEOAnalyzer().analyze_directory(tmp_dir, workers=2)
+    
+    assert [r['url'] for r in serial] == [r['url'] for r in parallel]
+    assert [r['global_score'] for r in serial] == [r['global_score'] for r in parallel]
+    
+    print(f"✅ Analisi parallela coerente con quella seriale ({len(parallel)} file)")
+except Exception as e:
+    print(f"❌ Errore analisi parallela: {e}")
+    sys.exit(1)
+
+# Test link checker con server HTTP locale
+print("\n📦 Test 12: Link Checker Asincrono")
+try:
+    import threading
+    import time
+    from collections import Counter
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.link_checker import AIOHTTP_AVAILABLE, LinkChecker
+    
+    hits = Counter()
+    client_ports = set()
+    
+    class StandInHandler(BaseHTTPRequestHandler):
+        """Server di prova: /ok, /no-head (rifiuta HEAD), /missing (404), /lento; keep-alive"""
+        
+        protocol_version = 'HTTP/1.1'
+        
+        def _respond(self, method):
+            hits[(method, self.path)] += 1
+            client_ports.add(self.client_address[1])
+            if self.path == '/lento':
+                time.sleep(0.3)
+            if self.path == '/missing':
+                status = 404
+            elif self.path == '/no-head' and method == 'HEAD':
+                status = 405
+            else:
+                status = 200
+            self.send_response(status)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        
+        def do_HEAD(self):
+            self._respond('HEAD')
+        
+        def do_GET(self):
+            self._respond('GET')
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    checker = LinkChecker({'max_concurrency': 4, 'per_host_limit': 2})
+    status = checker.check_many([f'{base}/ok', f'{base}/ok', f'{base}/no-head', f'{base}/missing'])
+    assert status == {f'{base}/ok': False, f'{base}/no-head': False, f'{base}/missing': True}
+    assert hits[('GET', '/no-head')] == 1
+    
+    # Seconda pagina: gli URL già verificati non generano nuove richieste
+    html_links = f'''<html><body>
+        <a href="{base}/ok">Pagina esistente</a>
+        <a href="{base}/missing">Pagina mancante</a>
+        <a href="mailto:info@test.com">Scrivici una email</a>
+    </body></html>'''
+    link_analyzer = LinkAnalyzer(config)
+    link_analyzer.link_checker = checker
+    link_results = link_analyzer.analyze(html_links, f'{base}/', check_broken=True)
+    
+    # Stesso URL da più thread: una sola richiesta, gli altri attendono il risultato
+    slow_results = []
+    threads = [threading.Thread(target=lambda: slow_results.append(checker.check(f'{base}/lento')))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    # Chiamata da codice asincrono: il loop del checker è separato da quello del chiamante
+    async def check_from_coroutine():
+        return checker.check_many([f'{base}/ok?da=async'])
+    
+    import asyncio
+    assert asyncio.run(check_from_coroutine()) == {f'{base}/ok?da=async': False}
+    checker.close()
+    server.shutdown()
+    
+    assert hits[('HEAD', '/ok')] == 1
+    assert hits[('HEAD', '/missing')] == 1
+    assert link_results['summary']['broken_count'] == 1
+    assert hits[('HEAD', '/lento')] == 1 and slow_results == [False] * 4
+    if AIOHTTP_AVAILABLE:
+        # Connessioni keep-alive riusate tra le chiamate (al massimo per_host_limit)
+        assert len(client_ports) <= 2, client_ports
+    
+    # Più link dello stesso host del limite per host: l'attesa in coda non conta nel timeout
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_HEAD(self):
+            time.sleep(0.2)
+            self.send_response(200)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        
+        def log_message(self, *args):
+            pass
+    
+    slow_server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=slow_server.serve_forever, daemon=True).start()
+    slow_base = f'http://127.0.0.1:{slow_server.server_address[1]}'
+    queued_checker = LinkChecker({'max_concurrency': 20, 'per_host_limit': 2, 'timeout_seconds': 1})
+    queued = queued_checker.check_many([f'{slow_base}/pagina-{n}' for n in range(24)])
+    queued_checker.close()
+    slow_server.shutdown()
+    if AIOHTTP_AVAILABLE:
+        assert not any(queued.values()), f"{sum(queued.values())} link sani segnalati come rotti"
+    
+    print(f"✅ Link Checker funziona ({checker.checked_count} URL verificati una sola volta)")
+except Exception as e:
+    print(f"❌ Errore Link Checker: {e}")
+    sys.exit(1)
+
+# Test crawler concorrente
+print("\n📦 Test 13: Crawler Concorrente")
+try:
+    import io
+    import contextlib
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.crawler import Crawler
+    from utils.rate_limiter import HostRateLimiter
+    
+    class SiteHandler(BaseHTTPRequestHandler):
+        """Sito di prova: /p/N collega /p/N+1 e /p/2N"""
+        
+        def do_GET(self):
+            if not self.path.startswith('/p/'):
+                self.send_error(404)
+                return
+            page = int(self.path.rsplit('/', 1)[-1] or 0)
+            body = f'<html><body><a href="/p/{(page + 1) % 20}">Avanti</a>' \
+                   f'<a href="/p/{(page * 2) % 20}#top">Salta</a></body></html>'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start_url = f'http://127.0.0.1:{server.server_address[1]}/p/0'
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        reused_crawler = Crawler({'concurrent_requests': 4,
+                                  'seen_filter': {'probabilistic': True, 'expected_urls': 1000}},
+                                 rate_limiter=HostRateLimiter({'enabled': False}))
+        crawled = reused_crawler.crawl_site(start_url)
+        recrawled = reused_crawler.crawl_site(start_url)
+        limited = Crawler({'concurrent_requests': 4}).crawl_site(start_url, max_pages=5)
+    server.shutdown()
+    
+    assert len(crawled) == 20
+    assert len({p['url'] for p in crawled}) == 20
+    assert len(recrawled) == 20  # Stato del crawl nuovo a ogni chiamata
+    assert len(limited) == 5
+    
+    print(f"✅ Crawler concorrente funziona ({len(crawled)} pagine, 4 richieste in volo)")
+except Exception as e:
+    print(f"❌ Errore crawler: {e}")
+    sys.exit(1)
+
+# Test frontiera di crawling
+print("\n📦 Test 14: Frontiera di Crawling")
+try:
+    from utils.frontier import CrawlFrontier, BloomFilter, normalize_url
+    
+    assert normalize_url('HTTPS://Example.COM:443/Pagina/?b=2&a=1#top') == \
+        'https://example.com/Pagina?a=1&b=2'
+    assert normalize_url('http://example.com:8080') == 'http://example.com:8080/'
+    
+    frontier = CrawlFrontier()
+    assert frontier.add('https://example.com/a/')
+    assert not frontier.add('https://EXAMPLE.com:443/a')
+    assert frontier.add('https://example.com/b?x=1&y=2')
+    assert not frontier.add('https://example.com/b?y=2&x=1')
+    assert frontier.pop() == 'https://example.com/a/' and len(frontier) == 1
+    
+    bloom = BloomFilter(expected_items=1000, false_positive_rate=0.01)
+    for i in range(1000):
+        bloom.add(f'https://example.com/{i}')
+    assert all(f'https://example.com/{i}' in bloom for i in range(1000))
+    false_positives = sum(f'https://altro.com/{i}' in bloom for i in range(1000))
+    assert false_positives < 50
+    
+    print(f"✅ Frontiera O(1) funziona (bloom: {bloom.size_bytes} byte, {false_positives} falsi positivi)")
+except Exception as e:
+    print(f"❌ Errore frontiera: {e}")
+    sys.exit(1)
+
+# Test crawl in streaming
+print("\n📦 Test 15: Crawl e Analisi in Streaming")
+try:
+    import io
+    import contextlib
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    import utils.parser as parser_module
+    from seo_analyzer import SEOAnalyzer
+    
+    class StreamSiteHandler(BaseHTTPRequestHandler):
+        """Sito di prova: /p/N collega /p/N+1 e /p/0"""
+        
+        def do_GET(self):
+            page = int(self.path.rsplit('/', 1)[-1] or 0)
+            body = f'<html><head><title>Pagina {page}</title></head><body><h1>Pagina {page}</h1>' \
+                   f'<a href="/p/{(page + 1) % 10}">Avanti</a><a href="/p/0">Home</a></body></html>'.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StreamSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    start_url = f'http://127.0.0.1:{server.server_address[1]}/p/0'
+    
+    streamed = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        site_analyzer = SEOAnalyzer()
+        site_analyzer.rate_limiter.enabled = False
+        summaries = site_analyzer.analyze_site(start_url, max_pages=10,
+                                               on_result=lambda r: streamed.append(r['url']))
+        first_graph_edges = site_analyzer.link_graph.edge_count
+        
+        # Un solo parse per pagina: i link del crawler vengono dallo stesso documento analizzato
+        parse_count = [0]
+        original_soup = parser_module.BeautifulSoup
+        
+        def counting_soup(*args, **kwargs):
+            parse_count[0] += 1
+            return original_soup(*args, **kwargs)
+        
+        parser_module.BeautifulSoup = counting_soup
+        try:
+            recrawl = site_analyzer.analyze_site(start_url, max_pages=10)
+        finally:
+            parser_module.BeautifulSoup = original_soup
+    server.shutdown()
+    
+    assert len(summaries) == 10 and len(streamed) == 10
+    assert site_analyzer.crawler.pages == []
+    assert 'html' not in summaries[0] and 'all_issues' not in summaries[0]
+    assert site_analyzer.link_graph.page_count == 10
+    assert first_graph_edges == site_analyzer.link_graph.edge_count == 18  # self-link e duplicati esclusi
+    assert len(recrawl) == 10  # Il secondo crawl riparte da zero
+    assert parse_count[0] == 10, parse_count
+    
+    print(f"✅ Crawl in streaming funziona ({len(summaries)} pagine, "
+          f"{site_analyzer.link_graph.edge_count} link nel grafo)")
+except Exception as e:
+    print(f"❌ Errore crawl in streaming: {e}")
+    sys.exit(1)
+
+# Test client HTTP condiviso
+print("\n📦 Test 16: Client HTTP Condiviso")
+try:
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.context import AnalysisContext
+    from utils.http_client import HTTPClient
+    from utils.parser import ParsedDocument
+    from analyzers.url_analyzer import URLAnalyzer
+    
+    http_log = {'ports': set(), 'agents': set(), 'flaky': 0}
+    
+    class KeepAliveHandler(BaseHTTPRequestHandler):
+        """Server HTTP/1.1: /flaky risponde 503 alla prima richiesta"""
+        
+        protocol_version = 'HTTP/1.1'
+        
+        def do_GET(self):
+            http_log['ports'].add(self.client_address[1])
+            http_log['agents'].add(self.headers.get('User-Agent'))
+            status = 200
+            if self.path == '/flaky':
+                http_log['flaky'] += 1
+                status = 503 if http_log['flaky'] == 1 else 200
+            body = b'User-agent: *\nSitemap: /sitemap.xml\n'
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    client = HTTPClient({'user_agent': 'Test-Bot/2.0', 'backoff_factor': 0})
+    assert client.get(f'{base_url}/flaky').status_code == 200
+    assert http_log['flaky'] == 2
+    
+    url_analyzer = URLAnalyzer(config, http_client=client)
+    context = AnalysisContext(ParsedDocument.ensure('', f'{base_url}/pagina'), f'{base_url}/pagina')
+    for _ in range(5):
+        assert url_analyzer._check_robots(context, f'{base_url}/pagina')['has_sitemap_reference']
+    server.shutdown()
+    
+    assert url_analyzer.http is client
+    assert len(http_log['ports']) == 1  # Una sola connessione riutilizzata
+    assert http_log['agents'] == {'Test-Bot/2.0'}
+    
+    print("✅ Client HTTP condiviso funziona (retry su 503, 7 richieste su 1 connessione)")
+except Exception as e:
+    print(f"❌ Errore client HTTP: {e}")
+    sys.exit(1)
+
+# Test cache per origine di sitemap/robots
+print("\n📦 Test 17: Cache Sitemap e Robots per Sito")
+try:
+    import time
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from analyzers.url_analyzer import URLAnalyzer
+    from utils.http_client import HTTPClient
+    from utils.rate_limiter import HostRateLimiter
+    
+    site_hits = {'/sitemap.xml': 0, '/robots.txt': 0}
+    
+    class SiteFilesHandler(BaseHTTPRequestHandler):
+        """Sito senza sitemap.xml, robots.txt senza riferimento alla sitemap"""
+        
+        def do_GET(self):
+            site_hits[self.path] = site_hits.get(self.path, 0) + 1
+            if self.path == '/sitemap.xml':
+                time.sleep(0.3)
+            status, body = (200, b'User-agent: *\n') if self.path == '/robots.txt' else (404, b'')
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SiteFilesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    site_analyzer = URLAnalyzer(config)
+    page_html = '<html><head><title>Pagina</title></head><body></body></html>'
+    site_issue_counts = []
+    for page in ('a', 'b', 'c'):
+        page_results = site_analyzer.analyze(page_html, f'{base_url}/{page}')
+        site_issue_counts.append(sum(i.get('scope') == 'site' for i in page_results['issues']))
+        assert page_results['robots']['exists'] and not page_results['sitemap']['exists']
+    
+    assert site_hits['/sitemap.xml'] == 1 and site_hits['/robots.txt'] == 1
+    assert site_issue_counts == [0, 0, 0]  # Riportati una volta a livello sito, non sulle pagine
+    assert len(site_analyzer.site_issues[base_url]) == 2
+    
+    # Con TTL scaduto la verifica viene ripetuta
+    site_analyzer.site_cache_ttl = 1e-9
+    site_analyzer.analyze(page_html, f'{base_url}/d')
+    assert site_hits['/sitemap.xml'] == 2
+    
+    # Pagine dello stesso sito attendono una sola verifica, origini diverse in parallelo
+    other_server = ThreadingHTTPServer(('127.0.0.1', 0), SiteFilesHandler)
+    threading.Thread(target=other_server.serve_forever, daemon=True).start()
+    other_url = f'http://127.0.0.1:{other_server.server_address[1]}'
+    site_hits.update({'/sitemap.xml': 0, '/robots.txt': 0})
+    
+    shared_http = HTTPClient()
+    limiter = HostRateLimiter({'requests_per_second': 100}, http_client=shared_http)
+    limiter.acquire(f'{base_url}/a')  # Il Crawl-delay scarica robots.txt una volta
+    parallel_analyzer = URLAnalyzer(config, http_client=shared_http, rate_limiter=limiter)
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(lambda page: parallel_analyzer.analyze(page_html, page),
+                      [f'{origin}/{name}' for origin in (base_url, other_url) for name in 'abc']))
+    parallel_elapsed = time.monotonic() - started
+    server.shutdown()
+    other_server.shutdown()
+    assert site_hits == {'/sitemap.xml': 2, '/robots.txt': 2}, site_hits  # robots.txt di base_url dal limiter
+    assert parallel_elapsed < 0.55, parallel_elapsed
+    assert len(parallel_analyzer.site_issues) == 2
+    
+    print("✅ Sitemap e robots verificati una volta per sito (3 pagine, 1 download)")
+except Exception as e:
+    print(f"❌ Errore cache sitemap/robots: {e}")
+    sys.exit(1)
+
+# Test cache HTTP su disco
+print("\n📦 Test 18: Cache HTTP con Rivalidazione")
+try:
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.http_cache import HTTPCache
+    from utils.http_client import HTTPClient
+    
+    cache_log = {'full': 0, 'not_modified': 0}
+    
+    class ETagHandler(BaseHTTPRequestHandler):
+        """Risponde 304 se l'ETag inviato corrisponde"""
+        
+        def do_GET(self):
+            etag = f'"v-{self.path}"'
+            if self.headers.get('If-None-Match') == etag:
+                cache_log['not_modified'] += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            
+            cache_log['full'] += 1
+            body = f'<html><body>{self.path}</body></html>'.encode('utf-8') * 50
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ETagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first_run = HTTPClient(cache=HTTPCache(cache_dir))
+        first_body = first_run.cached_get(f'{base_url}/pagina').text
+        
+        # Nuova esecuzione: la cache viene riletta da disco
+        second_run = HTTPClient(cache=HTTPCache(cache_dir))
+        revalidated = second_run.cached_get(f'{base_url}/pagina')
+        assert revalidated.status_code == 200 and revalidated.text == first_body
+        assert getattr(revalidated, 'from_cache', False)
+        assert cache_log == {'full': 1, 'not_modified': 1}
+        
+        # Limite di dimensione: le voci meno usate vengono rimosse
+        small = HTTPCache(cache_dir, max_size_mb=4000 / (1024 * 1024))
+        small_client = HTTPClient(cache=small)
+        for page in ('a', 'b', 'c'):
+            small_client.cached_get(f'{base_url}/{page}')
+        small_client.cached_get(f'{base_url}/b')
+        small_client.cached_get(f'{base_url}/d')
+        assert small.size_bytes <= small.max_size_bytes
+        assert small.lookup(f'{base_url}/b') is not None
+        assert small.lookup(f'{base_url}/a') is None
+    server.shutdown()
+    
+    print(f"✅ Cache HTTP funziona (304 servito da disco, {len(small)} voci entro il limite LRU)")
+except Exception as e:
+    print(f"❌ Errore cache HTTP: {e}")
+    sys.exit(1)
+
+# Test rate limiter adattivo
+print("\n📦 Test 19: Rate Limiter per Host")
+try:
+    import threading
+    import time
+    import requests
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.http_client import HTTPClient
+    from utils.rate_limiter import HostRateLimiter
+    
+    class CrawlDelayHandler(BaseHTTPRequestHandler):
+        """robots.txt con Crawl-delay di 2 secondi"""
+        
+        def do_GET(self):
+            body = b'User-agent: *\nCrawl-delay: 2\n'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CrawlDelayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    limiter = HostRateLimiter({'requests_per_second': 50, 'burst': 3}, http_client=HTTPClient())
+    assert limiter.rate_for(f'{base_url}/pagina') == 0.5  # Crawl-delay più restrittivo
+    server.shutdown()
+    
+    # Burst senza attesa, poi una richiesta ogni 1/rate secondi
+    limiter.respect_crawl_delay = False
+    waits = [limiter.acquire('https://cdn.example.com/p') for _ in range(4)]
+    assert waits[:3] == [0.0, 0.0, 0.0] and 0 < waits[3] <= 0.03
+    
+    throttled = requests.Response()
+    throttled.status_code = 429
+    throttled.headers['Retry-After'] = '0.2'
+    limiter.record('https://cdn.example.com/p', throttled)
+    assert limiter.rate_for('https://cdn.example.com/p') == 25
+    assert limiter.acquire('https://cdn.example.com/p') >= 0.15
+    
+    ok = requests.Response()
+    ok.status_code = 200
+    limiter.record('https://cdn.example.com/p', ok)
+    assert 25 < limiter.rate_for('https://cdn.example.com/p') <= 50
+    
+    # Client reale: i 429 arrivano al limiter invece di essere ritentati da urllib3
+    throttle_log = {'requests': 0}
+    
+    class ThrottlingHandler(BaseHTTPRequestHandler):
+        """Due 429 con Retry-After lungo, poi la pagina"""
+        
+        def do_GET(self):
+            throttle_log['requests'] += 1
+            throttled_now = throttle_log['requests'] <= 2
+            body = b'' if throttled_now else b'<html></html>'
+            self.send_response(429 if throttled_now else 200)
+            if throttled_now:
+                self.send_header('Retry-After', '4')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ThrottlingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_url = f'http://127.0.0.1:{server.server_address[1]}/pagina'
+    
+    client = HTTPClient()
+    live_limiter = HostRateLimiter({'requests_per_second': 5, 'max_retry_after_seconds': 0.2,
+                                    'respect_crawl_delay': False}, http_client=client)
+    start = time.perf_counter()
+    response = live_limiter.fetch(page_url)
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    
+    assert response.status_code == 200 and throttle_log['requests'] == 3
+    assert live_limiter.rate_for(page_url) < 5  # Backoff applicato dal limiter
+    assert elapsed < 2  # Retry-After limitato a max_retry_after_seconds, nessuna attesa di urllib3
+    
+    print("✅ Rate limiter funziona (burst, Crawl-delay, backoff su 429 con Retry-After)")
+except Exception as e:
+    print(f"❌ Errore rate limiter: {e}")
+    sys.exit(1)
+
+# Test sitemap in streaming
+print("\n📦 Test 20: Sitemap in Streaming")
+try:
+    import gzip
+    import os
+    import tempfile
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.http_client import HTTPClient
+    from utils.http_cache import HTTPCache
+    from utils.context import AnalysisContext
+    from utils.parser import ParsedDocument
+    from utils.sitemap import SitemapReader
+    from analyzers.url_analyzer import URLAnalyzer
+    
+    sitemap_requests = []
+    not_modified = []
+    
+    def urlset(first, count):
+        entries = ''.join(f'<url><loc>https://example.com/p/{i}</loc></url>'
+                          for i in range(first, first + count))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f'{entries}</urlset>').encode('utf-8')
+    
+    class SitemapHandler(BaseHTTPRequestHandler):
+        """Sitemap index con una figlia gzip e due figlie XML"""
+        
+        def do_GET(self):
+            sitemap_requests.append(self.path)
+            base = f'http://127.0.0.1:{self.server.server_address[1]}'
+            if self.path == '/sitemap.xml':
+                children = ''.join(f'<sitemap><loc>{base}/{name}</loc></sitemap>'
+                                   for name in ('a.xml.gz', 'b.xml', 'c.xml'))
+                body = ('<?xml version="1.0" encoding="UTF-8"?>'
+                        '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                        f'{children}</sitemapindex>').encode('utf-8')
+            elif self.path == '/a.xml.gz':
+                body = gzip.compress(urlset(0, 30))
+            else:
+                body = urlset(100, 1000) if self.path == '/b.xml' else urlset(2000, 30)
+            etag = f'"{len(body)}"'
+            if self.headers.get('If-None-Match') == etag:
+                not_modified.append(self.path)
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SitemapHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    reader = SitemapReader(HTTPClient())
+    sitemap_urls = list(reader.iter_urls(f'{base_url}/sitemap.xml', max_urls=40))
+    
+    assert len(sitemap_urls) == 40
+    assert sitemap_urls[29] == 'https://example.com/p/29' and sitemap_urls[30] == 'https://example.com/p/100'
+    assert '/c.xml' not in sitemap_requests  # Interrotta appena raggiunto max_urls
+    
+    page_context = AnalysisContext(ParsedDocument.ensure('', f'{base_url}/pagina'), f'{base_url}/pagina')
+    sitemap_check = URLAnalyzer(config)._check_sitemap(page_context, f'{base_url}/pagina')
+    streamed_downloads = len(sitemap_requests)
+    
+    # Con la cache HTTP: lettura interrotta senza voci troncate, poi 304 riletti da disco
+    with tempfile.TemporaryDirectory() as cache_dir:
+        sitemap_cache = HTTPCache(cache_dir)
+        cached_reader = SitemapReader(HTTPClient(cache=sitemap_cache))
+        assert list(cached_reader.iter_urls(f'{base_url}/sitemap.xml', max_urls=40)) == sitemap_urls
+        assert len(sitemap_cache) == 2  # sitemap.xml e a.xml.gz: b.xml (50KB) letta solo in parte
+        full_urls = list(cached_reader.iter_urls(f'{base_url}/sitemap.xml'))
+        assert len(full_urls) == 1060 and len(sitemap_cache) == 4
+        assert list(cached_reader.iter_urls(f'{base_url}/sitemap.xml')) == full_urls
+        assert sorted(not_modified) == ['/a.xml.gz', '/a.xml.gz', '/b.xml', '/c.xml', '/sitemap.xml', '/sitemap.xml']
+        assert sitemap_cache.hits == 6
+    server.shutdown()
+    assert sitemap_check['is_valid'] and sitemap_check['is_index']
+    assert sitemap_check['sitemap_count'] == 3
+    
+    print(f"✅ Sitemap in streaming funziona (index + gzip, {streamed_downloads} download, 304 riletti da disco)")
+except Exception as e:
+    print(f"❌ Errore sitemap in streaming: {e}")
+    sys.exit(1)
+
+# Test analisi incrementale
+print("\n📦 Test 21: Analisi Incrementale Directory")
+try:
+    import io
+    import os
+    import time
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    from utils.result_cache import ResultCache, config_fingerprint
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir) / 'build'
+        site_dir.mkdir()
+        cache_file = str(Path(tmp_dir) / 'results.json')
+        for name in ['pagina-uno', 'pagina-due', 'pagina-tre']:
+            (site_dir / f'{name}.html').write_text(html_test, encoding='utf-8')
+        
+        incremental = SEOAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = incremental.analyze_directory(str(site_dir), cache_file=cache_file)
+        
+        (site_dir / 'pagina-due.html').write_text(html_test.replace('Test', 'Prova'), encoding='utf-8')
+        second_output = io.StringIO()
+        with contextlib.redirect_stdout(second_output):
+            second = incremental.analyze_directory(str(site_dir), cache_file=cache_file)
+        
+        assert len(first) == len(second) == 3
+        assert [r['url'] for r in first] == [r['url'] for r in second]
+        assert '2 file invariati' in second_output.getvalue()
+        assert second_output.getvalue().count('Analisi file:') == 1  # Solo il file modificato
+        
+        # Configurazione modificata: cache invalidata
+        changed_config = dict(incremental.config, scoring={'changed': True})
+        assert ResultCache(cache_file, config_fingerprint(changed_config)).get(site_dir / 'pagina-uno.html') is None
+        
+        # Dipendenze: le ancore di altre pagine e i CSS locali invalidano la voce della pagina
+        linked_dir = Path(tmp_dir) / 'linked'
+        linked_dir.mkdir()
+        linked_cache = str(Path(tmp_dir) / 'linked.json')
+        (linked_dir / 'stile.css').write_text('body { color: #333; }', encoding='utf-8')
+        (linked_dir / 'index.html').write_text(html_test.replace(
+            '</body>', '<a href="other.html#sec">Sezione</a></body>').replace(
+            '</head>', '<link rel="stylesheet" href="stile.css"></head>'), encoding='utf-8')
+        (linked_dir / 'other.html').write_text('<html><body><h2 id="sec">Sezione</h2></body></html>',
+                                               encoding='utf-8')
+        
+        def run_linked():
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                linked = {Path(r['url']).name: r for r in incremental.analyze_directory(str(linked_dir),
+                                                                                     cache_file=linked_cache)}
+            return linked, output.getvalue().count('Analisi file:')
+        
+        linked, analyzed = run_linked()
+        assert analyzed == 2 and linked['index.html']['links']['summary']['broken_count'] == 0
+        assert str(linked_dir / 'other.html') in linked['index.html']['dependencies']
+        
+        (linked_dir / 'other.html').write_text('<html><body><h2>Sezione</h2></body></html>', encoding='utf-8')
+        linked, analyzed = run_linked()
+        assert analyzed == 2  # other.html modificata, index.html ne legge gli id
+        assert linked['index.html']['links']['summary']['broken_count'] == 1
+        
+        (linked_dir / 'stile.css').write_text('body { color: #000; }', encoding='utf-8')
+        assert run_linked()[1] == 1  # Solo index.html include il CSS
+        assert run_linked()[1] == 0
+        
+        # Checkout nuovo: date di modifica diverse ma contenuto identico, cache ancora valida
+        for touched in linked_dir.iterdir():
+            os.utime(touched, (time.time() + 60, time.time() + 60))
+        assert run_linked()[1] == 0
+        
+        # File nuovi: rianalizzate solo le pagine che li cercavano (anche come link rotti)
+        (linked_dir / 'rimandi.html').write_text(html_test.replace(
+            '</body>', '<a href="/prossima">Prossima</a></body>'), encoding='utf-8')
+        linked, analyzed = run_linked()
+        assert analyzed == 1 and linked['rimandi.html']['links']['summary']['broken_count'] == 1
+        assert str(linked_dir / 'prossima.html') in linked['rimandi.html']['dependencies']
+        (linked_dir / 'extra.css').write_text('p { margin: 0; }', encoding='utf-8')
+        assert run_linked()[1] == 0
+        (linked_dir / 'prossima.html').write_text(html_test, encoding='utf-8')
+        linked, analyzed = run_linked()
+        assert analyzed == 2  # La pagina nuova e rimandi.html, non index.html
+        assert linked['rimandi.html']['links']['summary']['broken_count'] == 0
+    
+    print("✅ Analisi incrementale funziona (file invariati riutilizzati, config e dipendenze invalidano la cache)")
+except Exception as e:
+    print(f"❌ Errore analisi incrementale: {e}")
+    sys.exit(1)
+
+# Test watch mode
+print("\n📦 Test 22: Watch Mode")
+try:
+    import io
+    import time
+    import contextlib
+    import tempfile
+    import threading
+    from seo_analyzer import SEOAnalyzer
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir)
+        (site_dir / 'css').mkdir()
+        (site_dir / 'css' / 'stile.css').write_text('body { color: #333; }', encoding='utf-8')
+        good_page = html_test.replace('</head>', '<link rel="stylesheet" href="/css/stile.css"></head>')
+        (site_dir / 'pagina.html').write_text(good_page, encoding='utf-8')
+        (site_dir / 'altra.html').write_text(html_test, encoding='utf-8')
+        
+        def edit_site():
+            time.sleep(0.5)
+            (site_dir / 'css' / 'stile.css').write_text('body { color: #000; }', encoding='utf-8')
+            time.sleep(1.5)
+            (site_dir / 'pagina.html').write_text('<html><body><p>Vuota</p></body></html>', encoding='utf-8')
+        
+        watcher_analyzer = SEOAnalyzer()
+        watch_output = io.StringIO()
+        editor = threading.Thread(target=edit_site)
+        with contextlib.redirect_stdout(watch_output):
+            initial = watcher_analyzer.analyze_directory(tmp_dir)
+            editor.start()
+            final_scores = watcher_analyzer.watch_directory(tmp_dir, interval=0.2, initial_results=initial,
+                                                            max_cycles=2, cycle_timeout=10)
+        editor.join()
+    
+    output = watch_output.getvalue()
+    assert output.count('🔄 1 pagine rianalizzate') == 2  # CSS -> solo pagina.html, poi pagina.html
+    assert '🚨 ALERT: pagina.html' in output
+    assert len(final_scores) == 2
+    
+    mode = 'inotify' if '(inotify,' in output else 'polling'
+    print(f"✅ Watch mode funziona ({mode}, CSS mappato sulle pagine, alert su calo di score)")
+except Exception as e:
+    print(f"❌ Errore watch mode: {e}")
+    sys.exit(1)
+
+# Test duplicati a livello sito
+print("\n📦 Test 23: Title e Description Duplicati")
+try:
+    import io
+    import contextlib
+    from analyzers.site_analyzer import SiteAnalyzer
+    from seo_analyzer import SEOAnalyzer
+    
+    def page_summary(n, title, description, h1):
+        return {'url': f'https://example.com/{n}', 'title': title, 'meta_description': description, 'h1': h1}
+    
+    site = SiteAnalyzer(config)
+    for n in range(1000):
+        site.add_page(page_summary(n, f'Pagina {n}', f'Descrizione unica {n}', f'Titolo {n}'))
+    site.add_page(page_summary('a', 'Offerte  Estate', 'Scopri le offerte', 'Offerte'))
+    site.add_page(page_summary('b', 'offerte estate', 'Scopri le offerte', None))
+    site.add_page(page_summary('c', 'OFFERTE ESTATE ', 'Altro testo', 'Offerte'))
+    
+    site_results = site.analyze()
+    assert [c['count'] for c in site_results['duplicates']['title']] == [3]
+    assert site_results['duplicates']['meta_description'][0]['urls'] == \
+        ['https://example.com/a', 'https://example.com/b']
+    assert len(site_results['duplicates']['h1']) == 1
+    assert len(site_results['issues']) == 3 and all(i['scope'] == 'site' for i in site_results['issues'])
+    
+    # Stessi segnali dai risultati completi e da quelli compatti del crawl
+    with contextlib.redirect_stdout(io.StringIO()):
+        full_results = SEOAnalyzer()._analyze_html(html_test, 'https://example.com/x', deep=False)
+    assert SiteAnalyzer.page_signals(full_results) == \
+        SiteAnalyzer.page_signals(SEOAnalyzer.summarize_result(full_results))
+    
+    print(f"✅ Duplicati a livello sito rilevati ({site_results['pages']} pagine, 3 cluster)")
+except Exception as e:
+    print(f"❌ Errore duplicati sito: {e}")
+    sys.exit(1)
+
+# Test contenuti quasi duplicati
+print("\n📦 Test 24: Contenuti Quasi Duplicati (MinHash + LSH)")
+try:
+    import random
+    import time
+    from analyzers.content_analyzer import ContentAnalyzer
+    from analyzers.site_analyzer import SiteAnalyzer
+    
+    rng = random.Random(7)
+    vocabulary = [f'parola{i}' for i in range(5000)]
+    hasher = ContentAnalyzer(config).min_hasher
+    
+    texts = [' '.join(rng.choice(vocabulary) for _ in range(300)) for _ in range(2000)]
+    # Pagina 1500: copia della 10 con poche parole cambiate
+    near_copy = texts[10].split()
+    for position in (50, 150, 250):
+        near_copy[position] = 'modificata'
+    texts[1500] = ' '.join(near_copy)
+    
+    site = SiteAnalyzer(config)
+    for n, text in enumerate(texts):
+        site.add_page({'url': f'https://example.com/{n}', 'content': {'fingerprint': hasher.signature(text)}})
+    
+    start = time.perf_counter()
+    site_results = site.analyze()
+    elapsed = time.perf_counter() - start
+    
+    pairs = site_results['near_duplicates']
+    assert len(pairs) == 1
+    assert sorted(pairs[0]['urls']) == ['https://example.com/10', 'https://example.com/1500']
+    assert pairs[0]['similarity'] >= 0.8
+    assert any(i['category'] == 'content' and i['scope'] == 'site' for i in site_results['issues'])
+    
+    print(f"✅ Quasi duplicati rilevati (2000 pagine in {elapsed * 1000:.0f} ms, "
+          f"similarità {pairs[0]['similarity']:.0%})")
+except Exception as e:
+    print(f"❌ Errore quasi duplicati: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 25: Grafo Link Interni (PageRank, Profondità, Orfane)")
+try:
+    import random
+    import time
+    from analyzers.site_analyzer import SiteAnalyzer
+    from utils.link_graph import LinkGraph
+    
+    def page(path, links, nofollow=()):
+        internal = [{'absolute_url': f'https://example.com{href}', 'has_nofollow': False} for href in links]
+        internal += [{'absolute_url': f'https://example.com{href}', 'has_nofollow': True} for href in nofollow]
+        internal.append({'absolute_url': 'mailto:info@example.com', 'has_nofollow': False})
+        return {'url': f'https://example.com{path}', 'links': {'internal_links': internal}}
+    
+    site = SiteAnalyzer(config)
+    for result in [
+        page('/', ['/a', '/b'], nofollow=['/orfana']),
+        page('/a', ['/', '/c']),
+        page('/b', ['/', '/a']),
+        page('/c', ['/d']),
+        page('/d', ['/e']),
+        page('/e', ['/']),
+        page('/orfana', ['/']),
+    ]:
+        site.add_page(result)
+    
+    structure = site.analyze()['link_graph']
+    assert structure['home'] == 'https://example.com/'
+    assert structure['orphans'] == ['https://example.com/orfana']
+    assert structure['deep_pages'] == ['https://example.com/e']
+    assert structure['depth_distribution'] == {-1: 1, 0: 1, 1: 2, 2: 1, 3: 1, 4: 1}
+    assert structure['top_pages'][0]['url'] == 'https://example.com/'
+    assert abs(sum(site.link_graph.pagerank()) - 1.0) < 1e-6
+    
+    # Scala: 100k pagine e 1M di link
+    rng = random.Random(3)
+    graph = LinkGraph()
+    for n in range(100_000):
+        graph.node_id(f'https://example.com/p/{n}')
+    graph.analyzed = bytearray(b'\x01') * graph.node_count
+    graph.sources.extend(rng.randrange(100_000) for _ in range(1_000_000))
+    graph.targets.extend(rng.randrange(100_000) for _ in range(1_000_000))
+    
+    start = time.perf_counter()
+    ranks = graph.pagerank()
+    depths = graph.click_depths('https://example.com/p/0')
+    in_degrees = graph.in_degrees()
+    elapsed = time.perf_counter() - start
+    
+    assert len(ranks) == len(depths) == len(in_degrees) == 100_000
+    assert abs(sum(ranks) - 1.0) < 1e-6
+    assert max(depths) > 0
+    
+    print(f"✅ Grafo link interni (PageRank e profondità su 100k pagine / 1M link in {elapsed:.2f}s)")
+except Exception as e:
+    print(f"❌ Errore grafo link interni: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 26: Verifica Offline Link Locali")
+try:
+    import io
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    from utils.local_site import LocalSiteIndex
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir) / 'build'
+        (site_dir / 'guida').mkdir(parents=True)
+        (site_dir / 'index.html').write_text(
+            '<html><body><h2 id="locale">Sezione</h2>'
+            '<a href="guida/">Guida</a> <a href="/contatti">Contatti</a> <a href="/guida/#passi">Passi</a>'
+            '<a href="mancante.html">Rotto</a> <a href="contatti.html#assente">Ancora rotta</a>'
+            '<a href="#locale">Su</a> <a href="#sparita">Giù</a></body></html>', encoding='utf-8')
+        (site_dir / 'contatti.html').write_text('<html><body><a href="/">Home</a></body></html>', encoding='utf-8')
+        (site_dir / 'guida' / 'index.html').write_text(
+            '<html><body><ol id="passi"></ol><a href="../index.html#locale">Home</a></body></html>', encoding='utf-8')
+        
+        index = LocalSiteIndex(str(site_dir))
+        assert index.resolve('/contatti', 'index.html') == ('contatti.html', '')
+        assert index.resolve('../index.html#locale', 'guida/index.html') == ('index.html', 'locale')
+        assert index.check('../../fuori.html', 'guida/index.html') == 'file'
+        assert LocalSiteIndex(str(site_dir), site_root='/blog/').resolve('/blog/guida/', 'index.html')[0] == 'guida/index.html'
+        
+        analyzer = SEOAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = analyzer.analyze_directory(str(site_dir))
+        
+        home = next(r for r in results if r['url'].endswith('build/index.html'))
+        broken = sorted(link['href'] for link in home['links']['broken_links'])
+        assert broken == ['#sparita', 'contatti.html#assente', 'mancante.html'], broken
+        assert all(not r['links']['broken_links'] for r in results if r is not home)
+        
+        # Link root-relative e di directory risolti sui file reali nel grafo
+        structure = analyzer.site_report(results)['link_graph']
+        assert structure['orphans'] == []
+        assert structure['depth_distribution'] == {0: 1, 1: 2}
+    
+    print("✅ Link interni verificati offline (file mancanti e #fragment inesistenti)")
+except Exception as e:
+    print(f"❌ Errore verifica offline link: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 27: Fogli di Stile Collegati (Media Query, Font, Touch Target)")
+try:
+    import io
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    from utils.css import StyleSheet
+    
+    sheet = StyleSheet('/* @media finta { */ a::after { content: "}" } '
+                       '@media (max-width: 600px) { @supports (display: grid) { main { display: grid } } }')
+    assert sheet.media_queries == ['(max-width: 600px)']
+    assert [rule.selectors for rule in sheet.rules] == [['a::after'], ['main']]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir)
+        (site_dir / 'css').mkdir()
+        (site_dir / 'css' / 'styles.css').write_text(
+            'html { font-size: 100% } body { font-size: 0.875rem }\n'
+            '.btn, .btn:hover { height: 30px; padding: 0 8px }\n'
+            '@media (max-width: 600px) { nav { display: flex } }', encoding='utf-8')
+        (site_dir / 'css' / 'piatto.css').write_text('body { font-size: 18px }', encoding='utf-8')
+        for n in range(5):
+            (site_dir / f'pagina{n}.html').write_text(
+                '<html><head><link rel="stylesheet" href="/css/styles.css"></head>'
+                '<body><a class="btn" href="/">Home</a><a class="btn" href="/">Blog</a></body></html>',
+                encoding='utf-8')
+        (site_dir / 'fissa.html').write_text(
+            '<html><head><link rel="stylesheet" href="css/piatto.css"></head><body><p>Testo</p></body></html>',
+            encoding='utf-8')
+        
+        analyzer = SEOAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = analyzer.analyze_directory(str(site_dir))
+        
+        shared = next(r for r in results if r['url'].endswith('pagina0.html'))['mobile']
+        assert shared['responsive']['has_media_queries'] and shared['responsive']['has_flexible_layout']
+        assert shared['usability']['font_size']['body_px'] == 14
+        assert shared['usability']['touch_targets']['small_count'] == 2
+        
+        fixed = next(r for r in results if r['url'].endswith('fissa.html'))['mobile']
+        assert not fixed['responsive']['has_media_queries']
+        assert not fixed['responsive']['media_queries_assumed']
+        assert fixed['usability']['font_size']['is_readable']
+        
+        # styles.css condiviso da 5 pagine: letto e parsato una volta sola
+        assert analyzer.mobile_analyzer.stylesheets.parsed == 2
+        assert analyzer.mobile_analyzer.stylesheets.hits == 4
+    
+    # @import risolti rispetto al foglio, con il media dell'import, cicli e catene troppo lunghe
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        css_dir = Path(tmp_dir) / 'css'
+        (css_dir / 'parti').mkdir(parents=True)
+        (css_dir / 'main.css').write_text('@import "parti/responsive.css";\n@import url("stampa.css") print;\n'
+                                          'body { font-size: 16px }', encoding='utf-8')
+        (css_dir / 'parti' / 'responsive.css').write_text(
+            '@import "../main.css";\n@media (max-width: 600px) { nav { display: flex } }', encoding='utf-8')
+        (css_dir / 'stampa.css').write_text('body { font-size: 8px }', encoding='utf-8')
+        for n in range(8):
+            (css_dir / f'catena{n}.css').write_text(f'@import "catena{n + 1}.css";', encoding='utf-8')
+        (css_dir / 'catena8.css').write_text('@media (max-width: 600px) { nav { display: flex } }', encoding='utf-8')
+        
+        mobile = SEOAnalyzer().mobile_analyzer
+        page_url = f"file://{Path(tmp_dir) / 'pagina.html'}"
+        imported = mobile.analyze('<html><head><link rel="stylesheet" href="css/main.css"></head>'
+                                  '<body><p>Testo</p></body></html>', page_url)
+        assert imported['responsive']['has_media_queries'] and not imported['responsive']['media_queries_assumed']
+        assert imported['responsive']['stylesheets']['loaded'] == 3
+        assert imported['usability']['font_size']['is_readable']  # stampa.css vale solo per print
+        assert str(css_dir / 'parti' / 'responsive.css') in imported['dependencies']
+        
+        chained = mobile.analyze('<html><head><style>@import "css/catena0.css";</style></head>'
+                                 '<body><p>Testo</p></body></html>', page_url)
+        assert chained['responsive']['media_queries_assumed']
+        assert chained['responsive']['stylesheets']['loaded'] == 6
+    
+    print("✅ CSS collegati analizzati (media query, font body, touch target, @import; 1 parse per foglio)")
+except Exception as e:
+    print(f"❌ Errore fogli di stile: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 28: Dimensioni Compresse Reali (gzip/brotli)")
+try:
+    import gzip
+    import os
+    import io
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir)
+        for folder in ('css', 'js', 'fonts'):
+            (site_dir / folder).mkdir()
+        css = '@font-face { font-family: Titoli; src: url("../fonts/titoli.woff2") format("woff2") }\n'
+        # Sorgenti di fallback: il browser ne scarica una sola (woff2, altrimenti la prima supportata)
+        css += ('@font-face { font-family: Testo; src: url("../fonts/testo.eot");\n'
+                '  src: url("../fonts/testo.eot?#iefix") format("embedded-opentype"),\n'
+                '       url("../fonts/testo.woff") format("woff"), url("../fonts/testo.woff2") format("woff2") }\n'
+                '@font-face { font-family: Note; src: url("../fonts/note.woff"), url("../fonts/note.ttf") }\n')
+        css += ''.join(f'.blocco-{n} {{ margin: {n}px; color: #333 }}\n' for n in range(2000))
+        (site_dir / 'css' / 'styles.css').write_text(css, encoding='utf-8')
+        (site_dir / 'js' / 'app.js').write_text('console.log("ok");\n' * 500, encoding='utf-8')
+        (site_dir / 'fonts' / 'titoli.woff2').write_bytes(os.urandom(4096))
+        for name, size in (('testo.eot', 9000), ('testo.woff', 3000), ('testo.woff2', 2000),
+                           ('note.woff', 1500), ('note.ttf', 7000)):
+            (site_dir / 'fonts' / name).write_bytes(os.urandom(size))
+        for n in range(3):
+            (site_dir / f'pagina{n}.html').write_text(
+                html_test.replace('</head>', f'<link rel="stylesheet" href="/css/styles.css">'
+                                             f'<script src="js/app.js" defer></script><!-- {n} --></head>'),
+                encoding='utf-8')
+        
+        analyzer = SEOAnalyzer()
+        cache_file = str(Path(tmp_dir) / 'results.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = analyzer.analyze_directory(str(site_dir), cache_file=cache_file)
+        
+        transfer = results[0]['performance']['transfer']
+        by_type = {asset['type']: asset for asset in transfer['assets']}
+        fonts = {Path(asset['location']).name: asset['transfer'] for asset in transfer['assets'] if asset['type'] == 'font'}
+        assert sorted(by_type) == ['css', 'font', 'js'] and transfer['unresolved'] == 0
+        assert by_type['css']['raw'] == len(css.encode('utf-8'))
+        assert by_type['css']['gzip'] == len(gzip.compress(css.encode('utf-8'), compresslevel=6, mtime=0))
+        assert fonts == {'titoli.woff2': 4096, 'testo.woff2': 2000, 'note.woff': 1500}  # woff2 non viene ricompresso
+        assert transfer['transfer_bytes'] == transfer['html']['transfer'] + sum(a['transfer'] for a in transfer['assets'])
+        assert transfer['transfer_bytes'] < transfer['total_raw']
+        
+        # 3 HTML distinti + CSS, JS e 3 font condivisi: ogni contenuto compresso una volta
+        assert analyzer.performance_analyzer.sizer.compressed == 8
+        
+        # Font modificato: con --incremental le pagine che lo scaricano vengono rimisurate
+        (site_dir / 'fonts' / 'note.woff').write_bytes(os.urandom(2500))
+        with contextlib.redirect_stdout(io.StringIO()):
+            updated = analyzer.analyze_directory(str(site_dir), cache_file=cache_file)
+        updated_transfer = updated[0]['performance']['transfer']
+        assert updated_transfer['transfer_bytes'] == transfer['transfer_bytes'] + 1000
+    
+    print(f"✅ Peso trasferito misurato ({transfer['transfer_bytes'] / 1024:.1f}KB su "
+          f"{transfer['total_raw'] / 1024:.1f}KB, un font per @font-face, 8 compressioni per 3 pagine)")
+except Exception as e:
+    print(f"❌ Errore dimensioni compresse: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 29: Sonda Immagini (Range + Header)")
+try:
+    import re
+    import shutil
+    import tempfile
+    import struct
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from utils.http_cache import HTTPCache
+    from utils.image_probe import parse_image_header
+    
+    def png_image(width, height, padding=0):
+        header = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+        return header + b'\0' * (4 + padding)
+    
+    def jpeg_image(width, height, exif_size=0):
+        exif = b'\xff\xe1' + struct.pack('>H', exif_size + 2) + b'\0' * exif_size if exif_size else b''
+        sof = b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+        return b'\xff\xd8' + exif + sof + b'\0' * 1000 + b'\xff\xd9'
+    
+    gif = b'GIF89a' + struct.pack('<HH', 120, 80) + b'\0' * 20
+    webp = b'RIFF' + struct.pack('<I', 30) + b'WEBPVP8X' + struct.pack('<I', 10) + b'\0' * 4 + (1599).to_bytes(3, 'little') + (899).to_bytes(3, 'little')
+    avif = (struct.pack('>I', 20) + b'ftypavif' + b'\0' * 8 + b'\0' * 40 +
+            struct.pack('>I', 20) + b'ispe' + b'\0' * 4 + struct.pack('>II', 2048, 1024))
+    assert parse_image_header(gif) == {'format': 'gif', 'width': 120, 'height': 80}
+    assert parse_image_header(webp) == {'format': 'webp', 'width': 1600, 'height': 900}
+    assert parse_image_header(avif) == {'format': 'avif', 'width': 2048, 'height': 1024}
+    assert parse_image_header(b'<svg xmlns="http://www.w3.org/2000/svg"></svg>')['format'] == 'svg'
+    
+    images = {
+        '/foto-grande-hero.png': png_image(2400, 1600, padding=400 * 1024),
+        '/foto-exif-camera.jpg': jpeg_image(1200, 800, exif_size=40 * 1024),
+        '/icona-piccola.gif': gif,
+    }
+    served, revalidated, throttled = [], [], set()
+    
+    class RangeHandler(BaseHTTPRequestHandler):
+        """Server di prova con supporto a Range: bytes=0-N, ETag e un 429 per le immagini in throttled"""
+        
+        def do_GET(self):
+            body = images.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            if self.path in throttled:
+                throttled.discard(self.path)
+                self.send_response(429)
+                self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            etag = f'"{len(body)}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                revalidated.append(self.path)
+                return
+            match = re.match(r'bytes=0-(\d+)', self.headers.get('Range', ''))
+            if match:
+                chunk = body[:int(match.group(1)) + 1]
+                self.send_response(206)
+                self.send_header('Content-Range', f'bytes 0-{len(chunk) - 1}/{len(body)}')
+            else:
+                chunk = body
+                self.send_response(200)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(chunk)))
+            self.end_headers()
+            self.wfile.write(chunk)
+            served.append(len(chunk))
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    
+    html_images = '''<html><body>
+        <img src="/foto-grande-hero.png" alt="Foto panoramica della scuola" width="600" height="400" loading="lazy">
+        <img src="/foto-exif-camera.jpg" alt="Foto della classe in laboratorio" loading="lazy">
+        <img src="/icona-piccola.gif" alt="Icona della sezione" width="120" height="80" loading="lazy">
+    </body></html>'''
+    cache_dir = tempfile.mkdtemp()
+    image_analyzer = ImageAnalyzer(config)
+    image_analyzer.http.cache = HTTPCache(cache_dir)
+    first = image_analyzer.analyze(html_images, f'{base}/pagina1.html', check_image_size=True)
+    image_analyzer.analyze(html_images, f'{base}/pagina2.html', check_image_size=True)
+    first_served = list(served)
+    
+    # Esecuzione successiva: le sonde passano dalla cache HTTP (304, nessun byte riscaricato)
+    cached_analyzer = ImageAnalyzer(config)
+    cached_analyzer.http.cache = HTTPCache(cache_dir)
+    cached = cached_analyzer.analyze(html_images, f'{base}/pagina1.html', check_image_size=True)
+    
+    # 429 su una sonda: gestito dal limite per host condiviso, non ignorato dal pool di thread
+    images['/foto-limitata.png'] = png_image(1600, 900)
+    throttled.add('/foto-limitata.png')
+    limited = cached_analyzer.analyze('<img src="/foto-limitata.png" alt="Foto con limite di richieste">',
+                                      f'{base}/pagina3.html', check_image_size=True)
+    server.shutdown()
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    
+    hero, photo, icon = first['images']
+    assert (hero['intrinsic_width'], hero['intrinsic_height'], hero['intrinsic_format']) == (2400, 1600, 'png')
+    assert hero['size_kb'] > 400 and hero['is_oversized']
+    assert (photo['intrinsic_width'], photo['intrinsic_height']) == (1200, 800)
+    assert icon['intrinsic_format'] == 'gif' and not icon.get('is_oversized')
+    assert any('sovradimensionata' in issue['message'] for issue in first['issues'])
+    assert any('width="1200" height="800"' in issue['recommendation'] for issue in first['issues'])
+    
+    # Solo i primi KB di ogni immagine (JPEG con EXIF: una seconda richiesta più ampia), nessuna ripetuta sulla seconda pagina
+    assert image_analyzer.probe.requests == 4 and len(first_served) == 4
+    assert sum(first_served) < 100 * 1024
+    
+    assert len(revalidated) == 4 and cached['images'] == first['images']
+    assert len(served) == 5  # Dopo i 304 solo la sonda della nuova immagine
+    assert limited['images'][0]['intrinsic_width'] == 1600 and not throttled
+    assert cached_analyzer.rate_limiter.rate_for(base) < 5
+    
+    print(f"✅ Sonda immagini funziona ({sum(first_served) / 1024:.0f}KB letti su "
+          f"{sum(map(len, images.values())) / 1024:.0f}KB, 4 richieste per 2 pagine, 304 dalla cache, 429 gestito)")
+except Exception as e:
+    print(f"❌ Errore sonda immagini: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 30: Immagini Locali in --local-dir")
+try:
+    import io
+    import struct
+    import contextlib
+    import tempfile
+    from seo_analyzer import SEOAnalyzer
+    from analyzers.image_analyzer import ImageAnalyzer
+    
+    def png_bytes(width, height, padding=0):
+        return (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' +
+                struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0) + b'\0' * (4 + padding))
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        site_dir = Path(tmp_dir)
+        (site_dir / 'img').mkdir()
+        (site_dir / 'img' / 'logo-scuola.png').write_bytes(png_bytes(180, 60))
+        (site_dir / 'img' / 'copertina-evento.png').write_bytes(png_bytes(3000, 2000, padding=300 * 1024))
+        (site_dir / 'img' / 'copertina-evento-800.png').write_bytes(png_bytes(800, 533))
+        # Percorsi con virgole (trasformazioni in stile Cloudinary)
+        for transform, width in (('w_400,c_fill', 400), ('w_800,c_fill', 800)):
+            (site_dir / 'img' / transform).mkdir()
+            (site_dir / 'img' / transform / 'ritratto-docente.png').write_bytes(png_bytes(width, width))
+        
+        images_html = (
+            '<img src="/img/logo-scuola.png" alt="Logo della scuola" width="180" height="60" loading="lazy">'
+            '<img src="img/copertina-evento.png" alt="Copertina evento di fine anno" width="800" height="533" loading="lazy">'
+            '<img src="img/galleria-foto.png" srcset="img/copertina-evento-800.png 800w, img/copertina-evento.png 3000w" '
+            'alt="Galleria fotografica" loading="lazy">'
+            '<img src="/img/w_400,c_fill/ritratto-docente.png" srcset="/img/w_400,c_fill/ritratto-docente.png 400w,'
+            '/img/w_800,c_fill/ritratto-docente.png 800w" sizes="400px" alt="Ritratto del docente" loading="lazy">'
+        )
+        for n in range(5):
+            (site_dir / f'pagina{n}.html').write_text(
+                html_test.replace('</body>', images_html + f'<!-- {n} --></body>'), encoding='utf-8')
+        
+        analyzer = SEOAnalyzer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = analyzer.analyze_directory(str(site_dir))
+        
+        page_images = results[0]['images']
+        logo, cover, gallery, portrait = page_images['images'][-4:]
+        assert (logo['intrinsic_width'], logo['intrinsic_height']) == (180, 60) and not logo.get('is_oversized')
+        assert cover['is_oversized'] and cover['size_kb'] > 200
+        assert gallery['missing_files'] == ['img/galleria-foto.png']
+        assert [candidate['width'] for candidate in gallery['srcset']] == [800, 3000]
+        assert 'missing_files' not in portrait
+        assert [candidate['width'] for candidate in portrait['srcset']] == [400, 800]
+        assert page_images['summary']['missing_files'] == 1
+        assert ImageAnalyzer._parse_srcset('https://res.cloudinary.com/demo/w_400,c_fill/a.jpg 400w, b.jpg') == \
+            [('https://res.cloudinary.com/demo/w_400,c_fill/a.jpg', '400w'), ('b.jpg', '1x')]
+        assert any('srcset' in issue['message'] for issue in page_images['issues'])
+        
+        # Ogni immagine letta una volta per tutta la directory, senza richieste di rete
+        probe = analyzer.image_analyzer.probe
+        assert probe.probed == 5 and probe.requests == 0
+    
+    print(f"✅ Immagini locali verificate offline ({probe.probed} file letti per {len(results)} pagine)")
+except Exception as e:
+    print(f"❌ Errore immagini locali: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 31: Scheduler Analyzer Concorrente")
+try:
+    import io
+    import time
+    import struct
+    import threading
+    import contextlib
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from seo_analyzer import SEOAnalyzer
+    from utils.scheduler import AnalysisTask, TaskScheduler
+    
+    # Dipendenze rispettate e risultati per nome
+    order = []
+    scheduler = TaskScheduler(workers=2)
+    outcome = scheduler.run([
+        AnalysisTask('somma', lambda a, b: order.append('somma') or a + b, requires=('rete', 'cpu')),
+        AnalysisTask('rete', lambda: time.sleep(0.05) or order.append('rete') or 2, network=True),
+        AnalysisTask('cpu', lambda: order.append('cpu') or 3),
+    ])
+    assert outcome == {'rete': 2, 'cpu': 3, 'somma': 5} and order == ['cpu', 'rete', 'somma']
+    try:
+        scheduler.run([AnalysisTask('a', lambda b: b, requires=('b',)), AnalysisTask('b', lambda a: a, requires=('a',))])
+        raise AssertionError("ciclo non rilevato")
+    except ValueError:
+        pass
+    
+    delay = 0.3
+    png = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>IIBBBBB', 800, 600, 8, 2, 0, 0, 0) + b'\0' * 4
+    
+    class SlowHandler(BaseHTTPRequestHandler):
+        """Server lento: ogni risposta arriva dopo delay secondi"""
+        
+        def _respond(self, send_body):
+            time.sleep(delay)
+            if self.path.startswith('/pagina'):
+                body, content_type = html_test.encode('utf-8').replace(
+                    b'</body>', b'<img src="/foto-lenta-scuola.png" alt="Foto della scuola" width="800" height="600">'
+                                b'<a href="/pagina-collegata">Pagina collegata</a></body>'), 'text/html'
+            elif self.path.endswith('.png'):
+                body, content_type = png, 'image/png'
+            else:
+                body, content_type = b'', 'text/plain'
+            self.send_response(200 if body else 404)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+        
+        def do_GET(self):
+            self._respond(True)
+        
+        def do_HEAD(self):
+            self._respond(False)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    page_url = f'http://127.0.0.1:{server.server_address[1]}/pagina.html'
+    
+    timings, runs = {}, {}
+    for workers in (0, 4):
+        analyzer = SEOAnalyzer()
+        analyzer.scheduler = TaskScheduler(workers=workers)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            runs[workers] = analyzer.analyze_url(page_url, deep=True)
+        timings[workers] = time.perf_counter() - start
+        analyzer.scheduler.close()
+    server.shutdown()
+    
+    # Stessi risultati nello stesso ordine, ma le attese di rete si sovrappongono
+    assert [issue['message'] for issue in runs[0]['all_issues']] == [issue['message'] for issue in runs[4]['all_issues']]
+    assert runs[0]['category_scores'] == runs[4]['category_scores']
+    assert runs[4]['images']['images'][-1]['intrinsic_width'] == 800
+    assert timings[4] < timings[0] * 0.75
+    
+    print(f"✅ Scheduler concorrente funziona (analisi deep {timings[0]:.2f}s in sequenza, "
+          f"{timings[4]:.2f}s in parallelo)")
+except Exception as e:
+    print(f"❌ Errore scheduler: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 32: Analyzer Senza Stato per Pagina")
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    from analyzers.content_analyzer import ContentAnalyzer
+    from analyzers.link_analyzer import LinkAnalyzer
+    
+    content_analyzer = ContentAnalyzer(config)
+    link_analyzer = LinkAnalyzer(config)
+    
+    bare_page = '<html><body><p>Pagina senza title</p></body></html>'
+    first = content_analyzer.analyze(html_test, 'https://example.com/uno')
+    bare = content_analyzer.analyze(bare_page, 'https://example.com/due')
+    again = content_analyzer.analyze(html_test, 'https://example.com/tre')
+    
+    # Ogni chiamata restituisce solo i propri problemi, senza residui delle pagine precedenti
+    assert [i['message'] for i in first['issues']] == [i['message'] for i in again['issues']]
+    assert first['issues'] is not again['issues']
+    assert any(i['message'] == 'Tag <title> mancante' for i in bare['issues'])
+    assert not any(i['message'] == 'Tag <title> mancante' for i in again['issues'])
+    assert not hasattr(content_analyzer, 'issues')
+    
+    # Stesse istanze condivise da più thread: risultati identici all'esecuzione in sequenza
+    pages = [(html_test if n % 2 else bare_page, f'https://example.com/p{n}') for n in range(40)]
+    expected = [(len(content_analyzer.analyze(h, u)['issues']), len(link_analyzer.analyze(h, u)['issues']))
+                for h, u in pages]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        shared = list(pool.map(lambda page: (len(content_analyzer.analyze(*page)['issues']),
+                                             len(link_analyzer.analyze(*page)['issues'])), pages))
+    assert shared == expected
+    
+    print("✅ Analyzer senza stato: problemi per pagina corretti anche con istanze condivise tra thread")
+except Exception as e:
+    print(f"❌ Errore analyzer senza stato: {e}")
+    sys.exit(1)
+
+print("\n📦 Test 33: Regole Compilate e Validate")
+try:
+    import copy
+    import tempfile
+    import yaml as yaml_module
+    from utils.rules import RateLimitRules, RulesError, SEORules, rules_cache_file
+    
+    rules = SEORules(config)
+    assert rules.links.generic_anchors == frozenset({'clicca qui', 'leggi di più', 'qui'})
+    assert rules.images.filename_pattern.match('foto-scuola.webp')
+    assert rules.content.keywords.min_density == config['content']['keywords']['primary_keyword']['min_density']
+    assert SEORules.ensure(rules) is rules
+    
+    # Immutabili e senza __dict__
+    for assignment in (lambda: setattr(rules.content.title, 'min_length', 1), lambda: setattr(rules, 'extra', 1)):
+        try:
+            assignment()
+            raise AssertionError('regole modificabili')
+        except AttributeError:
+            pass
+    
+    # Chiavi mancanti: valori di default; valori errati: errore con il percorso della chiave
+    assert SEORules({}).content.title.max_length == 60
+    invalid = [
+        (('content', 'title', 'max_length'), 10, 'content.title.max_length'),
+        (('urls', 'structure', 'pattern'), '([a-z', 'urls.structure.pattern'),
+        (('links', 'internal', 'min_per_page'), 'tre', 'links.internal.min_per_page'),
+        (('scoring', 'thresholds', 'good'), 95, 'scoring.thresholds.excellent'),
+    ]
+    for (section, group, key), value, path in invalid:
+        broken = copy.deepcopy(config)
+        broken[section][group][key] = value
+        try:
+            SEORules(broken)
+            raise AssertionError(f'{path} non validato')
+        except RulesError as e:
+            assert str(e).startswith(path), e
+    
+    # Chiavi scritte male: errore con suggerimento invece del default silenzioso
+    misspelled = copy.deepcopy(config)
+    misspelled['content']['title']['max_lenght'] = 70
+    try:
+        SEORules(misspelled)
+        raise AssertionError('chiave sconosciuta accettata')
+    except RulesError as e:
+        assert str(e) == 'content.title.max_lenght: chiave non riconosciuta (forse content.title.max_length?)', e
+
+    # Anche advanced.* è tipizzato: default, valori errati e chiavi sconosciute
+    assert SEORules({}).advanced.rate_limit.requests_per_second > 0
+    assert SEORules({}).advanced.scheduler.workers == 4
+    assert SEORules({'advanced': {'scheduler': {'enabled': False}}}).advanced.scheduler.workers == 0
+    assert RateLimitRules.ensure({'requests_per_second': 2}).requests_per_second == 2.0
+    for (group, key), value, path in [
+        (('rate_limit', 'requests_per_second'), 'veloce', 'advanced.rate_limit.requests_per_second'),
+        (('http', 'pool_size'), 10, 'advanced.http.pool_size'),
+    ]:
+        broken = copy.deepcopy(config)
+        broken.setdefault('advanced', {}).setdefault(group, {})[key] = value
+        try:
+            SEORules(broken)
+            raise AssertionError(f'{path} non validato')
+        except RulesError as e:
+            assert str(e).startswith(path), e
+
+    # Parsing YAML in cache per hash del file, invalidato quando il file cambia
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rules_file = Path(tmp_dir) / 'seo_rules.yaml'
+        rules_file.write_text(Path('config/seo_rules.yaml').read_text(encoding='utf-8'), encoding='utf-8')
+        cache_path = Path(tmp_dir) / 'cache' / 'rules.json'
+        
+        SEORules.load(rules_file, cache_file=cache_path)
+        safe_load, yaml_calls = yaml_module.safe_load, []
+        yaml_module.safe_load = lambda *args, **kwargs: yaml_calls.append(1) or safe_load(*args, **kwargs)
+        try:
+            cached = SEORules.load(rules_file, cache_file=cache_path)
+            assert not yaml_calls and cached.config == config
+            
+            rules_file.write_text(rules_file.read_text(encoding='utf-8').replace('max_length: 60', 'max_length: 65', 1),
+                                  encoding='utf-8')
+            assert SEORules.load(rules_file, cache_file=cache_path).content.title.max_length == 65
+            assert len(yaml_calls) == 1
+        finally:
+            yaml_module.safe_load = safe_load
+        
+        # Cache di default accanto a ogni configurazione, una per percorso (anche in --cache-dir)
+        copies = []
+        for folder in ('sito-a', 'sito-b', 'senza-cache'):
+            (Path(tmp_dir) / folder).mkdir()
+            copies.append(Path(tmp_dir) / folder / 'seo_rules.yaml')
+            copies[-1].write_text(rules_file.read_text(encoding='utf-8'), encoding='utf-8')
+        SEORules.load(copies[0])
+        SEORules.load(copies[1])
+        SEORules.load(copies[2], cache_file=None)
+        assert rules_cache_file(copies[0]).parent == copies[0].parent / '.seo_cache'
+        assert [path.name for path in (copies[0].parent / '.seo_cache').iterdir()] == [rules_cache_file(copies[0]).name]
+        assert rules_cache_file(copies[0]).is_file() and rules_cache_file(copies[1]).is_file()
+        assert not (copies[2].parent / '.seo_cache').exists()
+        
+        shared_dir = Path(tmp_dir) / 'cache-condivisa'
+        SEORules.load(copies[0], cache_dir=shared_dir)
+        SEORules.load(copies[1], cache_dir=shared_dir)
+        assert len(list(shared_dir.iterdir())) == 2
+    
+    print("✅ Regole compilate (default, errori con percorso della chiave, chiavi sconosciute, cache per hash e percorso del file)")
+except Exception as e:
+    print(f"❌ Errore regole compilate: {e}")
+    sys.exit(1)
+
+# Test pagine del sitemap scaricate in parallelo dietro al limite per host
+print("\n📦 Test 34: Sitemap Concorrente per Host")
+try:
+    import contextlib
+    import io
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from seo_analyzer import SEOAnalyzer
+    from utils.rate_limiter import HostRateLimiter
+    
+    page_lock = threading.Lock()
+    page_requests, active = [], [0, 0]  # (host, inizio); [richieste in corso, massimo]
+    
+    class PagesHandler(BaseHTTPRequestHandler):
+        """Sitemap con pagine su due host (127.0.0.1 e localhost) e una pagina mancante"""
+        
+        def do_GET(self):
+            port = self.server.server_address[1]
+            if self.path == '/sitemap.xml':
+                entries = ''.join(f'<url><loc>http://{host}:{port}/{name}.html</loc></url>'
+                                  for host in ('127.0.0.1', 'localhost') for name in ('uno', 'due'))
+                entries += f'<url><loc>http://127.0.0.1:{port}/mancante.html</loc></url>'
+                self._respond(200, ('<?xml version="1.0" encoding="UTF-8"?>'
+                                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                    f'{entries}</urlset>'), 'application/xml')
+                return
+            if not self.path.endswith(('uno.html', 'due.html')):
+                self._respond(404, 'Not Found', 'text/plain')
+                return
+            
+            with page_lock:
+                page_requests.append((self.headers.get('Host', '').split(':')[0], time.monotonic()))
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.3)
+            with page_lock:
+                active[0] -= 1
+            self._respond(200, f'<html><head><title>Pagina {self.path}</title></head>'
+                               '<body><h1>Pagina</h1><p>Testo</p></body></html>', 'text/html')
+        
+        def _respond(self, status, body, content_type):
+            body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PagesHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    analyzer = SEOAnalyzer()
+    analyzer.rate_limiter = HostRateLimiter({'requests_per_second': 2, 'burst': 1}, http_client=analyzer.http)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            sitemap_results = analyzer.analyze_sitemap(f'http://127.0.0.1:{server.server_address[1]}/sitemap.xml')
+            missing_page = analyzer.analyze_url(f'http://127.0.0.1:{server.server_address[1]}/mancante.html')
+    finally:
+        analyzer.close()
+        server.shutdown()
+    
+    # Risultati nell'ordine del sitemap; la pagina mancante è registrata, non interrompe l'analisi
+    assert [result['url'].rsplit('/', 1)[1] for result in sitemap_results] == ['uno.html', 'due.html'] * 2
+    assert missing_page is None
+    assert [error['url'].rsplit('/', 1)[1] for error in analyzer.download_errors] == ['mancante.html'] * 2
+    
+    # Host diversi si sovrappongono, lo stesso host resta al ritmo del suo token bucket
+    assert active[1] >= 2, active
+    for host in ('127.0.0.1', 'localhost'):
+        starts = [start for name, start in page_requests if name == host]
+        assert len(starts) == 2 and starts[1] - starts[0] >= 0.4, (host, starts)
+    
+    print(f"✅ Sitemap concorrente (host sovrapposti, {active[1]} richieste in parallelo, errori registrati)")
+except Exception as e:
+    print(f"❌ Errore sitemap concorrente: {e}")
+    sys.exit(1)
+
 # Riepilogo
 print("\n" + "=" * 70)
 print("🎉 TUTTI I TEST SUPERATI!")
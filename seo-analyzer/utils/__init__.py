@@ -3,14 +3,33 @@ Utils - Moduli Utility per SEO Analyzer
 """
 
 from .crawler import Crawler
-from .parser import HTMLParser
+from .frontier import CrawlFrontier, normalize_url
+from .http_cache import HTTPCache
+from .http_client import HTTPClient
+from .link_graph import LinkGraph
+from .local_site import LocalSiteIndex
+from .parser import HTMLParser, ParsedDocument
 from .scorer import SEOScorer
+from .sitemap import SitemapReader
 from .reporter import SEOReporter
+from .result_cache import ResultCache
+from .rules import RulesError, SEORules
 
 __all__ = [
     'Crawler',
+    'CrawlFrontier',
+    'normalize_url',
+    'HTTPCache',
+    'HTTPClient',
+    'LinkGraph',
+    'LocalSiteIndex',
     'HTMLParser',
+    'ParsedDocument',
     'SEOScorer',
+    'SitemapReader',
     'SEOReporter',
+    'ResultCache',
+    'RulesError',
+    'SEORules',
 ]
 
@@ -0,0 +1,177 @@
+"""
+Compression - Dimensioni reali compresse (gzip/brotli) di pagine e risorse
+Ogni contenuto viene compresso una sola volta per esecuzione (cache per hash) su un pool di thread
+"""
+
+import gzip
+import hashlib
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+# Font referenziati dai CSS (@font-face src: url(...))
+FONT_URL_PATTERN = re.compile(rb'''url\(\s*["']?([^"')]+?\.(?:woff2?|ttf|otf|eot))(?:[?#][^"')]*)?["']?\s*\)''', re.I)
+CSS_COMMENT_PATTERN = re.compile(rb'/\*.*?\*/', re.S)
+FONT_FACE_PATTERN = re.compile(rb'@font-face\s*\{([^}]*)\}', re.I)
+FONT_SRC_PATTERN = re.compile(rb'(?<![\w-])src\s*:([^;]*)', re.I)
+
+# Formati che i browser attuali non scaricano (EOT è solo per Internet Explorer)
+UNSUPPORTED_FONT_EXTENSIONS = ('.eot',)
+
+# Formati già compressi: i server li inviano così come sono
+PRECOMPRESSED_TYPES = {'font'}
+
+
+def transfer_size(sizes: Dict, kind: str = 'html', codec: Optional[str] = None) -> int:
+    """
+    Byte trasferiti con il codec indicato (default: brotli se disponibile, altrimenti gzip)
+    
+    I font sono già compressi e vengono inviati così come sono.
+    """
+    if kind in PRECOMPRESSED_TYPES:
+        return sizes['raw']
+    if codec is None:
+        codec = 'brotli' if sizes.get('brotli') is not None else 'gzip'
+    return min(sizes['raw'], sizes[codec])
+
+
+def font_sources(css: bytes) -> List[str]:
+    """
+    Font scaricati dal browser per un CSS: uno per @font-face
+    
+    Di ogni src (l'ultima dichiarazione del blocco vince) il browser scarica
+    solo la prima sorgente supportata, non i formati di fallback: conta il
+    woff2 se presente, altrimenti la prima sorgente non EOT.
+    """
+    fonts = []
+    for block in FONT_FACE_PATTERN.findall(CSS_COMMENT_PATTERN.sub(b'', css)):
+        declarations = FONT_SRC_PATTERN.findall(block)
+        if not declarations:
+            continue
+        
+        sources = [match.decode('utf-8', errors='replace') for match in FONT_URL_PATTERN.findall(declarations[-1])]
+        supported = [source for source in sources if not source.lower().endswith(UNSUPPORTED_FONT_EXTENSIONS)]
+        preferred = [source for source in supported if source.lower().endswith('.woff2')]
+        fonts.extend((preferred or supported or sources)[:1])
+    return fonts
+
+
+class AssetSizer:
+    """
+    Misura le dimensioni originali e compresse di HTML, CSS, JS e font
+    
+    zlib e brotli rilasciano il GIL durante la compressione, quindi i
+    contenuti vengono compressi in parallelo su un pool di thread. I
+    risultati sono indicizzati per hash del contenuto (un foglio di stile
+    condiviso da 200 pagine viene compresso una volta) e le risorse per
+    percorso o URL (lette o scaricate una volta per esecuzione).
+    """
+    
+    def __init__(self, http_client=None, workers: int = 4, gzip_level: int = 6,
+                 brotli_quality: int = 5, max_size_bytes: int = 20 * 1024 * 1024):
+        self.http = http_client
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.max_size_bytes = max_size_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='compress')
+        self._lock = threading.Lock()
+        self._by_digest: Dict[bytes, Dict] = {}
+        self._by_source: Dict[str, Tuple[object, Future]] = {}
+        self.compressed = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict, http_client=None) -> 'AssetSizer':
+        """Crea il misuratore dalla sezione performance.compression della configurazione"""
+        compression = config.get('performance', {}).get('compression', {})
+        return cls(http_client=http_client if compression.get('fetch_remote', True) else None,
+                   workers=compression.get('workers', 4),
+                   gzip_level=compression.get('gzip_level', 6),
+                   brotli_quality=compression.get('brotli_quality', 5))
+    
+    def _compress(self, data: bytes) -> Dict:
+        """Dimensioni raw/gzip/brotli del contenuto (calcolate una volta per hash)"""
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        with self._lock:
+            sizes = self._by_digest.get(digest)
+        if sizes is not None:
+            return sizes
+        
+        sizes = {
+            'raw': len(data),
+            'gzip': len(gzip.compress(data, compresslevel=self.gzip_level, mtime=0)),
+            'brotli': len(brotli.compress(data, quality=self.brotli_quality)) if BROTLI_AVAILABLE else None
+        }
+        with self._lock:
+            if digest not in self._by_digest:
+                self._by_digest[digest] = sizes
+                self.compressed += 1
+        return sizes
+    
+    def measure(self, data: bytes) -> Future:
+        """Future con le dimensioni di un contenuto già in memoria (es. l'HTML della pagina)"""
+        return self._executor.submit(self._compress, data)
+    
+    def asset(self, kind: str, location: str) -> Future:
+        """
+        Future con le dimensioni di una risorsa ('file' o 'url')
+        
+        Il risultato è None se la risorsa non è leggibile; per i CSS
+        include anche 'fonts', i font scaricati per le @font-face del file.
+        """
+        stamp = None
+        if kind == 'file':
+            try:
+                stat = os.stat(location)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamp = 'missing'
+        
+        with self._lock:
+            cached = self._by_source.get(location)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            future = self._executor.submit(self._load_and_compress, kind, location)
+            self._by_source[location] = (stamp, future)
+        return future
+    
+    def _load_and_compress(self, kind: str, location: str) -> Optional[Dict]:
+        data = self._load(kind, location)
+        if data is None:
+            return None
+        
+        sizes = dict(self._compress(data))
+        if location.split('?')[0].lower().endswith('.css'):
+            sizes['fonts'] = font_sources(data)
+        return sizes
+    
+    def _load(self, kind: str, location: str) -> Optional[bytes]:
+        if kind == 'file':
+            try:
+                if os.path.getsize(location) > self.max_size_bytes:
+                    return None
+                with open(location, 'rb') as f:
+                    return f.read()
+            except OSError:
+                return None
+        
+        if kind != 'url' or self.http is None:
+            return None
+        try:
+            response = self.http.cached_get(location)
+            if response.status_code != 200 or len(response.content) > self.max_size_bytes:
+                return None
+            return response.content
+        except Exception:
+            return None
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
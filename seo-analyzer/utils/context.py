@@ -0,0 +1,35 @@
+"""
+Context - Stato di una singola analisi di pagina
+Gli analyzer conservano solo configurazione e cache condivise, il resto vive nel contesto
+"""
+
+from typing import Dict, List, Set
+
+from .parser import ElementIndex, ParsedDocument
+
+
+class AnalysisContext:
+    """
+    Pagina analizzata e problemi trovati da una chiamata ad analyze()
+
+    Ogni analyze() crea il proprio contesto e lo passa ai metodi interni:
+    la stessa istanza di analyzer può così analizzare migliaia di pagine
+    in sequenza o da più thread senza che i problemi di una pagina
+    finiscano nei risultati di un'altra.
+
+    dependencies raccoglie i file locali letti durante l'analisi (pagine
+    di cui si verificano le ancore, CSS, immagini, font): se uno cambia,
+    il risultato della pagina non è più valido.
+    """
+
+    __slots__ = ('document', 'url', 'issues', 'dependencies')
+
+    def __init__(self, document: ParsedDocument, url: str):
+        self.document = document
+        self.url = url
+        self.issues: List[Dict] = []
+        self.dependencies: Set[str] = set()
+
+    @property
+    def index(self) -> ElementIndex:
+        return self.document.index
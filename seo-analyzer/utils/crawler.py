@@ -2,80 +2,145 @@
 Crawler - Spider per crawling siti web statici
 """
 
-import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
-from typing import List, Set, Dict
-import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .frontier import CrawlFrontier
+from .http_client import HTTPClient
+from .parser import ParsedDocument
+from .rate_limiter import HostRateLimiter
+from .rules import CrawlingRules
 
 
 class Crawler:
     """Crawler per siti web statici"""
     
-    def __init__(self, config: Dict = None):
-        self.config = config or {}
-        self.visited_urls: Set[str] = set()
+    def __init__(self, config: Union[Dict, CrawlingRules, None] = None, http_client: Optional[HTTPClient] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        """
+        Args:
+            config: Blocco advanced.crawling (compilato o dizionario)
+            http_client: Client HTTP condiviso
+            rate_limiter: Limite per host condiviso (default: advanced.rate_limit di default)
+        """
+        self.rules = CrawlingRules.ensure(config)
+        self.http = http_client or HTTPClient({'read_timeout_seconds': self.rules.timeout_seconds},
+                                              user_agent=self.rules.user_agent)
+        # Pagine dell'ultimo crawl_site (lo stato del crawl è creato a ogni chiamata)
         self.pages: List[Dict] = []
         
-    def crawl_site(self, start_url: str, max_pages: int = 100) -> List[Dict]:
+        # Richieste in volo contemporaneamente (advanced.crawling.concurrent_requests)
+        self.concurrent_requests = self.rules.concurrent_requests
+        # Politeness per host: token bucket adattivo (429/503, Retry-After, Crawl-delay)
+        self.rate_limiter = rate_limiter or HostRateLimiter(http_client=self.http)
+    
+    def crawl_site(self, start_url: str, max_pages: int = 100,
+                   on_page: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
         """
         Crawl intero sito partendo da start_url
         
         Args:
             start_url: URL di partenza
             max_pages: Numero massimo di pagine da crawlare
-            
+            on_page: Callback per pagina (modalità streaming). Se indicata,
+                     le pagine vengono passate alla callback e non conservate
+                     in self.pages, così l'HTML viene rilasciato subito
+        
         Returns:
-            Lista di dizionari con url e html
+            Lista di dizionari con url, html e link interni
+            (vuota in modalità streaming; senza il documento parsato)
         """
-        base_domain = urlparse(start_url).netloc
-        to_visit = [start_url]
+        self.pages = []
+        for page in self.iter_pages(start_url, max_pages):
+            if on_page:
+                on_page(page)
+            else:
+                self.pages.append({key: value for key, value in page.items() if key != 'document'})
         
-        while to_visit and len(self.pages) < max_pages:
-            url = to_visit.pop(0)
-            
-            if url in self.visited_urls:
-                continue
-            
-            try:
-                print(f"🔍 Crawling: {url}")
-                html = self._fetch_page(url)
+        return self.pages
+    
+    def iter_pages(self, start_url: str, max_pages: int = 100) -> Iterator[Dict]:
+        """
+        Crawl concorrente: mantiene N richieste in volo e restituisce
+        le pagine man mano che arrivano
+        
+        Ogni chiamata usa una frontiera nuova: gli URL già visti sono solo
+        quelli della frontiera (set o filtro di Bloom, advanced.crawling.seen_filter).
+        
+        Args:
+            start_url: URL di partenza
+            max_pages: Numero massimo di pagine da crawlare
+        
+        Yields:
+            Dizionari con url, html, link interni e document (il
+            ParsedDocument da cui sono stati estratti i link, da passare
+            all'analisi senza riparsare l'HTML), in ordine di arrivo
+        """
+        base_domain = urlparse(start_url).netloc.lower()
+        frontier = CrawlFrontier(self.rules.seen_filter)
+        frontier.add(start_url)
+        in_flight = {}
+        fetched = 0
+        
+        executor = ThreadPoolExecutor(max_workers=self.concurrent_requests)
+        try:
+            while (frontier or in_flight) and fetched < max_pages:
+                # Riempi gli slot liberi senza superare max_pages
+                while (frontier and len(in_flight) < self.concurrent_requests
+                       and fetched + len(in_flight) < max_pages):
+                    # La frontiera accoda ogni URL una sola volta
+                    url = frontier.pop()
+                    print(f"🔍 Crawling: {url}")
+                    future = executor.submit(self._fetch_and_extract, url, base_domain)
+                    in_flight[future] = url
                 
-                if html:
-                    self.pages.append({
-                        'url': url,
-                        'html': html
-                    })
-                    self.visited_urls.add(url)
+                if not in_flight:
+                    break
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    url = in_flight.pop(future)
+                    
+                    try:
+                        document, internal_links = future.result()
+                    except Exception as e:
+                        print(f"❌ Errore crawling {url}: {e}")
+                        continue
+                    
+                    if document is None:
+                        continue
                     
-                    # Trova link interni
-                    internal_links = self._extract_internal_links(html, url, base_domain)
+                    fetched += 1
                     
-                    # Aggiungi nuovi link alla coda
+                    # Aggiungi nuovi link alla coda (deduplicati su URL normalizzato)
                     for link in internal_links:
-                        if link not in self.visited_urls and link not in to_visit:
-                            to_visit.append(link)
-                
-                # Rate limiting
-                time.sleep(0.5)
-            
-            except Exception as e:
-                print(f"❌ Errore crawling {url}: {e}")
-                continue
+                        frontier.add(link)
+                    
+                    yield {
+                        'url': url,
+                        'html': document.html,
+                        'document': document,
+                        'links': internal_links
+                    }
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _fetch_and_extract(self, url: str, base_domain: str) -> Tuple[Optional[ParsedDocument], List[str]]:
+        """Scarica la pagina (rispettando l'host), la parsa una volta ed estrae i link interni"""
+        html = self._fetch_page(url)
         
-        return self.pages
+        if not html:
+            return None, []
+        
+        document = ParsedDocument(html, url)
+        return document, self._extract_internal_links(document, url, base_domain)
     
     def _fetch_page(self, url: str) -> str:
         """Scarica HTML di una pagina"""
         try:
-            user_agent = self.config.get('user_agent', 'SEO-Analyzer-Bot/1.0')
-            timeout = self.config.get('timeout_seconds', 30)
-            
-            headers = {
-                'User-Agent': user_agent
-            }
-            
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = self.rate_limiter.fetch(url, self.http)
             response.raise_for_status()
             
             return response.text
@@ -83,12 +148,11 @@ class Crawler:
         except Exception:
             return None
     
-    def _extract_internal_links(self, html: str, current_url: str, base_domain: str) -> List[str]:
-        """Estrae link interni dalla pagina"""
-        soup = BeautifulSoup(html, 'lxml')
+    def _extract_internal_links(self, document: ParsedDocument, current_url: str, base_domain: str) -> List[str]:
+        """Estrae link interni dalla pagina (dall'indice del documento, riusato dall'analisi)"""
         links = []
         
-        for a_tag in soup.find_all('a', href=True):
+        for a_tag in document.index.find_all('a', href=True):
             href = a_tag['href']
             
             # Salta anchor e javascript
@@ -97,7 +161,7 @@ class Crawler:
             
             # Risolvi URL assoluto
             absolute_url = urljoin(current_url, href)
-            link_domain = urlparse(absolute_url).netloc
+            link_domain = urlparse(absolute_url).netloc.lower()
             
             # Solo link interni
             if link_domain == base_domain:
@@ -106,4 +170,3 @@ class Crawler:
                 links.append(clean_url)
         
         return list(set(links))
-
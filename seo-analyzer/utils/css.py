@@ -0,0 +1,287 @@
+"""
+CSS - Tokenizer e parser minimale dei fogli di stile
+Regole, dichiarazioni e media query (anche annidate) con cache per percorso/URL e hash
+"""
+
+import hashlib
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+# Commenti, stringhe e delimitatori di blocco: il resto è testo di prelude/dichiarazioni.
+# Le stringhe restano un unico token, così "{" o ";" al loro interno non rompono i blocchi.
+TOKEN_PATTERN = re.compile(r'''
+    (?P<comment>/\*.*?(?:\*/|\Z))
+  | (?P<string>"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+  | (?P<delim>[{};])
+  | (?P<text>[^{};"'/]+|/)
+''', re.S | re.X)
+
+# At-rule con blocco di regole: il contenuto si applica (eventualmente sotto condizione)
+CONDITIONAL_AT_RULES = {'media', 'supports', 'layer', 'container', 'document'}
+
+# Dimensioni in px delle parole chiave di font-size (base 16px)
+FONT_SIZE_KEYWORDS = {
+    'xx-small': 9, 'x-small': 10, 'small': 13, 'medium': 16,
+    'large': 18, 'x-large': 24, 'xx-large': 32, 'xxx-large': 48
+}
+
+LENGTH_PATTERN = re.compile(r'^(-?\d*\.?\d+)(px|pt|rem|em|%)?$')
+
+
+def tokenize(css: str) -> Iterator[Tuple[str, str]]:
+    """
+    Divide il CSS in token (tipo, valore), senza commenti
+    
+    Tipi: 'string', 'delim' ({, }, ;) e 'text'.
+    """
+    for match in TOKEN_PATTERN.finditer(css):
+        kind = match.lastgroup
+        if kind != 'comment':
+            yield kind, match.group()
+
+
+def split_top_level(text: str, separator: str) -> List[str]:
+    """Divide text su separator ignorando parentesi e stringhe (es. :is(a, b))"""
+    parts, depth, quote, start = [], 0, None, 0
+    for position, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth = max(0, depth - 1)
+        elif char == separator and depth == 0:
+            parts.append(text[start:position])
+            start = position + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def length_px(value: str, font_px: float = 16.0, root_px: float = 16.0) -> Optional[float]:
+    """
+    Converte una lunghezza CSS in px (None se non valutabile, es. calc() o vw)
+    
+    Args:
+        value: Valore CSS (es. '14px', '0.875rem', '1.2em', 'small')
+        font_px: Dimensione del font di riferimento per em e %
+        root_px: Dimensione del font della radice per rem
+    """
+    value = value.strip().lower()
+    if value in FONT_SIZE_KEYWORDS:
+        return float(FONT_SIZE_KEYWORDS[value]) * root_px / 16.0
+    
+    match = LENGTH_PATTERN.match(value)
+    if not match:
+        return None
+    
+    number, unit = float(match.group(1)), match.group(2)
+    if unit == 'px' or (unit is None and number == 0):
+        return number
+    if unit == 'pt':
+        return number * 4 / 3
+    if unit == 'rem':
+        return number * root_px
+    if unit == 'em':
+        return number * font_px
+    if unit == '%':
+        return number * font_px / 100
+    return None
+
+
+class CSSRule:
+    """Regola di stile: selettori, dichiarazioni e media query che la condizionano"""
+    
+    __slots__ = ('selectors', 'declarations', 'media')
+    
+    def __init__(self, selectors: List[str], declarations: Dict[str, str], media: Optional[str]):
+        self.selectors = selectors
+        self.declarations = declarations
+        self.media = media
+
+
+class StyleSheet:
+    """Foglio di stile parsato: regole in ordine di sorgente e media query trovate"""
+    
+    def __init__(self, css: str):
+        self.rules: List[CSSRule] = []
+        self.media_queries: List[str] = []
+        self.imports: List[Tuple[str, Optional[str]]] = []
+        self._parse(list(tokenize(css)))
+    
+    @property
+    def has_media_queries(self) -> bool:
+        """True se almeno una media query dipende da caratteristiche del dispositivo (es. max-width)"""
+        return any('(' in query for query in self.media_queries)
+    
+    def _parse(self, tokens: List[Tuple[str, str]]):
+        # Pila delle at-rule condizionali aperte: media query che si applica al blocco
+        stack: List[Optional[str]] = [None]
+        prelude: List[str] = []
+        position = 0
+        
+        while position < len(tokens):
+            kind, value = tokens[position]
+            position += 1
+            
+            if kind != 'delim':
+                prelude.append(value)
+                continue
+            
+            text = ''.join(prelude).strip()
+            prelude = []
+            media = stack[-1]
+            
+            if value == ';':
+                if text.lower().startswith('@import'):
+                    self._add_import(text[len('@import'):].strip())
+                continue
+            
+            if value == '}':
+                if len(stack) > 1:
+                    stack.pop()
+                continue
+            
+            # value == '{'
+            if text.startswith('@'):
+                name, condition = re.match(r'@([\w-]*)\s*(.*)', text, re.S).groups()
+                name = name.lower()
+                if name in CONDITIONAL_AT_RULES:
+                    if name == 'media' and condition:
+                        self.media_queries.append(condition)
+                        media = f'{media} and {condition}' if media else condition
+                    stack.append(media)
+                else:
+                    # @font-face, @keyframes, @page...: blocco ignorato
+                    position = self._read_block(tokens, position)[1]
+                continue
+            
+            # Regola di stile: il blocco contiene solo dichiarazioni
+            body, position = self._read_block(tokens, position)
+            if text:
+                self.rules.append(CSSRule(split_top_level(text, ','), self._declarations(body), media))
+    
+    def _add_import(self, text: str):
+        match = re.match(r'''(?:url\(\s*)?["']?([^"')\s]+)["']?\s*\)?\s*(.*)$''', text)
+        if not match:
+            return
+        media = match.group(2).strip() or None
+        self.imports.append((match.group(1), media))
+        if media:
+            self.media_queries.append(media)
+    
+    @staticmethod
+    def _read_block(tokens: List[Tuple[str, str]], position: int) -> Tuple[str, int]:
+        """Contenuto di un blocco di dichiarazioni fino alla } corrispondente"""
+        parts, depth = [], 1
+        while position < len(tokens):
+            kind, value = tokens[position]
+            position += 1
+            if kind == 'delim' and value == '{':
+                depth += 1
+            elif kind == 'delim' and value == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            parts.append(value)
+        return ''.join(parts), position
+    
+    @staticmethod
+    def _declarations(body: str) -> Dict[str, str]:
+        declarations = {}
+        for declaration in split_top_level(body, ';'):
+            name, colon, value = declaration.partition(':')
+            if not colon:
+                continue
+            value = re.sub(r'\s*!\s*important\s*$', '', value.strip(), flags=re.I)
+            declarations[name.strip().lower()] = value
+        return declarations
+
+
+class StylesheetCache:
+    """
+    Fogli di stile letti e parsati una sola volta per esecuzione
+    
+    I file locali sono indicizzati per percorso (validi finché mtime e
+    dimensione non cambiano), quelli remoti per URL; il parsing è
+    condiviso per hash del contenuto, quindi lo stesso CSS servito da
+    percorsi diversi viene analizzato una volta sola.
+    """
+    
+    def __init__(self, http_client=None, max_size_bytes: int = 2 * 1024 * 1024):
+        self.http = http_client
+        self.max_size_bytes = max_size_bytes
+        self._by_source: Dict[str, Tuple[object, Optional[str]]] = {}
+        self._by_digest: Dict[str, StyleSheet] = {}
+        self.parsed = 0
+        self.hits = 0
+    
+    def parse(self, css: str) -> StyleSheet:
+        """Foglio di stile parsato (riusato se lo stesso contenuto è già stato visto)"""
+        digest = hashlib.sha1(css.encode('utf-8', errors='replace')).hexdigest()
+        return self._parse_digest(digest, css)
+    
+    def _parse_digest(self, digest: str, css: str) -> StyleSheet:
+        sheet = self._by_digest.get(digest)
+        if sheet is None:
+            sheet = StyleSheet(css)
+            self._by_digest[digest] = sheet
+            self.parsed += 1
+        return sheet
+    
+    def _remember(self, source: str, stamp, css: Optional[str]) -> Optional[StyleSheet]:
+        if css is None:
+            self._by_source[source] = (stamp, None)
+            return None
+        digest = hashlib.sha1(css.encode('utf-8', errors='replace')).hexdigest()
+        self._by_source[source] = (stamp, digest)
+        return self._parse_digest(digest, css)
+    
+    def _cached(self, source: str, stamp):
+        entry = self._by_source.get(source)
+        if entry is None or entry[0] != stamp:
+            return False, None
+        self.hits += 1
+        return True, self._by_digest.get(entry[1]) if entry[1] else None
+    
+    def load_file(self, path: str) -> Optional[StyleSheet]:
+        """Foglio di stile locale (None se non leggibile o troppo grande)"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        found, sheet = self._cached(path, stamp)
+        if found:
+            return sheet
+        
+        css = None
+        if stat.st_size <= self.max_size_bytes:
+            try:
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    css = f.read()
+            except OSError:
+                css = None
+        return self._remember(path, stamp, css)
+    
+    def load_url(self, url: str) -> Optional[StyleSheet]:
+        """Foglio di stile remoto, scaricato una volta per esecuzione (None se non disponibile)"""
+        found, sheet = self._cached(url, None)
+        if found:
+            return sheet
+        if self.http is None:
+            return None
+        
+        css = None
+        try:
+            response = self.http.cached_get(url)
+            if response.status_code == 200 and len(response.content) <= self.max_size_bytes:
+                css = response.text
+        except Exception:
+            css = None
+        return self._remember(url, None, css)
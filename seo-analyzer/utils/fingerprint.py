@@ -0,0 +1,78 @@
+"""
+Fingerprint - Impronte compatte del testo per contenuti quasi duplicati
+MinHash su shingle di parole e stima della similarità di Jaccard
+"""
+
+import random
+import re
+import zlib
+from typing import List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Primo < 2^32: le firme restano interi a 32 bit
+MINHASH_PRIME = 4294967291
+
+
+class MinHasher:
+    """
+    Firma MinHash del testo di una pagina
+    
+    Il testo viene diviso in shingle di shingle_size parole; la firma
+    contiene, per ogni permutazione, il minimo hash degli shingle. La
+    frazione di valori uguali tra due firme stima la similarità di
+    Jaccard tra i due insiemi di shingle.
+    """
+    
+    def __init__(self, num_perm: int = 64, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        
+        # a < 2^31 e hash < 2^32: a * h + b non supera mai 2^64
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, 2 ** 31) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, MINHASH_PRIME) for _ in range(num_perm)]
+        
+        if NUMPY_AVAILABLE:
+            self._a_vec = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_vec = np.array(self._b, dtype=np.uint64)[:, None]
+    
+    def shingles(self, text: str) -> set:
+        """Hash a 32 bit degli shingle di parole del testo"""
+        words = re.findall(r'\w+', text.lower())
+        size = self.shingle_size
+        if len(words) < size:
+            return set()
+        
+        return {
+            zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+            for i in range(len(words) - size + 1)
+        }
+    
+    def signature(self, text: str) -> Optional[List[int]]:
+        """Firma MinHash (None se il testo è più corto di uno shingle)"""
+        hashes = self.shingles(text)
+        if not hashes:
+            return None
+        
+        if NUMPY_AVAILABLE:
+            values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+            permuted = (self._a_vec * values + self._b_vec) % MINHASH_PRIME
+            return permuted.min(axis=1).tolist()
+        
+        return [
+            min((a * h + b) % MINHASH_PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        ]
+
+
+def minhash_similarity(first: Sequence[int], second: Sequence[int]) -> float:
+    """Similarità di Jaccard stimata da due firme MinHash"""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
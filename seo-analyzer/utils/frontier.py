@@ -0,0 +1,145 @@
+"""
+Frontier - Coda di crawling con deduplicazione O(1)
+Normalizzazione URL, coda FIFO e filtro probabilistico opzionale per crawl molto grandi
+"""
+
+import hashlib
+import math
+from collections import deque
+from typing import Dict, Optional, Union
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .rules import SeenFilterRules
+
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizza un URL per la deduplicazione
+    
+    - schema e host in minuscolo
+    - porta di default rimossa (:80 per http, :443 per https)
+    - trailing slash rimosso (tranne per la root)
+    - parametri query ordinati
+    - fragment rimosso
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    
+    host = (parts.hostname or '').lower()
+    if ':' in host:
+        host = f'[{host}]'  # IPv6
+    if port is not None and port != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+    if parts.username:
+        userinfo = parts.username + (f':{parts.password}' if parts.password else '')
+        host = f'{userinfo}@{host}'
+    
+    path = parts.path or '/'
+    if len(path) > 1 and path.endswith('/'):
+        path = path.rstrip('/') or '/'
+    
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class BloomFilter:
+    """
+    Filtro di Bloom compatto per insiemi di URL molto grandi
+    
+    Nessun falso negativo; falsi positivi con probabilità configurabile
+    (un URL mai visto può essere scartato come già visto).
+    """
+    
+    def __init__(self, expected_items: int = 1_000_000, false_positive_rate: float = 0.001):
+        expected_items = max(1, int(expected_items))
+        false_positive_rate = min(max(false_positive_rate, 1e-9), 0.5)
+        
+        self.size_bits = max(8, int(-expected_items * math.log(false_positive_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / expected_items * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+        self._count = 0
+    
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size_bits
+    
+    def add(self, item: str):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+
+class CrawlFrontier:
+    """
+    Frontiera di crawling: coda FIFO (deque) + insieme degli URL già visti
+    
+    Ogni URL viene accodato al massimo una volta, confrontando la forma
+    normalizzata: pop e verifica duplicati sono O(1).
+    """
+    
+    def __init__(self, config: Union[Dict, SeenFilterRules, None] = None):
+        """
+        Args:
+            config: Blocco advanced.crawling.seen_filter (compilato o dizionario)
+        """
+        rules = SeenFilterRules.ensure(config)
+        self._queue = deque()
+        
+        if rules.probabilistic:
+            self._seen = BloomFilter(rules.expected_urls, rules.false_positive_rate)
+        else:
+            self._seen = set()
+    
+    def add(self, url: str) -> bool:
+        """Accoda l'URL se non è mai stato visto (True se accodato)"""
+        key = normalize_url(url)
+        if key in self._seen:
+            return False
+        
+        self._seen.add(key)
+        self._queue.append(url)
+        return True
+    
+    def mark_seen(self, url: str):
+        """Registra l'URL come visto senza accodarlo"""
+        self._seen.add(normalize_url(url))
+    
+    def seen(self, url: str) -> bool:
+        return normalize_url(url) in self._seen
+    
+    def pop(self) -> str:
+        """Prossimo URL da visitare (FIFO)"""
+        return self._queue.popleft()
+    
+    @property
+    def seen_count(self) -> int:
+        return len(self._seen)
+    
+    def __len__(self) -> int:
+        return len(self._queue)
+    
+    def __bool__(self) -> bool:
+        return bool(self._queue)
@@ -0,0 +1,268 @@
+"""
+HTTP Cache - Cache su disco delle risposte HTTP
+Rivalidazione con ETag / Last-Modified e limite di dimensione con eviction LRU
+"""
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .rules import SEORules
+
+
+class HTTPCache:
+    """
+    Cache persistente delle risposte GET, indicizzata per URL
+    
+    Ogni voce è composta da un file JSON (status, header, validatori) e da
+    un file con il corpo della risposta. Alle esecuzioni successive la voce
+    viene usata per richieste condizionali: su 304 il corpo viene letto da
+    disco invece di essere riscaricato. Le richieste Range (es. la sonda
+    delle immagini) sono voci separate, indicizzate da URL e intervallo.
+    """
+    
+    def __init__(self, directory: str = '.seo_cache', max_size_mb: float = 500):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+    
+    @classmethod
+    def from_config(cls, config: Union[Dict, SEORules, None],
+                    directory: Optional[str] = None) -> Optional['HTTPCache']:
+        """Crea la cache da advanced.http_cache (None se disabilitata)"""
+        cache_rules = SEORules.ensure(config or {}).advanced.http_cache
+        if not directory and not cache_rules.enabled:
+            return None
+        
+        return cls(directory or cache_rules.directory, cache_rules.max_size_mb)
+    
+    def _key(self, url: str, byte_range: Optional[str] = None) -> str:
+        if byte_range:
+            url = f'{url}\0{byte_range}'
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+    
+    def _paths(self, key: str):
+        folder = self.directory / key[:2]
+        return folder / f'{key}.json', folder / f'{key}.body'
+    
+    def _load_index(self):
+        """Ricostruisce l'ordine LRU dalle date di accesso su disco"""
+        entries = []
+        for meta_path in self.directory.glob('*/*.json'):
+            body_path = meta_path.with_suffix('.body')
+            try:
+                size = meta_path.stat().st_size + body_path.stat().st_size
+                entries.append((meta_path.stat().st_mtime, meta_path.stem, size))
+            except OSError:
+                continue
+        
+        for _, key, size in sorted(entries):
+            self._entries[key] = size
+            self._total_bytes += size
+    
+    def lookup(self, url: str, byte_range: Optional[str] = None) -> Optional[Dict]:
+        """Metadati della risposta in cache per l'URL e l'eventuale header Range (None se assente)"""
+        key = self._key(url, byte_range)
+        meta_path, _ = self._paths(key)
+        
+        with self._lock:
+            if key not in self._entries:
+                return None
+            try:
+                meta = json.loads(meta_path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._remove(key)
+                return None
+            
+            self._touch(key)
+        
+        meta['key'] = key
+        return meta
+    
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """Header per la richiesta condizionale della voce in cache"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+    
+    def store(self, url: str, response: requests.Response, byte_range: Optional[str] = None):
+        """
+        Salva una risposta con validatori (ETag o Last-Modified)
+        
+        Solo 200, o 206 per le richieste Range: se il server ignora Range
+        la risposta completa non viene letta (né salvata).
+        """
+        meta = self._meta(url, response, 206 if byte_range else 200)
+        if meta is None:
+            return
+        
+        body = response.content
+        key = self._key(url, byte_range)
+        _, body_path = self._paths(key)
+        with self._lock:
+            body_path.parent.mkdir(exist_ok=True)
+            body_path.write_bytes(body)
+            self._commit(key, meta, len(body))
+    
+    def storing_stream(self, url: str, response: requests.Response, raw: BinaryIO) -> Optional[BinaryIO]:
+        """
+        Stream del corpo che salva in cache ciò che legge (risposte lette in streaming)
+        
+        Il corpo viene scritto su un file temporaneo man mano che il
+        chiamante lo legge e la voce viene salvata solo se lo legge fino in
+        fondo: una lettura interrotta (es. max_urls di una sitemap) non
+        lascia voci troncate. None se la risposta non è da salvare.
+        """
+        meta = self._meta(url, response, 200)
+        if meta is None:
+            return None
+        return _StoringReader(self, self._key(url), meta, raw)
+    
+    def _meta(self, url: str, response: requests.Response, expected_status: int) -> Optional[Dict]:
+        """Metadati da salvare (None se la risposta non ha validatori o non ha lo status atteso)"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != expected_status or not (etag or last_modified):
+            return None
+        
+        return {
+            'url': url,
+            'status': response.status_code,
+            'headers': dict(response.headers),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time()
+        }
+    
+    def _commit(self, key: str, meta: Dict, body_size: int):
+        """Scrive i metadati di un corpo già su disco e aggiorna l'indice LRU (con il lock)"""
+        data = json.dumps(meta).encode('utf-8')
+        meta_path, _ = self._paths(key)
+        meta_path.write_bytes(data)
+        
+        self._total_bytes -= self._entries.pop(key, 0)
+        self._entries[key] = len(data) + body_size
+        self._total_bytes += self._entries[key]
+        self._evict()
+    
+    def revalidated(self, entry: Dict, response: requests.Response) -> requests.Response:
+        """Risposta (200 o 206) ricostruita dalla cache dopo un 304 Not Modified"""
+        _, body_path = self._paths(entry['key'])
+        
+        cached = requests.Response()
+        cached.status_code = entry['status']
+        cached.headers = CaseInsensitiveDict(entry['headers'])
+        for name in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            if name in response.headers:
+                cached.headers[name] = response.headers[name]
+        cached.url = entry['url']
+        cached.encoding = get_encoding_from_headers(cached.headers)
+        cached.request = response.request
+        cached.elapsed = response.elapsed
+        cached._content = body_path.read_bytes()
+        cached._content_consumed = True
+        cached.from_cache = True
+        
+        self.hits += 1
+        return cached
+    
+    def open_body(self, entry: Dict) -> BinaryIO:
+        """Corpo in cache da leggere in streaming dopo un 304 Not Modified"""
+        _, body_path = self._paths(entry['key'])
+        body = open(body_path, 'rb')
+        self.hits += 1
+        return body
+    
+    @property
+    def size_bytes(self) -> int:
+        return self._total_bytes
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _touch(self, key: str):
+        """Segna la voce come usata di recente (ordine LRU anche su disco)"""
+        self._entries.move_to_end(key)
+        meta_path, _ = self._paths(key)
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+    
+    def _evict(self):
+        """Rimuove le voci meno usate finché la cache rientra nel limite"""
+        while self._total_bytes > self.max_size_bytes and len(self._entries) > 1:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+    
+    def _remove(self, key: str):
+        self._total_bytes -= self._entries.pop(key, 0)
+        for path in self._paths(key):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+class _StoringReader(io.RawIOBase):
+    """Legge il corpo di una risposta copiandolo su un file temporaneo della cache"""
+    
+    def __init__(self, cache: HTTPCache, key: str, meta: Dict, raw: BinaryIO):
+        self._cache = cache
+        self._key = key
+        self._meta = meta
+        self._raw = raw
+        self._size = 0
+        self._part = tempfile.NamedTemporaryFile(dir=cache.directory, suffix='.part', delete=False)
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        count = self._raw.readinto(buffer)
+        if self._part is None:
+            return count
+        
+        if count:
+            self._part.write(memoryview(buffer)[:count])
+            self._size += count
+        else:
+            # Corpo letto per intero: il file temporaneo diventa il corpo della voce
+            self._part.close()
+            _, body_path = self._cache._paths(self._key)
+            with self._cache._lock:
+                body_path.parent.mkdir(exist_ok=True)
+                os.replace(self._part.name, body_path)
+                self._cache._commit(self._key, self._meta, self._size)
+            self._part = None
+        return count
+    
+    def close(self):
+        if self._part is not None:
+            self._part.close()
+            try:
+                os.unlink(self._part.name)
+            except OSError:
+                pass
+            self._part = None
+        super().close()
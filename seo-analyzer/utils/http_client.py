@@ -0,0 +1,188 @@
+"""
+HTTP Client - Sessione HTTP condivisa per tutte le verifiche di rete
+Keep-alive, pool di connessioni, timeout e retry con backoff configurabili
+"""
+
+import io
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .http_cache import HTTPCache
+from .rate_limiter import SLOW_DOWN_STATUSES
+from .rules import HTTPRules, SEORules
+
+
+DEFAULT_USER_AGENT = 'SEO-Analyzer-Bot/1.0'
+
+
+class HTTPClient:
+    """
+    Client HTTP unico iniettato in analyzer, crawler e link checker
+    
+    Tutte le richieste passano da una sola requests.Session: le connessioni
+    verso lo stesso host vengono riutilizzate (keep-alive) invece di aprire
+    una nuova connessione TCP/TLS per ogni verifica.
+    
+    Le richieste gestite da HostRateLimiter (throttled=True) usano una
+    seconda sessione che non ritenta 429/503 e ignora Retry-After: quelle
+    risposte arrivano al limiter, che rallenta l'host e decide l'attesa.
+    """
+    
+    def __init__(self, config: Union[Dict, HTTPRules, None] = None, cache: Optional[HTTPCache] = None,
+                 user_agent: Optional[str] = None):
+        """
+        Args:
+            config: Blocco advanced.http (compilato o dizionario)
+            cache: Cache su disco per cached_get / cached_stream
+            user_agent: User-Agent se advanced.http non lo indica (es. quello del crawler)
+        """
+        self.rules = HTTPRules.ensure(config)
+        self.cache = cache
+        self.user_agent = self.rules.user_agent or user_agent or DEFAULT_USER_AGENT
+        self.timeout: Tuple[float, float] = (self.rules.connect_timeout_seconds, self.rules.read_timeout_seconds)
+        
+        retry_statuses = self.rules.retry_statuses
+        self.session = self._session(retry_statuses, respect_retry_after=True)
+        self.throttled_session = self._session(
+            [status for status in retry_statuses if status not in SLOW_DOWN_STATUSES],
+            respect_retry_after=False
+        )
+    
+    def _session(self, retry_statuses, respect_retry_after: bool) -> requests.Session:
+        retry = Retry(
+            total=self.rules.retries,
+            backoff_factor=self.rules.backoff_factor,
+            status_forcelist=retry_statuses,
+            allowed_methods=['GET', 'HEAD'],
+            respect_retry_after_header=respect_retry_after,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.rules.pool_connections,
+            pool_maxsize=self.rules.pool_maxsize,
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.headers['User-Agent'] = self.user_agent
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    @classmethod
+    def from_config(cls, config: Union[Dict, SEORules, None]) -> 'HTTPClient':
+        """
+        Crea il client dalla configurazione completa (seo_rules.yaml)
+        
+        Usa la sezione advanced.http e lo User-Agent di advanced.crawling.
+        """
+        rules = SEORules.ensure(config or {})
+        return cls(rules.advanced.http, cache=HTTPCache.from_config(rules),
+                   user_agent=rules.advanced.crawling.user_agent)
+    
+    def request(self, method: str, url: str, throttled: bool = False, **kwargs) -> requests.Response:
+        """
+        Richiesta HTTP con timeout di default della configurazione
+        
+        throttled=True lascia 429/503 al chiamante (vedi HostRateLimiter.fetch)
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        session = self.throttled_session if throttled else self.session
+        return session.request(method, url, **kwargs)
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+    
+    def cached_get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET attraverso la cache su disco (se configurata)
+        
+        Se l'URL è in cache invia una richiesta condizionale
+        (If-None-Match / If-Modified-Since): su 304 restituisce la risposta
+        salvata senza riscaricare il corpo. Con un header Range la voce è
+        quella dell'intervallo richiesto (risposta 206).
+        """
+        if self.cache is None:
+            return self.get(url, **kwargs)
+        
+        headers = dict(kwargs.pop('headers', None) or {})
+        byte_range = headers.get('Range')
+        entry = self.cache.lookup(url, byte_range)
+        if entry:
+            headers.update(self.cache.conditional_headers(entry))
+        
+        response = self.get(url, headers=headers, **kwargs)
+        
+        if response.status_code == 304 and entry:
+            try:
+                return self.cache.revalidated(entry, response)
+            except OSError:
+                # Voce rimossa nel frattempo: riscarica senza condizioni
+                for name in ('If-None-Match', 'If-Modified-Since'):
+                    headers.pop(name, None)
+                response = self.get(url, headers=headers, **kwargs)
+        
+        self.cache.store(url, response, byte_range)
+        return response
+    
+    @contextmanager
+    def cached_stream(self, url: str, **kwargs) -> Iterator[Tuple[int, BinaryIO]]:
+        """
+        GET letto in streaming attraverso la cache su disco (se configurata)
+        
+        Come cached_get, ma il corpo non viene caricato in memoria: su 304
+        lo stream legge il corpo salvato, su 200 con ETag/Last-Modified il
+        corpo viene salvato mentre il chiamante lo legge.
+        
+        Yields:
+            (status, stream binario del corpo, senza Content-Encoding)
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        entry = self.cache.lookup(url) if self.cache is not None else None
+        if entry:
+            headers.update(self.cache.conditional_headers(entry))
+        
+        response = self.get(url, headers=headers, stream=True, **kwargs)
+        try:
+            if response.status_code == 304 and entry:
+                try:
+                    body = self.cache.open_body(entry)
+                except OSError:
+                    # Voce rimossa nel frattempo: riscarica senza condizioni
+                    response.close()
+                    for name in ('If-None-Match', 'If-Modified-Since'):
+                        headers.pop(name, None)
+                    response = self.get(url, headers=headers, stream=True, **kwargs)
+                else:
+                    with body:
+                        yield entry['status'], body
+                    return
+            
+            response.raw.decode_content = True
+            # Resta "aperto" anche a corpo esaurito, come richiesto da io.BufferedReader
+            response.raw.auto_close = False
+            raw = response.raw
+            if self.cache is not None:
+                raw = self.cache.storing_stream(url, response, raw) or raw
+            with io.BufferedReader(raw) as stream:
+                yield response.status_code, stream
+        finally:
+            response.close()
+    
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+    
+    def close(self):
+        self.session.close()
+        self.throttled_session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,249 @@
+"""
+Image Probe - Formato e dimensioni delle immagini dai soli header
+Richieste HTTP Range (o lettura dell'inizio del file) e decodifica di PNG, JPEG, GIF, WebP e AVIF
+"""
+
+import os
+import re
+import struct
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+CONTENT_RANGE_TOTAL = re.compile(r'/\s*(\d+)\s*$')
+
+
+def detect_format(data: bytes) -> Optional[str]:
+    """Formato dell'immagine dai magic byte (None se sconosciuto)"""
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if data.startswith(b'\xff\xd8'):
+        return 'jpeg'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    if data[4:8] == b'ftyp' and (data[8:12] in (b'avif', b'avis') or b'avif' in data[16:64]):
+        return 'avif'
+    if b'<svg' in data[:1024].lower():
+        return 'svg'
+    return None
+
+
+def parse_image_header(data: bytes) -> Optional[Dict]:
+    """
+    Formato, larghezza e altezza dai primi byte dell'immagine
+    
+    Returns:
+        {'format', 'width', 'height'}; width e height sono None se gli
+        header non sono completi nei byte letti (o per le immagini SVG).
+        None se il formato non è riconosciuto.
+    """
+    image_format = detect_format(data)
+    if image_format is None:
+        return None
+    
+    size = None
+    try:
+        if image_format == 'png' and data[12:16] == b'IHDR':
+            size = struct.unpack('>II', data[16:24])
+        elif image_format == 'gif':
+            size = struct.unpack('<HH', data[6:10])
+        elif image_format == 'webp':
+            size = _webp_size(data)
+        elif image_format == 'jpeg':
+            size = _jpeg_size(data)
+        elif image_format == 'avif':
+            size = _avif_size(data)
+    except struct.error:
+        size = None
+    
+    width, height = size if size else (None, None)
+    return {'format': image_format, 'width': width, 'height': height}
+
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    chunk = data[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        b0, b1, b2, b3 = data[21:25]
+        return 1 + (((b1 & 0x3F) << 8) | b0), 1 + (((b3 & 0x0F) << 10) | (b2 << 2) | ((b1 & 0xC0) >> 6))
+    if chunk == b'VP8X':
+        return 1 + int.from_bytes(data[24:27], 'little'), 1 + int.from_bytes(data[27:30], 'little')
+    return None
+
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Scorre i segmenti JPEG fino al marker SOF (dopo EXIF e profili colore)"""
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            position += 2
+            continue
+        
+        length = struct.unpack('>H', data[position + 2:position + 4])[0]
+        if marker in JPEG_SOF_MARKERS:
+            height, width = struct.unpack('>HH', data[position + 5:position + 9])
+            return width, height
+        if marker == 0xD9:
+            return None
+        position += 2 + length
+    return None
+
+
+def _avif_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """Dimensioni dalla proprietà 'ispe' (la più grande: l'immagine principale, non le miniature)"""
+    best = None
+    position = data.find(b'ispe')
+    while position != -1 and position + 16 <= len(data):
+        width, height = struct.unpack('>II', data[position + 8:position + 16])
+        if best is None or width * height > best[0] * best[1]:
+            best = (width, height)
+        position = data.find(b'ispe', position + 4)
+    return best
+
+
+class ImageProbe:
+    """
+    Legge formato, dimensioni in pixel e peso delle immagini senza scaricarle
+    
+    Per gli URL usa una richiesta Range sui primi head_bytes (il peso
+    totale arriva da Content-Range o Content-Length); per i file locali
+    legge solo l'inizio del file. Se gli header JPEG/AVIF non sono
+    completi, la finestra viene ampliata fino a max_head_bytes. Le sonde
+    girano in parallelo e ogni immagine viene letta una volta per
+    esecuzione, anche se compare su molte pagine. Le richieste passano dal
+    limite per host (rate_limiter) e dalla cache HTTP su disco, come quelle
+    del crawler.
+    """
+    
+    def __init__(self, http_client=None, head_bytes: int = 16 * 1024,
+                 max_head_bytes: int = 256 * 1024, workers: int = 8, rate_limiter=None):
+        self.http = http_client
+        self.rate_limiter = rate_limiter
+        self.head_bytes = head_bytes
+        self.max_head_bytes = max_head_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='image-probe')
+        self._lock = threading.Lock()
+        self._probes: Dict[str, Tuple[object, Future]] = {}
+        self.probed = 0
+        self.requests = 0
+    
+    @classmethod
+    def from_config(cls, config: Dict, http_client=None, rate_limiter=None) -> 'ImageProbe':
+        """Crea la sonda dalla sezione images.probe della configurazione"""
+        probe = config.get('images', {}).get('probe', {})
+        return cls(http_client=http_client,
+                   head_bytes=probe.get('head_kb', 16) * 1024,
+                   max_head_bytes=probe.get('max_head_kb', 256) * 1024,
+                   workers=probe.get('workers', 8),
+                   rate_limiter=rate_limiter)
+    
+    def probe(self, kind: str, location: str) -> Future:
+        """
+        Future con {'format', 'width', 'height', 'size_bytes'} (None se non leggibile)
+        
+        Args:
+            kind: 'file' per i file locali, 'url' per le immagini remote
+            location: Percorso del file o URL assoluto
+        """
+        stamp = None
+        if kind == 'file':
+            try:
+                stat = os.stat(location)
+                stamp = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamp = 'missing'
+        
+        with self._lock:
+            cached = self._probes.get(location)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+            reader = self._probe_file if kind == 'file' else self._probe_url
+            future = self._executor.submit(reader, location)
+            self._probes[location] = (stamp, future)
+            self.probed += 1
+        return future
+    
+    def _decode(self, read_head) -> Optional[Dict]:
+        """Decodifica gli header ampliando la finestra finché servono più byte"""
+        window = self.head_bytes
+        while True:
+            data, complete = read_head(window)
+            info = parse_image_header(data) if data else None
+            if info is None or info['width'] is not None or info['format'] == 'svg':
+                return info
+            if complete or window >= self.max_head_bytes:
+                return info
+            window = min(window * 4, self.max_head_bytes)
+    
+    def _probe_file(self, path: str) -> Optional[Dict]:
+        try:
+            size_bytes = os.path.getsize(path)
+            
+            def read_head(window: int):
+                with open(path, 'rb') as f:
+                    return f.read(window), window >= size_bytes
+            
+            info = self._decode(read_head)
+        except OSError:
+            return None
+        
+        if info is None:
+            return None
+        info['size_bytes'] = size_bytes
+        return info
+    
+    def _probe_url(self, url: str) -> Optional[Dict]:
+        if self.http is None:
+            return None
+        
+        total = {'size_bytes': None}
+        
+        def read_head(window: int):
+            with self._lock:
+                self.requests += 1
+            headers = {'Range': f'bytes=0-{window - 1}'}
+            if self.rate_limiter is not None:
+                response = self.rate_limiter.fetch(url, self.http, headers=headers, stream=True)
+            else:
+                response = self.http.cached_get(url, headers=headers, stream=True)
+            
+            with response:
+                response.raise_for_status()
+                if response.status_code == 206:
+                    match = CONTENT_RANGE_TOTAL.search(response.headers.get('Content-Range', ''))
+                    total['size_bytes'] = int(match.group(1)) if match else None
+                    # Già letta se salvata in cache (o ricostruita da un 304)
+                    data = response.content[:window]
+                else:
+                    if 'Content-Length' in response.headers:
+                        total['size_bytes'] = int(response.headers['Content-Length'])
+                    # Range ignorato dal server: si leggono comunque solo i primi byte
+                    response.raw.decode_content = True
+                    data = response.raw.read(window)
+                complete = total['size_bytes'] is not None and len(data) >= total['size_bytes']
+                return data, complete
+        
+        try:
+            info = self._decode(read_head)
+        except Exception:
+            return None
+        
+        if info is None:
+            return None
+        info['size_bytes'] = total['size_bytes']
+        return info
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
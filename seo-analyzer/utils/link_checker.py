@@ -0,0 +1,209 @@
+"""
+Link Checker - Verifica asincrona dei link rotti
+Pool di connessioni condiviso, keep-alive, limiti per host e deduplicazione per URL
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Dict, Iterable, List, Optional, Union
+from urllib.parse import urlparse
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+import requests
+
+from .http_client import HTTPClient
+from .rules import LinkCheckingRules
+
+
+# Status con cui alcuni server rifiutano HEAD pur servendo la pagina con GET
+HEAD_REJECTED_STATUSES = {403, 405, 501}
+
+
+class LinkChecker:
+    """
+    Verifica link rotti con richieste concorrenti
+    
+    Ogni URL assoluto viene verificato una sola volta per esecuzione:
+    i risultati restano in cache sull'istanza e vengono riutilizzati
+    per tutte le pagine successive. Un URL già in verifica da un altro
+    thread non viene richiesto di nuovo: si attende il suo risultato.
+    
+    Event loop e sessione aiohttp vivono per tutta l'esecuzione su un
+    thread dedicato, così le connessioni keep-alive restano aperte tra
+    una pagina e l'altra (e check_many funziona anche se il chiamante ha
+    già un loop in esecuzione). close() li rilascia.
+    """
+    
+    def __init__(self, config: Union[Dict, LinkCheckingRules, None] = None,
+                 http_client: Optional[HTTPClient] = None):
+        rules = LinkCheckingRules.ensure(config)
+        self.max_concurrency = rules.max_concurrency
+        self.per_host_limit = rules.per_host_limit
+        self.timeout = rules.timeout_seconds
+        # Sessione condivisa per il fallback sincrono (e User-Agent comune)
+        self.http = http_client or HTTPClient(user_agent=rules.user_agent)
+        self.user_agent = self.http.user_agent
+        
+        self._results: Dict[str, bool] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        
+        # Loop, thread e sessione: creati alla prima verifica, chiusi da close()
+        # o quando il checker viene raccolto (anche all'uscita dell'interprete)
+        self._runtime = {'loop': None, 'thread': None, 'session': None}
+        self._finalizer = weakref.finalize(self, _shutdown, self._runtime)
+        self._overall = None
+        self._per_host: Dict[str, 'asyncio.Semaphore'] = {}
+    
+    def check(self, url: str) -> bool:
+        """Verifica un singolo URL (True se rotto)"""
+        return self.check_many([url])[url]
+    
+    def check_many(self, urls: Iterable[str]) -> Dict[str, bool]:
+        """
+        Verifica un insieme di URL in parallelo
+        
+        Args:
+            urls: URL assoluti da verificare (duplicati ammessi)
+        
+        Returns:
+            Dizionario URL -> True se il link è rotto
+        """
+        unique = list(dict.fromkeys(urls))
+        
+        owned: Dict[str, Future] = {}
+        waiting: List[Future] = []
+        with self._lock:
+            for url in unique:
+                if url in self._results or urlparse(url).scheme not in ('http', 'https'):
+                    continue
+                if url in self._in_flight:
+                    waiting.append(self._in_flight[url])
+                else:
+                    owned[url] = self._in_flight[url] = Future()
+        
+        if owned:
+            pending = list(owned)
+            try:
+                if AIOHTTP_AVAILABLE:
+                    checked = asyncio.run_coroutine_threadsafe(self._check_all(pending), self._event_loop()).result()
+                else:
+                    checked = self._check_all_sync(pending)
+            except BaseException as e:
+                with self._lock:
+                    for url in pending:
+                        del self._in_flight[url]
+                for future in owned.values():
+                    future.set_exception(e)
+                raise
+            
+            with self._lock:
+                self._results.update(checked)
+                for url in pending:
+                    del self._in_flight[url]
+            for url, future in owned.items():
+                future.set_result(checked[url])
+        
+        for future in waiting:
+            future.result()
+        
+        # Schemi non HTTP (mailto:, tel:, ...) non sono verificabili
+        return {u: self._results.get(u, False) for u in unique}
+    
+    @property
+    def checked_count(self) -> int:
+        """Numero di URL distinti già verificati"""
+        return len(self._results)
+    
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        """Loop di lunga durata su un thread dedicato (avviato alla prima verifica)"""
+        with self._lock:
+            if self._runtime['loop'] is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='link-checker', daemon=True)
+                thread.start()
+                self._runtime.update(loop=loop, thread=thread, session=None)
+                self._overall = None
+                self._per_host.clear()
+            return self._runtime['loop']
+    
+    async def _check_all(self, urls: List[str]) -> Dict[str, bool]:
+        """Verifica gli URL con la sessione aiohttp condivisa tra le pagine"""
+        session = self._runtime['session']
+        if session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency,
+                limit_per_host=self.per_host_limit
+            )
+            session = aiohttp.ClientSession(connector=connector, headers={'User-Agent': self.user_agent})
+            self._runtime['session'] = session
+            self._overall = asyncio.Semaphore(self.max_concurrency)
+        
+        # Limiti applicati prima della richiesta: il timeout parte solo con lo slot
+        # acquisito, così l'attesa in coda dietro agli altri link dello stesso host
+        # non fa risultare rotti link sani
+        async def check_with_slot(url: str) -> bool:
+            host = urlparse(url).netloc.lower()
+            host_slot = self._per_host.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            async with self._overall, host_slot:
+                return await self._check_one(session, url)
+        
+        results = await asyncio.gather(*(check_with_slot(url) for url in urls))
+        return dict(zip(urls, results))
+    
+    def close(self):
+        """Chiude sessione e loop (le connessioni keep-alive vengono rilasciate)"""
+        with self._lock:
+            _shutdown(self._runtime)
+    
+    async def _check_one(self, session, url: str) -> bool:
+        """HEAD con fallback a GET se il server rifiuta HEAD"""
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        try:
+            async with session.head(url, allow_redirects=True, timeout=timeout) as response:
+                status = response.status
+            
+            if status in HEAD_REJECTED_STATUSES:
+                async with session.get(url, allow_redirects=True, timeout=timeout) as response:
+                    status = response.status
+            
+            return status >= 400
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            return True
+    
+    def _check_all_sync(self, urls: List[str]) -> Dict[str, bool]:
+        """Fallback senza aiohttp: sessione HTTP condivisa con keep-alive"""
+        results = {}
+        
+        for url in urls:
+            try:
+                response = self.http.head(url, timeout=self.timeout)
+                if response.status_code in HEAD_REJECTED_STATUSES:
+                    response = self.http.get(url, timeout=self.timeout, stream=True)
+                    response.close()
+                results[url] = response.status_code >= 400
+            except requests.RequestException:
+                results[url] = True
+        
+        return results
+
+
+def _shutdown(runtime: Dict):
+    """Chiude sessione aiohttp, loop e thread di un LinkChecker (idempotente)"""
+    loop, thread, session = runtime['loop'], runtime['thread'], runtime['session']
+    runtime.update(loop=None, thread=None, session=None)
+    if loop is None:
+        return
+    
+    if session is not None:
+        asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join()
+    loop.close()
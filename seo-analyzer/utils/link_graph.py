@@ -0,0 +1,236 @@
+"""
+Link Graph - Grafo compatto dei link interni del sito
+URL internati come interi, archi in array tipizzati, adiacenza CSR per
+PageRank e profondità di click
+"""
+
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .frontier import normalize_url
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+class LinkGraph:
+    """
+    Archi del grafo dei link interni raccolti durante un'analisi multi-pagina
+    
+    Ogni URL (normalizzato) riceve un id intero; gli archi sono due array
+    paralleli di id, così la memoria cresce di pochi byte per link invece
+    di conservare l'HTML o le liste di URL di ogni pagina. Gli algoritmi
+    lavorano sulla forma CSR (indptr, indices) costruita una sola volta.
+    """
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.urls: List[str] = []
+        self.sources = array('I')
+        self.targets = array('I')
+        self.analyzed = bytearray()
+        self._csr = None
+    
+    def node_id(self, url: str) -> int:
+        """Id intero dell'URL (creato se nuovo)"""
+        key = normalize_url(url)
+        node = self._ids.get(key)
+        if node is None:
+            node = len(self.urls)
+            self._ids[key] = node
+            self.urls.append(url)
+            self.analyzed.append(0)
+        return node
+    
+    def find(self, url: str) -> Optional[int]:
+        """Id dell'URL se presente nel grafo (None altrimenti)"""
+        return self._ids.get(normalize_url(url))
+    
+    def add_page(self, url: str, links: Iterable[str]):
+        """Registra una pagina analizzata e i suoi link interni uscenti"""
+        source = self.node_id(url)
+        self.analyzed[source] = 1
+        
+        targets = {self.node_id(link) for link in links}
+        targets.discard(source)
+        
+        for target in sorted(targets):
+            self.sources.append(source)
+            self.targets.append(target)
+    
+    @property
+    def node_count(self) -> int:
+        return len(self.urls)
+    
+    @property
+    def edge_count(self) -> int:
+        return len(self.sources)
+    
+    @property
+    def page_count(self) -> int:
+        """Pagine effettivamente analizzate (esclusi URL solo scoperti)"""
+        return sum(self.analyzed)
+    
+    def to_csr(self) -> Tuple:
+        """
+        Adiacenza in formato CSR (link uscenti)
+        
+        I link uscenti del nodo i sono indices[indptr[i]:indptr[i + 1]].
+        Con numpy restituisce array numpy, altrimenti array tipizzati;
+        il risultato resta valido finché non vengono aggiunti archi o nodi.
+        """
+        size = (self.node_count, self.edge_count)
+        if self._csr is not None and self._csr[0] == size:
+            return self._csr[1]
+        
+        n = self.node_count
+        if NUMPY_AVAILABLE:
+            sources = np.frombuffer(self.sources, dtype=np.uint32) if self.sources else np.zeros(0, dtype=np.uint32)
+            targets = np.frombuffer(self.targets, dtype=np.uint32) if self.targets else np.zeros(0, dtype=np.uint32)
+            indptr = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+            indices = targets[np.argsort(sources, kind='stable')]
+        else:
+            # Counting sort per sorgente
+            counts = [0] * (n + 1)
+            for source in self.sources:
+                counts[source + 1] += 1
+            for i in range(n):
+                counts[i + 1] += counts[i]
+            indptr = array('Q', counts)
+            
+            position = list(counts[:n])
+            indices = array('I', bytes(4 * self.edge_count))
+            for source, target in zip(self.sources, self.targets):
+                indices[position[source]] = target
+                position[source] += 1
+        
+        self._csr = (size, (indptr, indices))
+        return indptr, indices
+    
+    def out_degrees(self) -> List[int]:
+        """Link interni uscenti distinti per nodo"""
+        indptr, _ = self.to_csr()
+        if NUMPY_AVAILABLE:
+            return np.diff(indptr).tolist()
+        return [indptr[i + 1] - indptr[i] for i in range(self.node_count)]
+    
+    def in_degrees(self) -> List[int]:
+        """Link interni entranti per nodo"""
+        if NUMPY_AVAILABLE:
+            _, indices = self.to_csr()
+            return np.bincount(indices, minlength=self.node_count).tolist()
+        
+        degrees = [0] * self.node_count
+        for target in self.targets:
+            degrees[target] += 1
+        return degrees
+    
+    def pagerank(self, damping: float = 0.85, max_iterations: int = 100,
+                 tolerance: float = 1e-6) -> List[float]:
+        """
+        PageRank interno per nodo (la somma vale 1)
+        
+        Iterazione delle potenze sull'adiacenza CSR: ogni passo è una
+        ripetizione + bincount, lineare nel numero di archi. Il rank dei
+        nodi senza link uscenti viene ridistribuito su tutto il grafo.
+        
+        Args:
+            damping: Probabilità di seguire un link (1 - probabilità di salto casuale)
+            max_iterations: Iterazioni massime
+            tolerance: Convergenza sulla variazione L1 del vettore
+        """
+        n = self.node_count
+        if n == 0:
+            return []
+        
+        indptr, indices = self.to_csr()
+        
+        if NUMPY_AVAILABLE:
+            out_degree = np.diff(indptr)
+            dangling = out_degree == 0
+            inverse = np.zeros(n)
+            inverse[~dangling] = 1.0 / out_degree[~dangling]
+            
+            rank = np.full(n, 1.0 / n)
+            for _ in range(max_iterations):
+                contributions = np.repeat(rank * inverse, out_degree)
+                updated = np.bincount(indices, weights=contributions, minlength=n)
+                updated = damping * (updated + rank[dangling].sum() / n) + (1.0 - damping) / n
+                delta = np.abs(updated - rank).sum()
+                rank = updated
+                if delta < tolerance:
+                    break
+            return rank.tolist()
+        
+        rank = [1.0 / n] * n
+        for _ in range(max_iterations):
+            updated = [0.0] * n
+            dangling_mass = 0.0
+            for node in range(n):
+                start, end = indptr[node], indptr[node + 1]
+                if start == end:
+                    dangling_mass += rank[node]
+                    continue
+                share = rank[node] / (end - start)
+                for position in range(start, end):
+                    updated[indices[position]] += share
+            
+            base = damping * dangling_mass / n + (1.0 - damping) / n
+            updated = [damping * value + base for value in updated]
+            delta = sum(abs(new - old) for new, old in zip(updated, rank))
+            rank = updated
+            if delta < tolerance:
+                break
+        return rank
+    
+    def click_depths(self, start_url: str) -> List[int]:
+        """
+        Numero minimo di click da start_url per ogni nodo (-1 se irraggiungibile)
+        
+        Visita in ampiezza per livelli: con numpy ogni livello espande
+        l'intera frontiera con operazioni vettoriali sugli intervalli CSR.
+        """
+        n = self.node_count
+        start = self.find(start_url)
+        if start is None:
+            return [-1] * n
+        
+        indptr, indices = self.to_csr()
+        
+        if NUMPY_AVAILABLE:
+            depths = np.full(n, -1, dtype=np.int32)
+            depths[start] = 0
+            frontier = np.array([start], dtype=np.int64)
+            level = 0
+            
+            while frontier.size:
+                level += 1
+                begins = indptr[frontier]
+                counts = indptr[frontier + 1] - begins
+                total = int(counts.sum())
+                if total == 0:
+                    break
+                
+                # Posizioni in indices di tutti i link uscenti della frontiera
+                offsets = np.repeat(begins - np.cumsum(counts) + counts, counts) + np.arange(total)
+                neighbours = np.unique(indices[offsets])
+                frontier = neighbours[depths[neighbours] < 0].astype(np.int64)
+                depths[frontier] = level
+            return depths.tolist()
+        
+        depths = [-1] * n
+        depths[start] = 0
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for position in range(indptr[node], indptr[node + 1]):
+                target = indices[position]
+                if depths[target] < 0:
+                    depths[target] = depths[node] + 1
+                    queue.append(target)
+        return depths
@@ -0,0 +1,242 @@
+"""
+Local Site - Risoluzione offline dei link interni di una build statica
+Indice dei percorsi della directory e degli id di ogni pagina, nessuna richiesta di rete
+"""
+
+import os
+import posixpath
+import re
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, Optional, Set, Tuple, Union
+from urllib.parse import unquote, urljoin, urlsplit
+
+from .rules import SEORules
+
+
+# id="..." su qualsiasi elemento e <a name="..."> (ancore HTML storiche)
+ID_PATTERN = re.compile(r'''<[^>]*?\sid\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE)
+NAME_PATTERN = re.compile(r'''<a\s[^>]*?\bname\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''', re.IGNORECASE)
+
+# Fragment sempre validi (#top porta all'inizio della pagina per specifica HTML)
+IMPLICIT_FRAGMENTS = {'', 'top'}
+
+
+class LocalSiteIndex:
+    """
+    Indice dei file di una directory per verificare i link senza server
+    
+    I percorsi vengono raccolti una sola volta (una visita della directory);
+    gli id delle pagine di destinazione vengono letti solo quando un link
+    punta a un #fragment e restano in cache per tutta l'analisi.
+    """
+    
+    def __init__(self, root: str, site_root: str = '/', site_url: Optional[str] = None,
+                 index_files: Iterable[str] = ('index.html',), default_extension: str = '.html',
+                 check_fragments: bool = True):
+        """
+        Args:
+            root: Directory della build (corrisponde a site_root nel sito pubblicato)
+            site_root: Percorso URL a cui è pubblicata la directory (es. /blog/)
+            site_url: URL pubblico del sito; i link assoluti verso di esso sono interni
+            index_files: File serviti per gli URL di directory (es. /guide/)
+            default_extension: Estensione provata per URL senza estensione (/contatti)
+            check_fragments: Se True verifica i #fragment sugli id della pagina di destinazione
+        """
+        self.root = Path(root).resolve()
+        self.site_root = '/' + site_root.strip('/') + '/' if site_root.strip('/') else '/'
+        self.site_url = urlsplit(site_url) if site_url else None
+        self.index_files = tuple(index_files)
+        self.default_extension = default_extension
+        self.check_fragments = check_fragments
+        
+        self._paths: set = set()
+        self._dirs: set = {''}
+        self._ids: Dict[str, FrozenSet[str]] = {}
+        self.scan()
+    
+    @classmethod
+    def from_config(cls, root: str, config: Union[Dict, SEORules]) -> 'LocalSiteIndex':
+        """Crea l'indice dalla sezione advanced.local_site della configurazione"""
+        local = SEORules.ensure(config).advanced.local_site
+        return cls(root,
+                   site_root=local.site_root,
+                   site_url=local.site_url,
+                   index_files=local.index_files,
+                   default_extension=local.default_extension,
+                   check_fragments=local.check_fragments)
+    
+    def scan(self):
+        """(Ri)costruisce l'indice dei percorsi e svuota la cache degli id"""
+        paths, dirs = set(), {''}
+        for directory, subdirs, files in os.walk(self.root):
+            relative = Path(directory).relative_to(self.root).as_posix()
+            relative = '' if relative == '.' else relative
+            for name in subdirs:
+                dirs.add(posixpath.join(relative, name))
+            for name in files:
+                paths.add(posixpath.join(relative, name))
+        
+        self._paths, self._dirs = paths, dirs
+        self._ids.clear()
+    
+    def refresh(self, changed: Iterable[Path]):
+        """Aggiorna l'indice dopo modifiche ai file (es. modalità watch)"""
+        changed = list(changed)
+        if any(self._relative(path) not in self._paths or not Path(path).exists() for path in changed):
+            self.scan()
+            return
+        for path in changed:
+            self._ids.pop(self._relative(path), None)
+    
+    def __contains__(self, path) -> bool:
+        relative = self._relative(path)
+        return relative is not None and relative in self._paths
+    
+    def _relative(self, path) -> Optional[str]:
+        """Percorso POSIX relativo alla root (None se fuori dalla directory)"""
+        try:
+            return Path(path).resolve().relative_to(self.root).as_posix()
+        except ValueError:
+            return None
+    
+    def page_path(self, url: str) -> Optional[str]:
+        """Percorso relativo della pagina analizzata a partire dal suo URL file://"""
+        parts = urlsplit(url)
+        if parts.scheme != 'file':
+            return None
+        return self._relative(unquote(parts.path))
+    
+    def is_local(self, href: str) -> bool:
+        """True se il link punta a una risorsa della build (relativo, root-relative o verso site_url)"""
+        parts = urlsplit(href)
+        if not parts.scheme and not parts.netloc:
+            return True
+        if self.site_url is None or parts.scheme not in ('http', 'https', ''):
+            return False
+        return parts.netloc.lower() == self.site_url.netloc.lower()
+    
+    def resolve(self, href: str, page: str,
+                dependencies: Optional[Set[str]] = None) -> Tuple[Optional[str], str]:
+        """
+        File di destinazione di un link interno
+        
+        Args:
+            href: Valore dell'attributo href
+            page: Percorso relativo della pagina che contiene il link
+            dependencies: Se indicato, riceve il percorso assoluto dei file
+                          provati fino a quello trovato (tutti se il link è
+                          rotto): crearli o rimuoverli cambia l'esito
+        
+        Returns:
+            (percorso relativo del file o None se non esiste, fragment)
+        """
+        parts = urlsplit(href)
+        fragment = unquote(parts.fragment)
+        path = unquote(parts.path)
+        
+        if not path:
+            return page, fragment
+        
+        if parts.netloc or path.startswith('/'):
+            # Root-relative (o assoluto verso site_url): va rimosso il prefisso di pubblicazione
+            if not (path + '/').startswith(self.site_root):
+                return None, fragment
+            relative = path[len(self.site_root):]
+        else:
+            relative = posixpath.join(posixpath.dirname(page), path)
+        
+        trailing_slash = relative.endswith('/') or relative == ''
+        relative = posixpath.normpath(relative) if relative else '.'
+        if relative.startswith('..'):
+            return None, fragment
+        relative = '' if relative == '.' else relative
+        
+        for candidate in self._candidates(relative, trailing_slash):
+            if dependencies is not None:
+                dependencies.add(str(self.root / candidate))
+            if candidate in self._paths:
+                return candidate, fragment
+        return None, fragment
+    
+    def _candidates(self, relative: str, trailing_slash: bool) -> Iterator[str]:
+        """File che possono servire un percorso, nell'ordine in cui vengono provati"""
+        if not trailing_slash:
+            yield relative
+        
+        for index_file in self.index_files:
+            yield posixpath.join(relative, index_file)
+        
+        # URL "puliti" senza estensione: /contatti -> contatti.html (non per le directory esistenti)
+        if not trailing_slash and relative not in self._dirs and \
+                not posixpath.splitext(relative)[1] and self.default_extension:
+            yield relative + self.default_extension
+    
+    def fragment_ids(self, path: str) -> FrozenSet[str]:
+        """Id (e nomi di ancore) definiti nella pagina, letti una sola volta"""
+        ids = self._ids.get(path)
+        if ids is None:
+            try:
+                with open(self.root / path, 'r', encoding='utf-8', errors='replace') as f:
+                    html = f.read()
+            except OSError:
+                html = ''
+            ids = frozenset(
+                next(group for group in match.groups() if group is not None)
+                for pattern in (ID_PATTERN, NAME_PATTERN) for match in pattern.finditer(html)
+            )
+            self._ids[path] = ids
+        return ids
+    
+    def check(self, href: str, page: str, page_ids: Optional[FrozenSet[str]] = None,
+              dependencies: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Verifica un link interno senza traffico di rete
+        
+        Args:
+            href: Valore dell'attributo href
+            page: Percorso relativo della pagina che contiene il link
+            page_ids: Id della pagina corrente (evita di rileggerla per i link #fragment)
+            dependencies: Se indicato, riceve il percorso assoluto dei file
+                          provati per risolvere il link (anche se mancanti)
+        
+        Returns:
+            None se il link è valido, altrimenti il motivo ('file' o 'fragment')
+        """
+        target, fragment = self.resolve(href, page, dependencies)
+        if target is None:
+            return 'file'
+        
+        if not self.check_fragments or fragment in IMPLICIT_FRAGMENTS or not target.endswith(('.html', '.htm')):
+            return None
+        
+        ids = page_ids if target == page and page_ids is not None else self.fragment_ids(target)
+        return None if fragment in ids else 'fragment'
+    
+    def file_url(self, path: str) -> str:
+        """URL file:// del file indicizzato (stessa forma usata da analyze_file)"""
+        return f"file://{self.root / path}"
+
+
+def locate_resource(href: str, page_url: str, local_index: Optional[LocalSiteIndex] = None,
+                    dependencies: Optional[Set[str]] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Posizione di una risorsa (CSS, JS, font...) referenziata da una pagina
+    
+    dependencies riceve i file provati dall'indice, come in LocalSiteIndex.resolve
+    
+    Returns:
+        ('file', percorso) per i file locali, ('url', URL assoluto) per le
+        risorse http(s), (None, None) se non risolvibile
+    """
+    page_path = local_index.page_path(page_url) if local_index is not None else None
+    if page_path is not None and local_index.is_local(href):
+        target, _ = local_index.resolve(href, page_path, dependencies)
+        return ('file', str(local_index.root / target)) if target else (None, None)
+    
+    absolute_url = urljoin(page_url, href)
+    parts = urlsplit(absolute_url)
+    if parts.scheme == 'file':
+        return 'file', unquote(parts.path)
+    if parts.scheme in ('http', 'https'):
+        return 'url', absolute_url.split('#')[0]
+    return None, None
@@ -3,7 +3,153 @@ Parser - Parser HTML avanzato
 """
 
 from bs4 import BeautifulSoup
-from typing import Dict
+from bs4.element import Tag
+from collections import defaultdict
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Union
+
+
+class ElementIndex:
+    """
+    Indice degli elementi di un documento costruito con una sola visita dell'albero.
+    
+    Mappa tag → elementi e attributo → elementi (in ordine di documento) e
+    raccoglie i nodi di testo, così gli analyzer interrogano l'indice invece
+    di rieseguire find_all sull'intero albero.
+    """
+    
+    def __init__(self, soup: BeautifulSoup):
+        self._by_tag: Dict[str, List[Tag]] = defaultdict(list)
+        self._by_attr: Dict[str, List[Tag]] = defaultdict(list)
+        self._position: Dict[int, int] = {}
+        self.strings: List[str] = []
+        
+        text_types = soup.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        if isinstance(text_types, type):
+            text_types = (text_types,)
+        
+        for position, node in enumerate(soup.descendants):
+            if isinstance(node, Tag):
+                self._position[id(node)] = position
+                self._by_tag[node.name].append(node)
+                for attr in node.attrs:
+                    self._by_attr[attr].append(node)
+            elif type(node) in text_types:
+                self.strings.append(node)
+    
+    @property
+    def text(self) -> str:
+        """Testo della pagina (equivalente a soup.get_text())"""
+        return ''.join(self.strings)
+    
+    def tags(self, *names: str) -> List[Tag]:
+        """Elementi con uno dei nomi indicati, in ordine di documento"""
+        if len(names) == 1:
+            return self._by_tag.get(names[0], [])
+        return self._in_document_order(self._by_tag.get(name, []) for name in names)
+    
+    def find_all(self, name: Union[str, List[str], None] = None,
+                 attrs: Optional[Dict] = None, **kwargs) -> List[Tag]:
+        """
+        Equivalente indicizzato di soup.find_all per i filtri usati dagli analyzer
+        
+        Args:
+            name: Nome tag, lista di nomi o None (qualsiasi tag)
+            attrs: Filtri per attributo (True = presente, False = assente,
+                   stringa = valore/token, regex = ricerca nel valore)
+            **kwargs: Filtri attributo come keyword (class_ per class)
+        """
+        filters = dict(attrs or {})
+        for key, value in kwargs.items():
+            filters[key.rstrip('_')] = value
+        
+        if name is not None:
+            names = [name] if isinstance(name, str) else list(name)
+            candidates = self.tags(*names)
+        else:
+            # Parti dall'attributo obbligatorio più selettivo
+            required = [attr for attr, value in filters.items() if value is not False and value is not None]
+            if required:
+                candidates = min((self._by_attr.get(attr, []) for attr in required), key=len)
+            else:
+                candidates = self._in_document_order(self._by_tag.values())
+        
+        if not filters:
+            return list(candidates)
+        
+        return [
+            tag for tag in candidates
+            if all(self._match(tag, attr, value) for attr, value in filters.items())
+        ]
+    
+    def find(self, name: Union[str, List[str], None] = None,
+             attrs: Optional[Dict] = None, **kwargs) -> Optional[Tag]:
+        """Primo elemento che soddisfa i filtri (come soup.find)"""
+        found = self.find_all(name, attrs, **kwargs)
+        return found[0] if found else None
+    
+    def _in_document_order(self, groups: Iterable[List[Tag]]) -> List[Tag]:
+        position = self._position
+        return list(merge(*groups, key=lambda tag: position[id(tag)]))
+    
+    @staticmethod
+    def _match(tag: Tag, attr: str, expected) -> bool:
+        value = tag.get(attr)
+        
+        if expected is True:
+            return value is not None
+        if expected is False or expected is None:
+            return value is None
+        if value is None:
+            return False
+        
+        values = value if isinstance(value, list) else [value]
+        if hasattr(expected, 'search'):
+            return any(expected.search(v) for v in values) or \
+                (len(values) > 1 and bool(expected.search(' '.join(values))))
+        return expected in values or ' '.join(values) == expected
+
+
+class ParsedDocument:
+    """
+    Documento HTML parsato una sola volta e condiviso tra tutti gli analyzer.
+    
+    Evita che ogni analyzer ricostruisca il proprio albero BeautifulSoup
+    a partire dalla stringa HTML.
+    """
+    
+    def __init__(self, html: str, url: str = '', features: str = 'lxml'):
+        self.html = html
+        self.url = url
+        self.soup = BeautifulSoup(html, features)
+        self._index = None
+        self._size_bytes = None
+    
+    @classmethod
+    def ensure(cls, html: Union[str, 'ParsedDocument'], url: str = '') -> 'ParsedDocument':
+        """Restituisce il documento già parsato o lo costruisce dalla stringa HTML"""
+        if isinstance(html, ParsedDocument):
+            return html
+        return cls(html, url)
+    
+    @property
+    def index(self) -> ElementIndex:
+        """Indice degli elementi (costruito alla prima richiesta)"""
+        if self._index is None:
+            self._index = ElementIndex(self.soup)
+        return self._index
+    
+    @property
+    def text(self) -> str:
+        """Testo completo della pagina (dai nodi di testo indicizzati)"""
+        return self.index.text
+    
+    @property
+    def size_bytes(self) -> int:
+        """Dimensione HTML in byte (UTF-8)"""
+        if self._size_bytes is None:
+            self._size_bytes = len(self.html.encode('utf-8'))
+        return self._size_bytes
 
 
 class HTMLParser:
@@ -16,6 +162,10 @@ class HTMLParser:
         """Parse HTML con BeautifulSoup"""
         return BeautifulSoup(html, 'lxml')
     
+    def parse_document(self, html: str, url: str = '') -> ParsedDocument:
+        """Parse HTML in un ParsedDocument condivisibile tra gli analyzer"""
+        return ParsedDocument(html, url)
+    
     def extract_text(self, html: str) -> str:
         """Estrae tutto il testo dalla pagina"""
         soup = self.parse(html)
@@ -47,4 +197,3 @@ class HTMLParser:
             ]
         
         return headings
-
@@ -0,0 +1,206 @@
+"""
+Rate Limiter - Limite di richieste adattivo per host
+Token bucket per host che rallenta su 429/503, rispetta Retry-After e Crawl-delay
+"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+from .rules import RateLimitRules
+
+
+# Status con cui il server chiede di rallentare
+SLOW_DOWN_STATUSES = {429, 503}
+
+
+class _HostBucket:
+    """Stato del token bucket di un singolo host"""
+    
+    __slots__ = ('rate', 'max_rate', 'capacity', 'tokens', 'updated', 'blocked_until')
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.max_rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host con adattamento alle risposte del server
+    
+    Ogni host parte da requests_per_second (con burst iniziale) o dal
+    Crawl-delay di robots.txt se più restrittivo. Su 429/503 la velocità
+    viene ridotta e Retry-After blocca l'host per il tempo richiesto; le
+    risposte corrette riportano gradualmente la velocità al massimo.
+    """
+    
+    def __init__(self, config: Union[Dict, RateLimitRules, None] = None, http_client=None):
+        rules = RateLimitRules.ensure(config)
+        self.enabled = rules.enabled
+        self.requests_per_second = rules.requests_per_second
+        self.burst = rules.burst
+        self.min_rate = rules.min_requests_per_second
+        self.backoff_factor = rules.backoff_factor
+        self.recovery_factor = rules.recovery_factor
+        self.max_retry_after = rules.max_retry_after_seconds
+        self.respect_crawl_delay = rules.respect_crawl_delay
+        self.retries = rules.retries
+        self.http = http_client
+        
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._robots: Dict[str, Tuple[float, object]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, url: str) -> float:
+        """
+        Attende il turno per una richiesta verso l'host dell'URL
+        
+        Returns:
+            Secondi di attesa effettivi
+        """
+        if not self.enabled:
+            return 0.0
+        
+        bucket = self._bucket(url)
+        
+        with self._lock:
+            now = time.monotonic()
+            bucket.tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            bucket.tokens -= 1
+            
+            wait = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+            wait = max(wait, bucket.blocked_until - now)
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def fetch(self, url: str, http_client=None, **kwargs):
+        """
+        GET attraverso il limite dell'host (cache HTTP compresa)
+        
+        Le risposte 429/503 non vengono ritentate da urllib3 ma registrate
+        qui: la velocità dell'host cala, Retry-After (limitato a
+        max_retry_after_seconds) blocca l'host e la richiesta viene
+        ripetuta fino a retries volte.
+        """
+        http = http_client or self.http
+        if not self.enabled:
+            return http.cached_get(url, **kwargs)
+        
+        for attempt in range(self.retries + 1):
+            self.acquire(url)
+            response = http.cached_get(url, throttled=True, **kwargs)
+            self.record(url, response)
+            if response.status_code not in SLOW_DOWN_STATUSES or attempt == self.retries:
+                return response
+            response.close()
+    
+    def record(self, url: str, response) -> None:
+        """Adatta la velocità dell'host in base alla risposta ricevuta"""
+        if not self.enabled or response is None:
+            return
+        
+        bucket = self._bucket(url)
+        
+        with self._lock:
+            if response.status_code in SLOW_DOWN_STATUSES:
+                bucket.rate = max(self.min_rate, bucket.rate * self.backoff_factor)
+                bucket.capacity = 1.0
+                bucket.tokens = min(bucket.tokens, 0.0)
+                
+                retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after:
+                    bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + retry_after)
+            
+            elif response.status_code < 400 and bucket.rate < bucket.max_rate:
+                bucket.rate = min(bucket.max_rate, bucket.rate * self.recovery_factor)
+    
+    def rate_for(self, url: str) -> float:
+        """Richieste al secondo attualmente consentite verso l'host"""
+        return self._bucket(url).rate
+    
+    def _bucket(self, url: str) -> _HostBucket:
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            return bucket
+        
+        # Crawl-delay letto fuori dal lock (richiesta di rete)
+        rate, capacity = self.requests_per_second, self.burst
+        crawl_delay = self._crawl_delay(f"{parsed.scheme}://{parsed.netloc}")
+        if crawl_delay:
+            rate, capacity = min(rate, 1.0 / crawl_delay), 1.0
+        
+        with self._lock:
+            return self._buckets.setdefault(host, _HostBucket(rate, capacity))
+    
+    def robots(self, origin: str, max_age: Optional[float] = None):
+        """
+        Risposta di robots.txt dell'origine, scaricata una sola volta
+        
+        La stessa risposta serve per il Crawl-delay e per le verifiche del
+        sito (URLAnalyzer), senza un secondo download.
+        
+        Args:
+            origin: Schema e host (es. https://example.com)
+            max_age: Secondi dopo cui viene riscaricata (None = tutta l'esecuzione)
+        
+        Returns:
+            Risposta HTTP, None se il download non è riuscito
+        """
+        with self._lock:
+            cached = self._robots.get(origin)
+        if cached and (max_age is None or time.monotonic() - cached[0] < max_age):
+            return cached[1]
+        
+        try:
+            response = self.http.cached_get(f"{origin}/robots.txt")
+        except Exception:
+            response = None
+        
+        with self._lock:
+            self._robots[origin] = (time.monotonic(), response)
+        return response
+    
+    def _crawl_delay(self, origin: str) -> Optional[float]:
+        """Crawl-delay di robots.txt per il nostro User-Agent (None se assente)"""
+        if not self.respect_crawl_delay or self.http is None:
+            return None
+        
+        try:
+            response = self.robots(origin)
+            if response is None or response.status_code != 200:
+                return None
+            
+            robots = RobotFileParser()
+            robots.parse(response.text.splitlines())
+            delay = robots.crawl_delay(self.http.user_agent)
+            return float(delay) if delay else None
+        except Exception:
+            return None
+    
+    def _parse_retry_after(self, value: Optional[str]) -> Optional[float]:
+        """Retry-After in secondi (intero o data HTTP), limitato a max_retry_after"""
+        if not value:
+            return None
+        
+        try:
+            seconds = float(value)
+        except ValueError:
+            try:
+                seconds = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        
+        return min(max(seconds, 0.0), self.max_retry_after)
@@ -42,6 +42,17 @@ class SEOReporter:
         
         lines.append("")
         
+        # Peso trasferito (dimensioni compresse reali)
+        transfer = results.get('performance', {}).get('transfer')
+        if transfer:
+            html = transfer['html']
+            lines.append(f"📦 Peso trasferito: {transfer['transfer_bytes'] / 1024:.1f}KB "
+                         f"(non compresso {transfer['total_raw'] / 1024:.1f}KB, "
+                         f"HTML + {len(transfer['assets'])} risorse)")
+            brotli = f", brotli {html['brotli'] / 1024:.1f}KB" if html['brotli'] is not None else ''
+            lines.append(f"   HTML: {html['raw'] / 1024:.1f}KB → gzip {html['gzip'] / 1024:.1f}KB{brotli}")
+            lines.append("")
+        
         # Issues per severità
         issues = results['all_issues']
         critical = [i for i in issues if i['severity'] == 'critical']
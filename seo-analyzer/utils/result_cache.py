@@ -0,0 +1,135 @@
+"""
+Result Cache - Cache persistente dei risultati per analisi incrementali
+Risultati per file indicizzati da hash del contenuto, file da cui dipendono e hash della configurazione
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+
+# Da incrementare quando cambia il formato dei risultati degli analyzer
+RESULTS_FORMAT_VERSION = 3
+
+
+def config_fingerprint(config: Dict, extra: Optional[str] = None) -> str:
+    """
+    Hash stabile della configurazione (commenti e ordine delle chiavi ignorati)
+    
+    extra aggiunge altro stato che invalida tutti i risultati
+    """
+    payload = json.dumps({'version': RESULTS_FORMAT_VERSION, 'config': config, 'extra': extra},
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """SHA-256 del contenuto del file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def dependency_digest(path: Union[str, Path]) -> Optional[str]:
+    """SHA-256 di una dipendenza (None se non esiste o non è leggibile)"""
+    try:
+        return file_digest(path)
+    except OSError:
+        return None
+
+
+class ResultCache:
+    """
+    Risultati di analisi riutilizzabili tra esecuzioni successive
+    
+    Una voce è valida solo se il contenuto del file e la configurazione
+    sono identici a quelli dell'analisi salvata: modificare seo_rules.yaml
+    invalida automaticamente tutta la cache. Ogni voce conserva anche
+    l'hash dei file letti dall'analisi (result['dependencies']: pagine di
+    cui ha verificato le ancore, CSS, immagini, font) e decade se uno di
+    questi cambia, scompare o compare. Si confronta il contenuto e non
+    mtime/dimensione, così la cache resta valida anche dopo un checkout
+    nuovo (es. in CI), dove tutte le date di modifica cambiano.
+    """
+    
+    def __init__(self, cache_file: str, fingerprint: str):
+        self.cache_file = Path(cache_file)
+        self.fingerprint = fingerprint
+        self.hits = 0
+        self._entries: Dict[str, Dict] = {}
+        self._digests: Dict[str, str] = {}
+        self._load()
+    
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if data.get('fingerprint') == self.fingerprint:
+            self._entries = data.get('entries', {})
+    
+    def _key(self, path: Union[str, Path]) -> str:
+        return os.path.abspath(path)
+    
+    def digest(self, path: Union[str, Path]) -> str:
+        """Hash del contenuto (calcolato una sola volta per esecuzione)"""
+        key = self._key(path)
+        if key not in self._digests:
+            self._digests[key] = file_digest(path)
+        return self._digests[key]
+    
+    def dependency_digest(self, path: Union[str, Path]) -> Optional[str]:
+        """Hash di una dipendenza, None se manca (calcolato una sola volta per esecuzione)"""
+        key = self._key(path)
+        if key not in self._digests:
+            digest = dependency_digest(key)
+            if digest is None:
+                return None
+            self._digests[key] = digest
+        return self._digests[key]
+    
+    def get(self, path: Union[str, Path]) -> Optional[Dict]:
+        """Risultato salvato se il file e le sue dipendenze non sono cambiati (None altrimenti)"""
+        entry = self._entries.get(self._key(path))
+        if entry is None or entry.get('content_hash') != self.digest(path):
+            return None
+        if any(self.dependency_digest(dependency) != digest
+               for dependency, digest in entry.get('dependencies', {}).items()):
+            return None
+        
+        self.hits += 1
+        return entry['result']
+    
+    def put(self, path: Union[str, Path], result: Dict):
+        self._entries[self._key(path)] = {
+            'content_hash': self.digest(path),
+            'dependencies': {dependency: self.dependency_digest(dependency)
+                             for dependency in result.get('dependencies', [])},
+            'result': result
+        }
+    
+    def prune(self, root: Union[str, Path], paths: Iterable[Union[str, Path]]):
+        """Rimuove le voci dei file sotto root non più presenti nell'analisi"""
+        prefix = self._key(root) + os.sep
+        keep = {self._key(path) for path in paths}
+        self._entries = {
+            key: entry for key, entry in self._entries.items()
+            if key in keep or not key.startswith(prefix)
+        }
+    
+    def save(self):
+        """Scrive la cache in modo atomico"""
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix(self.cache_file.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'fingerprint': self.fingerprint, 'entries': self._entries}, f)
+        os.replace(tmp_file, self.cache_file)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
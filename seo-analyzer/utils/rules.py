@@ -0,0 +1,744 @@
+"""
+Rules - Regole SEO compilate da seo_rules.yaml
+Configurazione validata all'avvio in oggetti immutabili con valori derivati precalcolati
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
+
+import yaml
+
+
+# Da incrementare quando cambia il modo in cui la configurazione viene compilata
+RULES_FORMAT_VERSION = 1
+
+# Directory della cache accanto al file di configurazione (se non è indicata --cache-dir)
+CACHE_DIR_NAME = '.seo_cache'
+
+# cache_file di default per SEORules.load: un file per percorso della configurazione
+BESIDE_CONFIG = object()
+
+
+class RulesError(ValueError):
+    """Configurazione non valida: il messaggio indica la chiave (es. content.title.max_length)"""
+
+
+class _Section:
+    """
+    Lettura tipizzata di un blocco della configurazione con percorso per gli errori
+    
+    Ogni chiave letta (o dichiarata con known) viene registrata: unknown()
+    elenca le chiavi rimanenti, cioè quelle scritte male o non supportate.
+    """
+    
+    def __init__(self, data, path: str = ''):
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise RulesError(f"{path or 'configurazione'}: atteso un blocco di chiavi, "
+                             f"trovato {type(data).__name__}")
+        self.data = data
+        self.path = path
+        self.recognized: Set[str] = set()
+        self.children: Dict[str, '_Section'] = {}
+    
+    def _key(self, key: str) -> str:
+        return f"{self.path}.{key}" if self.path else key
+    
+    def value(self, key: str, default=None):
+        """Valore grezzo della chiave (segnata come riconosciuta)"""
+        self.recognized.add(key)
+        return self.data.get(key, default)
+    
+    def known(self, *keys: str):
+        """Chiavi valide che le regole compilate non leggono (documentative o lette da altri moduli)"""
+        self.recognized.update(keys)
+    
+    def section(self, key: str) -> '_Section':
+        if key not in self.children:
+            self.children[key] = _Section(self.value(key), self._key(key))
+        return self.children[key]
+    
+    def unknown(self) -> List[str]:
+        """Messaggi per le chiavi non riconosciute, in questo blocco e nei sotto-blocchi letti"""
+        messages = []
+        for key in self.data:
+            if key in self.recognized:
+                continue
+            message = f"{self._key(key)}: chiave non riconosciuta"
+            match = difflib.get_close_matches(str(key), sorted(self.recognized), n=1)
+            if match:
+                message += f" (forse {self._key(match[0])}?)"
+            messages.append(message)
+        for child in self.children.values():
+            messages.extend(child.unknown())
+        return messages
+    
+    def number(self, key: str, default: float, minimum: Optional[float] = None,
+               maximum: Optional[float] = None, integer: bool = False) -> Union[int, float]:
+        value = self.value(key, default)
+        kind = int if integer else (int, float)
+        if isinstance(value, bool) or not isinstance(value, kind):
+            expected = 'un intero' if integer else 'un numero'
+            raise RulesError(f"{self._key(key)}: atteso {expected}, trovato {value!r}")
+        if minimum is not None and value < minimum:
+            raise RulesError(f"{self._key(key)}: deve essere almeno {minimum} (trovato {value})")
+        if maximum is not None and value > maximum:
+            raise RulesError(f"{self._key(key)}: deve essere al massimo {maximum} (trovato {value})")
+        return value
+    
+    def flag(self, key: str, default: bool) -> bool:
+        value = self.value(key, default)
+        if not isinstance(value, bool):
+            raise RulesError(f"{self._key(key)}: atteso true o false, trovato {value!r}")
+        return value
+    
+    def text(self, key: str, default: Optional[str], optional: bool = False) -> Optional[str]:
+        """Stringa (None ammesso se optional, es. site_url: null)"""
+        value = self.value(key, default)
+        if value is None and optional:
+            return None
+        if not isinstance(value, str):
+            raise RulesError(f"{self._key(key)}: attesa una stringa, trovato {value!r}")
+        return value
+    
+    def strings(self, key: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Lista di stringhe, maiuscole comprese (es. nomi di file)"""
+        value = self.value(key, default)
+        if not isinstance(value, (list, tuple)) or not all(isinstance(item, str) for item in value):
+            raise RulesError(f"{self._key(key)}: attesa una lista di stringhe, trovato {value!r}")
+        return tuple(value)
+    
+    def words(self, key: str, default: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Lista di stringhe normalizzate in minuscolo"""
+        return tuple(item.lower() for item in self.strings(key, default))
+    
+    def integers(self, key: str, default: Tuple[int, ...], minimum: Optional[int] = None,
+                 maximum: Optional[int] = None) -> Tuple[int, ...]:
+        """Lista di interi nell'intervallo indicato (es. status HTTP)"""
+        value = self.value(key, default)
+        if not isinstance(value, (list, tuple)) or \
+                not all(isinstance(item, int) and not isinstance(item, bool) for item in value):
+            raise RulesError(f"{self._key(key)}: attesa una lista di interi, trovato {value!r}")
+        for item in value:
+            if (minimum is not None and item < minimum) or (maximum is not None and item > maximum):
+                raise RulesError(f"{self._key(key)}: {item} fuori dall'intervallo {minimum}-{maximum}")
+        return tuple(value)
+    
+    def pattern(self, key: str, default: str) -> Pattern:
+        value = self.text(key, default)
+        try:
+            return re.compile(value)
+        except re.error as e:
+            raise RulesError(f"{self._key(key)}: espressione regolare non valida ({e})") from None
+    
+    def ordered(self, *pairs: Tuple[str, float]):
+        """Verifica che i valori (chiave, valore) siano in ordine non decrescente"""
+        for (low_key, low), (high_key, high) in zip(pairs, pairs[1:]):
+            if low > high:
+                raise RulesError(f"{self._key(high_key)}: deve essere almeno pari a "
+                                 f"{self._key(low_key)} ({high} < {low})")
+
+
+class _Rules:
+    """Base per le regole compilate: attributi a slot, immutabili dopo la costruzione"""
+    
+    __slots__ = ()
+    
+    def _set(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} è immutabile")
+    
+    def __repr__(self) -> str:
+        names = [name for cls in reversed(type(self).__mro__) for name in cls.__dict__.get('__slots__', ())]
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in names)
+        return f"{type(self).__name__}({fields})"
+
+
+class LengthRules(_Rules):
+    """Lunghezze di title e meta description"""
+    
+    __slots__ = ('min_length', 'max_length', 'optimal_length', 'weight', 'unique_per_page')
+    
+    def __init__(self, section: _Section, min_length: int, max_length: int, optimal_length: int, weight: float):
+        self._set(min_length=section.number('min_length', min_length, minimum=0, integer=True),
+                  max_length=section.number('max_length', max_length, minimum=1, integer=True),
+                  optimal_length=section.number('optimal_length', optimal_length, minimum=0, integer=True),
+                  weight=section.number('weight', weight, minimum=0),
+                  unique_per_page=section.flag('unique_per_page', True))
+        section.known('require_primary_keyword', 'primary_keyword_position', 'avoid_stuffing',
+                      'require_call_to_action')
+        section.ordered(('min_length', self.min_length), ('optimal_length', self.optimal_length),
+                        ('max_length', self.max_length))
+
+
+class MetaDescriptionRules(LengthRules):
+    __slots__ = ('persuasive_words',)
+    
+    def __init__(self, section: _Section):
+        super().__init__(section, 120, 160, 155, 10)
+        self._set(persuasive_words=section.words(
+            'persuasive_words', ('scopri', 'ottieni', 'migliora', 'impara', 'trova')))
+
+
+class HeadingRules(_Rules):
+    __slots__ = ('h2_min', 'h2_max', 'weight')
+    
+    def __init__(self, section: _Section):
+        self._set(h2_min=section.number('h2_min', 2, minimum=0, integer=True),
+                  h2_max=section.number('h2_max', 10, minimum=0, integer=True),
+                  weight=section.number('weight', 8, minimum=0))
+        section.known('require_h1', 'h1_per_page', 'require_primary_keyword_in_h1', 'h3_max',
+                      'hierarchical_structure', 'keywords_in_h2')
+        section.ordered(('h2_min', self.h2_min), ('h2_max', self.h2_max))
+
+
+class KeywordRules(_Rules):
+    """Densità percentuale della keyword principale (content.keywords.primary_keyword)"""
+    
+    __slots__ = ('min_density', 'max_density', 'optimal_density', 'weight')
+    
+    def __init__(self, section: _Section):
+        primary = section.section('primary_keyword')
+        self._set(min_density=primary.number('min_density', 0.8, minimum=0, maximum=100),
+                  max_density=primary.number('max_density', 1.5, minimum=0, maximum=100),
+                  optimal_density=primary.number('optimal_density', 1.2, minimum=0, maximum=100),
+                  weight=section.number('weight', 12, minimum=0))
+        section.known('secondary_keywords', 'lsi_keywords', 'avoid_stuffing')
+        primary.known('required_positions')
+        primary.ordered(('min_density', self.min_density), ('optimal_density', self.optimal_density),
+                        ('max_density', self.max_density))
+
+
+class NearDuplicateRules(_Rules):
+    __slots__ = ('num_perm', 'shingle_size', 'bands', 'similarity_threshold')
+    
+    def __init__(self, section: _Section):
+        num_perm = section.number('num_perm', 64, minimum=1, integer=True)
+        self._set(num_perm=num_perm,
+                  shingle_size=section.number('shingle_size', 5, minimum=1, integer=True),
+                  bands=section.number('bands', 8, minimum=1, maximum=num_perm, integer=True),
+                  similarity_threshold=section.number('similarity_threshold', 0.8, minimum=0, maximum=1))
+
+
+class TextContentRules(_Rules):
+    __slots__ = ('min_words_per_page', 'optimal_words', 'max_words', 'paragraph_max_words',
+                 'avoid_duplicate_content', 'near_duplicate', 'weight')
+    
+    def __init__(self, section: _Section):
+        self._set(min_words_per_page=section.number('min_words_per_page', 300, minimum=1, integer=True),
+                  optimal_words=section.number('optimal_words', 800, minimum=1, integer=True),
+                  max_words=section.number('max_words', 2500, minimum=1, integer=True),
+                  paragraph_max_words=section.number('paragraph_max_words', 150, minimum=1, integer=True),
+                  avoid_duplicate_content=section.flag('avoid_duplicate_content', True),
+                  near_duplicate=NearDuplicateRules(section.section('near_duplicate')),
+                  weight=section.number('weight', 10, minimum=0))
+        section.known('readability_score_min', 'sentence_max_words', 'original_content')
+        section.ordered(('min_words_per_page', self.min_words_per_page), ('optimal_words', self.optimal_words),
+                        ('max_words', self.max_words))
+
+
+class ContentRules(_Rules):
+    __slots__ = ('title', 'meta_description', 'headings', 'keywords', 'text_content')
+    
+    def __init__(self, section: _Section):
+        self._set(title=LengthRules(section.section('title'), 30, 60, 55, 15),
+                  meta_description=MetaDescriptionRules(section.section('meta_description')),
+                  headings=HeadingRules(section.section('headings')),
+                  keywords=KeywordRules(section.section('keywords')),
+                  text_content=TextContentRules(section.section('text_content')))
+
+
+class ImageRules(_Rules):
+    __slots__ = ('alt_min_length', 'alt_max_length', 'filename_pattern', 'max_size_kb',
+                 'modern_formats', 'probe_enabled', 'max_intrinsic_ratio')
+    
+    def __init__(self, section: _Section):
+        attributes = section.section('attributes')
+        optimization = section.section('optimization')
+        probe = section.section('probe')
+        self._set(alt_min_length=attributes.number('alt_min_length', 5, minimum=0, integer=True),
+                  alt_max_length=attributes.number('alt_max_length', 125, minimum=1, integer=True),
+                  filename_pattern=section.section('filenames').pattern(
+                      'pattern', r'^[a-z0-9-]+\.(jpg|jpeg|png|webp|avif|svg)$'),
+                  max_size_kb=optimization.number('max_size_kb', 200, minimum=1),
+                  modern_formats=frozenset(optimization.words('modern_formats', ('webp', 'avif'))),
+                  probe_enabled=probe.flag('enabled', True),
+                  max_intrinsic_ratio=probe.number('max_intrinsic_ratio', 2, minimum=1))
+        attributes.known('require_alt', 'alt_descriptive', 'alt_with_keywords', 'require_title',
+                         'width_height_specified', 'weight')
+        section.section('filenames').known('descriptive', 'lowercase_only', 'use_hyphens', 'avoid_underscores',
+                                           'include_keywords', 'max_length', 'weight')
+        optimization.known('recommended_size_kb', 'compression_quality_min', 'lazy_loading',
+                           'responsive_images', 'fallback_formats', 'weight')
+        probe.known('head_kb', 'max_head_kb', 'workers')  # Letti da ImageProbe.from_config
+        attributes.ordered(('alt_min_length', self.alt_min_length), ('alt_max_length', self.alt_max_length))
+
+
+class LinkGraphRules(_Rules):
+    __slots__ = ('damping_factor', 'max_iterations', 'tolerance', 'max_click_depth',
+                 'report_orphans', 'top_pages')
+    
+    def __init__(self, section: _Section):
+        self._set(damping_factor=section.number('damping_factor', 0.85, minimum=0, maximum=1),
+                  max_iterations=section.number('max_iterations', 100, minimum=1, integer=True),
+                  tolerance=section.number('tolerance', 1e-6, minimum=0),
+                  max_click_depth=section.number('max_click_depth', 3, minimum=0, integer=True),
+                  report_orphans=section.flag('report_orphans', True),
+                  top_pages=section.number('top_pages', 10, minimum=0, integer=True))
+
+
+class LinkRules(_Rules):
+    """Soglie dei link; generic_anchors è già in minuscolo per il confronto diretto"""
+    
+    __slots__ = ('internal_min', 'internal_max', 'external_max', 'generic_anchors',
+                 'anchor_min_length', 'anchor_max_length', 'graph')
+    
+    def __init__(self, section: _Section):
+        internal = section.section('internal')
+        anchor_text = section.section('anchor_text')
+        self._set(internal_min=internal.number('min_per_page', 3, minimum=0, integer=True),
+                  internal_max=internal.number('max_per_page', 50, minimum=0, integer=True),
+                  external_max=section.section('external').number('max_per_page', 10, minimum=0, integer=True),
+                  generic_anchors=frozenset(internal.words('avoid_generic_anchors',
+                                                           ('clicca qui', 'leggi di più', 'qui'))),
+                  anchor_min_length=anchor_text.number('length_min', 2, minimum=0, integer=True),
+                  anchor_max_length=anchor_text.number('length_max', 60, minimum=1, integer=True),
+                  graph=LinkGraphRules(section.section('graph')))
+        internal.known('anchor_text_descriptive', 'anchor_text_with_keywords', 'no_broken_links',
+                       'proper_hierarchy', 'weight')
+        section.section('external').known('authoritative_sources', 'relevant_content', 'require_rel_attributes',
+                                          'allowed_rel', 'no_broken_links', 'weight')
+        anchor_text.known('descriptive', 'include_keywords', 'varied_anchors', 'weight')
+        internal.ordered(('min_per_page', self.internal_min), ('max_per_page', self.internal_max))
+        anchor_text.ordered(('length_min', self.anchor_min_length), ('length_max', self.anchor_max_length))
+
+
+class URLRules(_Rules):
+    __slots__ = ('max_length', 'optimal_length', 'max_depth', 'pattern', 'avoid_parameters')
+    
+    def __init__(self, section: _Section):
+        structure = section.section('structure')
+        self._set(max_length=structure.number('max_length', 75, minimum=1, integer=True),
+                  optimal_length=structure.number('optimal_length', 50, minimum=1, integer=True),
+                  max_depth=structure.number('max_depth', 4, minimum=0, integer=True),
+                  pattern=structure.pattern('pattern', r'^[a-z0-9-/]+$'),
+                  avoid_parameters=structure.flag('avoid_parameters', True))
+        section.known('canonical', 'sitemap')
+        structure.known('clean', 'readable', 'lowercase_only', 'use_hyphens', 'include_primary_keyword',
+                        'avoid_special_chars', 'trailing_slash_consistent', 'weight')
+        structure.ordered(('optimal_length', self.optimal_length), ('max_length', self.max_length))
+
+
+class PerformanceRules(_Rules):
+    __slots__ = ('max_load_time_seconds', 'optimal_load_time_seconds', 'compression_enabled',
+                 'max_page_weight_kb')
+    
+    def __init__(self, section: _Section):
+        loading = section.section('loading')
+        compression = section.section('compression')
+        self._set(max_load_time_seconds=loading.number('max_load_time_seconds', 3.0, minimum=0),
+                  optimal_load_time_seconds=loading.number('optimal_load_time_seconds', 1.5, minimum=0),
+                  compression_enabled=compression.flag('enabled', True),
+                  max_page_weight_kb=compression.number('max_page_weight_kb', 1600, minimum=1))
+        section.known('resources', 'caching', 'lighthouse')
+        loading.known('first_contentful_paint_max_ms', 'largest_contentful_paint_max_ms',
+                      'time_to_interactive_max_ms', 'cumulative_layout_shift_max', 'weight')
+        compression.known('gzip_level', 'brotli_quality', 'workers', 'fetch_remote')  # Letti da AssetSizer
+        loading.ordered(('optimal_load_time_seconds', self.optimal_load_time_seconds),
+                        ('max_load_time_seconds', self.max_load_time_seconds))
+
+
+class MobileRules(_Rules):
+    __slots__ = ('viewport_config', 'touch_target_min_size', 'readable_font_size', 'min_text_font_size',
+                 'load_linked_stylesheets', 'fetch_remote_stylesheets', 'max_stylesheet_kb')
+    
+    def __init__(self, section: _Section):
+        usability = section.section('usability')
+        stylesheets = section.section('stylesheets')
+        self._set(viewport_config=section.section('responsive').text(
+                      'viewport_config', '<meta name="viewport" content="width=device-width, initial-scale=1.0">'),
+                  touch_target_min_size=usability.number('touch_target_min_size', 48, minimum=1),
+                  readable_font_size=usability.number('readable_font_size', 16, minimum=1),
+                  min_text_font_size=usability.number('min_text_font_size', 12, minimum=1),
+                  load_linked_stylesheets=stylesheets.flag('load_linked', True),
+                  fetch_remote_stylesheets=stylesheets.flag('fetch_remote', True),
+                  max_stylesheet_kb=stylesheets.number('max_size_kb', 2048, minimum=1))
+        section.known('testing')
+        section.section('responsive').known('mobile_friendly', 'viewport_meta_tag', 'responsive_images',
+                                            'no_horizontal_scroll', 'weight')
+        usability.known('adequate_contrast', 'no_mobile_popup_interstitials', 'weight')
+        usability.ordered(('min_text_font_size', self.min_text_font_size),
+                          ('readable_font_size', self.readable_font_size))
+
+
+class SchemaRules(_Rules):
+    __slots__ = ('appropriate_types',)
+    
+    def __init__(self, section: _Section):
+        # Nomi dei tipi schema.org: il maiuscolo è significativo
+        structured_data = section.section('structured_data')
+        types = structured_data.value('appropriate_types', [])
+        if not isinstance(types, list) or not all(isinstance(item, str) for item in types):
+            raise RulesError(f"schema.structured_data.appropriate_types: attesa una lista di stringhe, "
+                             f"trovato {types!r}")
+        self._set(appropriate_types=tuple(types))
+        section.known('rich_snippets')
+        structured_data.known('require_schema_markup', 'format', 'valid_schema', 'weight')
+
+
+class ScoringRules(_Rules):
+    """Pesi delle categorie e soglie di valutazione dello score globale"""
+    
+    __slots__ = ('category_weights', 'thresholds')
+    
+    # Soglie in ordine decrescente: la prima raggiunta dà la valutazione
+    RATINGS = (('excellent', 'Eccellente', '🏆'), ('good', 'Buono', '✅'),
+               ('average', 'Medio', '⚠️'), ('poor', 'Scarso', '❌'))
+    
+    def __init__(self, section: _Section):
+        weights = section.section('category_weights')
+        category_weights = {category: weights.number(category, 0, minimum=0) for category in weights.data} or {
+            'content': 25, 'performance': 25, 'mobile': 15, 'images': 15, 'links': 10, 'structure': 10
+        }
+        if sum(category_weights.values()) <= 0:
+            raise RulesError(f"{weights.path}: almeno una categoria deve avere peso maggiore di 0")
+        
+        thresholds = section.section('thresholds')
+        values = {key: thresholds.number(key, default, minimum=0, maximum=100)
+                  for key, default in (('excellent', 90), ('good', 75), ('average', 60), ('poor', 40))}
+        thresholds.ordered(*((key, values[key]) for key in ('poor', 'average', 'good', 'excellent')))
+        thresholds.known('critical')
+        section.known('severity_levels')
+        self._set(category_weights=MappingProxyType(category_weights),
+                  thresholds=MappingProxyType(values))
+    
+    def rating(self, score: float) -> Tuple[str, str]:
+        """(valutazione, emoji) per uno score 0-100"""
+        for key, label, emoji in self.RATINGS:
+            if score >= self.thresholds[key]:
+                return label, emoji
+        return 'Critico', '💀'
+
+
+class _BlockRules(_Rules):
+    """
+    Regole di un blocco di advanced.* letto da una utility
+    
+    ensure accetta anche il solo dizionario del blocco, per le utility
+    create senza la configurazione completa (script, benchmark, test): i
+    valori vengono validati allo stesso modo, le chiavi in più ignorate.
+    """
+    
+    __slots__ = ()
+    
+    # Percorso del blocco in seo_rules.yaml (per i messaggi di errore)
+    PATH = ''
+    
+    @classmethod
+    def ensure(cls, config: Union[Dict, '_BlockRules', None]):
+        if isinstance(config, cls):
+            return config
+        return cls(_Section(config, cls.PATH))
+
+
+class SeenFilterRules(_BlockRules):
+    """URL già visti dal crawler: set esatto o filtro di Bloom"""
+    
+    __slots__ = ('probabilistic', 'expected_urls', 'false_positive_rate')
+    PATH = 'advanced.crawling.seen_filter'
+    
+    def __init__(self, section: _Section):
+        self._set(probabilistic=section.flag('probabilistic', False),
+                  expected_urls=section.number('expected_urls', 1_000_000, minimum=1, integer=True),
+                  false_positive_rate=section.number('false_positive_rate', 0.001, minimum=1e-9, maximum=0.5))
+
+
+class CrawlingRules(_BlockRules):
+    __slots__ = ('user_agent', 'concurrent_requests', 'timeout_seconds', 'seen_filter')
+    PATH = 'advanced.crawling'
+    
+    def __init__(self, section: _Section):
+        self._set(user_agent=section.text('user_agent', None, optional=True),
+                  concurrent_requests=section.number('concurrent_requests', 5, minimum=1, integer=True),
+                  timeout_seconds=section.number('timeout_seconds', 30, minimum=0),
+                  seen_filter=SeenFilterRules(section.section('seen_filter')))
+        section.known('max_pages', 'follow_redirects', 'respect_robots_txt')
+
+
+class HTTPRules(_BlockRules):
+    """Client HTTP condiviso; user_agent sostituisce quello di advanced.crawling"""
+    
+    __slots__ = ('user_agent', 'pool_connections', 'pool_maxsize', 'connect_timeout_seconds',
+                 'read_timeout_seconds', 'retries', 'backoff_factor', 'retry_statuses')
+    PATH = 'advanced.http'
+    
+    def __init__(self, section: _Section):
+        self._set(user_agent=section.text('user_agent', None, optional=True),
+                  pool_connections=section.number('pool_connections', 10, minimum=1, integer=True),
+                  pool_maxsize=section.number('pool_maxsize', 20, minimum=1, integer=True),
+                  connect_timeout_seconds=section.number('connect_timeout_seconds', 5, minimum=0),
+                  read_timeout_seconds=section.number('read_timeout_seconds', 30, minimum=0),
+                  retries=section.number('retries', 2, minimum=0, integer=True),
+                  backoff_factor=section.number('backoff_factor', 0.5, minimum=0),
+                  retry_statuses=section.integers('retry_statuses', (429, 500, 502, 503, 504),
+                                                  minimum=100, maximum=599))
+
+
+class RateLimitRules(_BlockRules):
+    __slots__ = ('enabled', 'requests_per_second', 'burst', 'min_requests_per_second', 'backoff_factor',
+                 'recovery_factor', 'max_retry_after_seconds', 'retries', 'respect_crawl_delay')
+    PATH = 'advanced.rate_limit'
+    
+    def __init__(self, section: _Section):
+        self._set(enabled=section.flag('enabled', True),
+                  requests_per_second=section.number('requests_per_second', 5, minimum=0.01),
+                  burst=section.number('burst', 5, minimum=1),
+                  min_requests_per_second=section.number('min_requests_per_second', 0.2, minimum=0.01),
+                  backoff_factor=section.number('backoff_factor', 0.5, minimum=0, maximum=1),
+                  recovery_factor=section.number('recovery_factor', 1.1, minimum=1),
+                  max_retry_after_seconds=section.number('max_retry_after_seconds', 300, minimum=0),
+                  retries=section.number('retries', 2, minimum=0, integer=True),
+                  respect_crawl_delay=section.flag('respect_crawl_delay', True))
+        section.ordered(('min_requests_per_second', self.min_requests_per_second),
+                        ('requests_per_second', self.requests_per_second))
+
+
+class HTTPCacheRules(_BlockRules):
+    __slots__ = ('enabled', 'directory', 'max_size_mb')
+    PATH = 'advanced.http_cache'
+    
+    def __init__(self, section: _Section):
+        self._set(enabled=section.flag('enabled', False),
+                  directory=section.text('directory', CACHE_DIR_NAME),
+                  max_size_mb=section.number('max_size_mb', 500, minimum=0))
+
+
+class SiteCheckRules(_BlockRules):
+    __slots__ = ('cache_ttl_seconds',)
+    PATH = 'advanced.site_checks'
+    
+    def __init__(self, section: _Section):
+        self._set(cache_ttl_seconds=section.number('cache_ttl_seconds', 0, minimum=0))
+
+
+class LinkCheckingRules(_BlockRules):
+    __slots__ = ('user_agent', 'max_concurrency', 'per_host_limit', 'timeout_seconds')
+    PATH = 'advanced.link_checking'
+    
+    def __init__(self, section: _Section):
+        self._set(user_agent=section.text('user_agent', None, optional=True),
+                  max_concurrency=section.number('max_concurrency', 20, minimum=1, integer=True),
+                  per_host_limit=section.number('per_host_limit', 4, minimum=1, integer=True),
+                  timeout_seconds=section.number('timeout_seconds', 5, minimum=0))
+
+
+class SchedulerRules(_BlockRules):
+    """Thread per gli analyzer di una pagina (0 se disattivato: tutto in sequenza)"""
+    
+    __slots__ = ('enabled', 'workers')
+    PATH = 'advanced.scheduler'
+    
+    def __init__(self, section: _Section):
+        enabled = section.flag('enabled', True)
+        workers = section.number('workers', 4, minimum=0, integer=True)
+        self._set(enabled=enabled, workers=workers if enabled else 0)
+
+
+class LocalSiteRules(_BlockRules):
+    __slots__ = ('check_links', 'site_root', 'site_url', 'index_files', 'default_extension', 'check_fragments')
+    PATH = 'advanced.local_site'
+    
+    def __init__(self, section: _Section):
+        self._set(check_links=section.flag('check_links', True),
+                  site_root=section.text('site_root', '/'),
+                  site_url=section.text('site_url', None, optional=True),
+                  index_files=section.strings('index_files', ('index.html',)),
+                  default_extension=section.text('default_extension', '.html'),
+                  check_fragments=section.flag('check_fragments', True))
+
+
+class MonitoringRules(_BlockRules):
+    __slots__ = ('watch_mode', 'check_interval_seconds', 'alert_on_score_drop')
+    PATH = 'advanced.monitoring'
+    
+    def __init__(self, section: _Section):
+        self._set(watch_mode=section.flag('watch_mode', False),
+                  check_interval_seconds=section.number('check_interval_seconds', 300, minimum=0),
+                  alert_on_score_drop=section.number('alert_on_score_drop', 10, minimum=0, maximum=100))
+
+
+class IntegrationRules(_BlockRules):
+    __slots__ = ('google_search_console', 'google_analytics', 'google_pagespeed', 'lighthouse_api')
+    PATH = 'advanced.integrations'
+    
+    def __init__(self, section: _Section):
+        self._set(google_search_console=section.flag('google_search_console', False),
+                  google_analytics=section.flag('google_analytics', False),
+                  google_pagespeed=section.flag('google_pagespeed', True),
+                  lighthouse_api=section.flag('lighthouse_api', True))
+
+
+class AdvancedRules(_Rules):
+    """Blocchi di advanced.* letti da client HTTP, crawler, limiter, cache e watch mode"""
+    
+    __slots__ = ('crawling', 'http', 'rate_limit', 'http_cache', 'site_checks', 'link_checking',
+                 'scheduler', 'local_site', 'monitoring', 'integrations')
+    
+    def __init__(self, section: _Section):
+        self._set(crawling=CrawlingRules(section.section('crawling')),
+                  http=HTTPRules(section.section('http')),
+                  rate_limit=RateLimitRules(section.section('rate_limit')),
+                  http_cache=HTTPCacheRules(section.section('http_cache')),
+                  site_checks=SiteCheckRules(section.section('site_checks')),
+                  link_checking=LinkCheckingRules(section.section('link_checking')),
+                  scheduler=SchedulerRules(section.section('scheduler')),
+                  local_site=LocalSiteRules(section.section('local_site')),
+                  monitoring=MonitoringRules(section.section('monitoring')),
+                  integrations=IntegrationRules(section.section('integrations')))
+
+
+class SEORules(_Rules):
+    """
+    Regole SEO compilate e validate
+    
+    Raggruppa le soglie lette dagli analyzer e dalle utility (advanced.*)
+    in oggetti tipizzati: le chiavi mancanti prendono il valore di default
+    di seo_rules.yaml, i valori di tipo o intervallo sbagliato fermano
+    l'avvio con un RulesError che indica la chiave, così come le chiavi
+    non riconosciute (es. max_lenght) nei blocchi compilati. config resta
+    il dizionario originale.
+    """
+    
+    __slots__ = ('config', 'content', 'images', 'links', 'urls', 'performance', 'mobile',
+                 'schema', 'scoring', 'advanced')
+    
+    def __init__(self, config: Optional[Dict]):
+        root = _Section(config)
+        self._set(config=root.data,
+                  content=ContentRules(root.section('content')),
+                  images=ImageRules(root.section('images')),
+                  links=LinkRules(root.section('links')),
+                  urls=URLRules(root.section('urls')),
+                  performance=PerformanceRules(root.section('performance')),
+                  mobile=MobileRules(root.section('mobile')),
+                  schema=SchemaRules(root.section('schema')),
+                  scoring=ScoringRules(root.section('scoring')),
+                  advanced=AdvancedRules(root.section('advanced')))
+        
+        # Sezioni documentative o lette dal reporter
+        root.known('accessibility', 'technical', 'reporting')
+        unknown = root.unknown()
+        if unknown:
+            raise RulesError('; '.join(unknown))
+    
+    @classmethod
+    def ensure(cls, config: Union[Dict, 'SEORules']) -> 'SEORules':
+        """Restituisce config se già compilato, altrimenti compila il dizionario"""
+        if isinstance(config, cls):
+            return config
+        return cls(config)
+    
+    @classmethod
+    def load(cls, config_path: Union[str, Path], cache_file=BESIDE_CONFIG,
+             cache_dir: Optional[Union[str, Path]] = None) -> 'SEORules':
+        """
+        Compila il file YAML, riusando il parsing salvato se il file non è cambiato
+        
+        La cache (JSON) è indicizzata dall'hash del file e contiene il
+        dizionario già parsato, non le regole compilate: evita il parsing
+        YAML (circa 25 ms per seo_rules.yaml), mentre la compilazione viene
+        ripetuta a ogni caricamento (circa 0,2 ms). Così una cache scritta
+        da una versione precedente non può saltare validazioni o default
+        nuovi, e non serve serializzare gli oggetti immutabili delle regole.
+        
+        Args:
+            config_path: File YAML delle regole
+            cache_file: File della cache; di default uno per percorso della
+                        configurazione (vedi rules_cache_file), None la disattiva
+            cache_dir: Directory della cache (--cache-dir) al posto di quella
+                       accanto al file di configurazione
+        
+        Raises:
+            FileNotFoundError: se il file non esiste
+            RulesError: se il YAML non è valido o le regole non superano la validazione
+        """
+        with open(config_path, 'rb') as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        if cache_file is BESIDE_CONFIG:
+            cache_file = rules_cache_file(config_path, cache_dir)
+        
+        config = _read_cached(cache_file, digest) if cache_file else None
+        if config is not None:
+            return cls(config)
+        
+        try:
+            config = yaml.safe_load(source)
+        except yaml.YAMLError as e:
+            raise RulesError(f"{config_path}: YAML non valido ({e})") from None
+        
+        # Solo una configurazione valida finisce in cache
+        rules = cls(config)
+        if cache_file:
+            _write_cached(cache_file, digest, config)
+        return rules
+
+
+def rules_cache_file(config_path: Union[str, Path], cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """
+    File della cache per una configurazione
+    
+    In cache_dir se indicata, altrimenti in .seo_cache accanto al file;
+    il nome deriva dal percorso assoluto, così configurazioni diverse non
+    si sovrascrivono a vicenda e il risultato non dipende dalla directory
+    di lavoro.
+    """
+    config_path = Path(config_path).resolve()
+    directory = Path(cache_dir) if cache_dir else config_path.parent / CACHE_DIR_NAME
+    key = hashlib.sha256(str(config_path).encode('utf-8')).hexdigest()[:16]
+    return directory / f"rules-{config_path.stem}-{key}.json"
+
+
+def _read_cached(cache_file: Union[str, Path], digest: str) -> Optional[Dict]:
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if data.get('version') != RULES_FORMAT_VERSION or data.get('source_hash') != digest:
+        return None
+    return data.get('config')
+
+
+def _write_cached(cache_file: Union[str, Path], digest: str, config: Dict):
+    """Scrive la cache in modo atomico (ignorata se la directory non è scrivibile)"""
+    # Chiavi non stringa o date YAML cambierebbero passando da JSON: niente cache
+    try:
+        if json.loads(json.dumps(config)) != config:
+            return
+    except (TypeError, ValueError):
+        return
+    
+    cache_file = Path(cache_file)
+    tmp_file = cache_file.with_suffix(cache_file.suffix + f'.{os.getpid()}.tmp')
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': RULES_FORMAT_VERSION, 'source_hash': digest, 'config': config}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,121 @@
+"""
+Scheduler - Esecuzione concorrente degli analyzer di una pagina
+I task di rete partono subito su un pool di thread, quelli solo CPU girano nel thread chiamante
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+from .rules import SEORules
+
+
+class AnalysisTask:
+    """Unità di lavoro: funzione da eseguire, tipo (rete o CPU) e task da cui dipende"""
+    
+    __slots__ = ('name', 'run', 'network', 'requires', 'label')
+    
+    def __init__(self, name: str, run: Callable, network: bool = False,
+                 requires: Iterable[str] = (), label: Optional[str] = None):
+        """
+        Args:
+            name: Nome univoco del task (chiave del risultato)
+            run: Funzione eseguita con i risultati dei task in requires come argomenti
+            network: True se il task passa la maggior parte del tempo in attesa di rete
+            requires: Task che devono essere completati prima di questo
+            label: Messaggio di avanzamento stampato all'avvio
+        """
+        self.name = name
+        self.run = run
+        self.network = network
+        self.requires = tuple(requires)
+        self.label = label
+
+
+class TaskScheduler:
+    """
+    Esegue un insieme di task rispettando le dipendenze
+    
+    Appena le dipendenze sono soddisfatte i task di rete vengono inviati
+    al pool (le attese si sovrappongono), mentre i task CPU girano uno alla
+    volta nel thread chiamante: con il GIL più thread non li renderebbero
+    più veloci. Il tempo totale tende così a quello del task di rete più
+    lento invece che alla somma di tutti. I risultati sono restituiti per
+    nome, quindi chi li unisce decide l'ordine indipendentemente da quello
+    di completamento. Con workers=0 tutto gira in sequenza.
+    """
+    
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+    
+    @classmethod
+    def from_config(cls, config: Union[Dict, SEORules]) -> 'TaskScheduler':
+        """Crea lo scheduler dalla sezione advanced.scheduler della configurazione"""
+        return cls(workers=SEORules.ensure(config).advanced.scheduler.workers)
+    
+    def run(self, tasks: List[AnalysisTask]) -> Dict[str, object]:
+        """
+        Esegue i task e restituisce {nome: risultato}
+        
+        Le eccezioni di un task vengono rilanciate al chiamante.
+        
+        Raises:
+            ValueError: Nomi duplicati, dipendenze sconosciute o cicliche
+        """
+        names = [task.name for task in tasks]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Task duplicati: {names}")
+        unknown = {dep for task in tasks for dep in task.requires} - set(names)
+        if unknown:
+            raise ValueError(f"Dipendenze sconosciute: {sorted(unknown)}")
+        
+        results: Dict[str, object] = {}
+        pending = list(tasks)
+        running: Dict[Future, str] = {}
+        
+        while pending or running:
+            ready = [task for task in pending if all(dep in results for dep in task.requires)]
+            
+            # Prima i task di rete, così le loro attese coprono il lavoro CPU
+            for task in ready:
+                if task.network and self.workers > 0:
+                    pending.remove(task)
+                    self._announce(task)
+                    running[self._pool().submit(task.run, *self._arguments(task, results))] = task.name
+            
+            local = next((task for task in ready if task in pending), None)
+            if local is not None:
+                pending.remove(local)
+                self._announce(local)
+                results[local.name] = local.run(*self._arguments(local, results))
+                continue
+            
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[running.pop(future)] = future.result()
+                continue
+            
+            raise ValueError(f"Dipendenze cicliche tra i task: {[task.name for task in pending]}")
+        
+        return results
+    
+    @staticmethod
+    def _arguments(task: AnalysisTask, results: Dict[str, object]) -> List:
+        return [results[dep] for dep in task.requires]
+    
+    @staticmethod
+    def _announce(task: AnalysisTask):
+        if task.label:
+            print(task.label)
+    
+    def _pool(self) -> ThreadPoolExecutor:
+        """Pool creato al primo task di rete (le analisi solo locali non avviano thread)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='analyzer')
+        return self._executor
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -2,15 +2,18 @@
 Scorer - Sistema di scoring SEO
 """
 
-from typing import Dict, List
+from typing import Dict, List, Union
+
+from .rules import SEORules
 
 
 class SEOScorer:
     """Calcola score SEO globale e per categoria"""
     
-    def __init__(self, config: Dict):
-        self.config = config
-        self.category_weights = config['scoring']['category_weights']
+    def __init__(self, config: Union[Dict, SEORules]):
+        self.rules = SEORules.ensure(config)
+        self.config = self.rules.config
+        self.category_weights = self.rules.scoring.category_weights
         
     def calculate_global_score(self, category_scores: Dict[str, int]) -> int:
         """
@@ -37,33 +40,11 @@ class SEOScorer:
     
     def get_rating(self, score: int) -> str:
         """Ottieni valutazione testuale da score numerico"""
-        thresholds = self.config['scoring']['thresholds']
-        
-        if score >= thresholds['excellent']:
-            return 'Eccellente'
-        elif score >= thresholds['good']:
-            return 'Buono'
-        elif score >= thresholds['average']:
-            return 'Medio'
-        elif score >= thresholds['poor']:
-            return 'Scarso'
-        else:
-            return 'Critico'
+        return self.rules.scoring.rating(score)[0]
     
     def get_rating_emoji(self, score: int) -> str:
         """Ottieni emoji per score"""
-        thresholds = self.config['scoring']['thresholds']
-        
-        if score >= thresholds['excellent']:
-            return '🏆'
-        elif score >= thresholds['good']:
-            return '✅'
-        elif score >= thresholds['average']:
-            return '⚠️'
-        elif score >= thresholds['poor']:
-            return '❌'
-        else:
-            return '💀'
+        return self.rules.scoring.rating(score)[1]
     
     def prioritize_issues(self, issues: List[Dict]) -> Dict[str, List[Dict]]:
         """
@@ -0,0 +1,131 @@
+"""
+Sitemap - Lettura in streaming di sitemap.xml
+Parsing incrementale dei <loc>, sitemap gzip e sitemap index seguiti su richiesta
+"""
+
+import gzip
+import io
+import xml.etree.ElementTree as ET
+from collections import deque
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+SITEMAP_ROOTS = {'urlset', 'sitemapindex'}
+
+
+def _local_name(tag: str) -> str:
+    """Nome del tag senza namespace ({http://www.sitemaps.org/...}loc -> loc)"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def open_sitemap_stream(body: BinaryIO) -> BinaryIO:
+    """
+    Stream XML di una sitemap (vedi HTTPClient.cached_stream)
+    
+    Il Content-Encoding è già rimosso dal client; qui vengono decompressi
+    i file .xml.gz serviti come application/gzip (riconosciuti dai magic byte).
+    """
+    stream = body if hasattr(body, 'peek') else io.BufferedReader(body)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap_entries(stream: BinaryIO) -> Iterator[Tuple[str, str]]:
+    """
+    Legge una sitemap in streaming senza costruire il DOM
+    
+    Yields:
+        Coppie (tipo, loc): 'url' per le pagine di un <urlset>,
+        'sitemap' per le sitemap figlie di un <sitemapindex>
+    
+    Raises:
+        ValueError: se la radice non è <urlset> né <sitemapindex>
+        ET.ParseError: se l'XML non è ben formato
+    """
+    path = []
+    root = None
+    
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        name = _local_name(elem.tag)
+        
+        if event == 'start':
+            if root is None:
+                if name not in SITEMAP_ROOTS:
+                    raise ValueError(f'radice <{name}> non valida per una sitemap')
+                root = elem
+            path.append(name)
+            continue
+        
+        path.pop()
+        
+        if name == 'loc' and path and path[-1] in ('url', 'sitemap') and elem.text:
+            yield path[-1], elem.text.strip()
+        elif name in ('url', 'sitemap'):
+            # Voce completata: libera la memoria, così resta costante
+            root.clear()
+
+
+def count_sitemap_entries(body: BinaryIO) -> Dict:
+    """Conta pagine e sitemap figlie leggendo il corpo in streaming"""
+    counts = {'url': 0, 'sitemap': 0}
+    for kind, _ in iter_sitemap_entries(open_sitemap_stream(body)):
+        counts[kind] += 1
+    
+    return {
+        'is_index': counts['sitemap'] > 0,
+        'page_count': counts['url'],
+        'sitemap_count': counts['sitemap']
+    }
+
+
+class SitemapReader:
+    """
+    Estrae gli URL delle pagine da una sitemap (anche sitemap index)
+    
+    Le sitemap figlie vengono scaricate solo quando servono e la lettura
+    si interrompe appena raggiunto max_urls: una sitemap da 50MB viene
+    letta a memoria costante e solo per la parte necessaria. Con la cache
+    HTTP attiva le sitemap invariate (304) vengono rilette da disco.
+    """
+    
+    def __init__(self, http_client, max_depth: int = 3):
+        self.http = http_client
+        self.max_depth = max_depth
+    
+    def iter_urls(self, sitemap_url: str, max_urls: Optional[int] = None) -> Iterator[str]:
+        """
+        URL delle pagine in ordine di sitemap
+        
+        Args:
+            sitemap_url: URL della sitemap (o sitemap index)
+            max_urls: Numero massimo di URL da restituire
+        """
+        pending = deque([(sitemap_url, 0)])
+        visited = {sitemap_url}
+        emitted = 0
+        
+        while pending:
+            url, depth = pending.popleft()
+            
+            try:
+                with self.http.cached_stream(url) as (status, body):
+                    if status != 200:
+                        raise ValueError(f'HTTP {status}')
+                    
+                    for kind, loc in iter_sitemap_entries(open_sitemap_stream(body)):
+                        if kind == 'url':
+                            yield loc
+                            emitted += 1
+                            if max_urls is not None and emitted >= max_urls:
+                                return
+                        elif depth < self.max_depth and loc not in visited:
+                            visited.add(loc)
+                            pending.append((loc, depth + 1))
+            
+            except Exception as e:
+                # La sitemap principale deve essere valida, le figlie sono tollerate
+                if url == sitemap_url:
+                    raise
+                print(f"⚠️  Sitemap ignorata {url}: {e}")
@@ -0,0 +1,213 @@
+"""
+Watcher - Rilevamento modifiche ai file del sito
+inotify (Linux, via ctypes) con fallback a polling e debounce dei salvataggi
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+# Pagine, CSS/JS e i file che gli analyzer leggono dal disco (immagini, font)
+WATCHED_EXTENSIONS = ('.html', '.css', '.js', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.svg',
+                      '.woff', '.woff2', '.ttf', '.otf', '.eot')
+
+# Costanti inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class _InotifyBackend:
+    """Eventi del kernel: nessuna scansione della directory tra le modifiche"""
+    
+    def __init__(self, root: Path, recursive: bool):
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 non disponibile')
+        
+        self.recursive = recursive
+        self._dirs: Dict[int, Path] = {}
+        self._add_tree(root)
+    
+    def _add_watch(self, directory: Path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = directory
+    
+    def _add_tree(self, directory: Path):
+        self._add_watch(directory)
+        if self.recursive:
+            for sub in directory.rglob('*'):
+                if sub.is_dir():
+                    self._add_watch(sub)
+    
+    def read(self, timeout: float) -> Tuple[Set[Path], bool]:
+        """
+        File modificati entro timeout secondi
+        
+        Returns:
+            (percorsi modificati, True se la coda del kernel è traboccata)
+        """
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return set(), False
+        
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set(), False
+        
+        changed, overflow = set(), False
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            raw_name = data[offset + EVENT_HEADER.size:offset + EVENT_HEADER.size + length]
+            offset += EVENT_HEADER.size + length
+            
+            if mask & IN_Q_OVERFLOW:
+                overflow = True
+                continue
+            
+            directory = self._dirs.get(wd)
+            name = raw_name.rstrip(b'\0')
+            if directory is None or not name:
+                continue
+            
+            path = directory / os.fsdecode(name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self.recursive:
+                    self._add_tree(path)
+                    changed.update(p for p in path.rglob('*') if p.is_file())
+                continue
+            
+            changed.add(path)
+        
+        return changed, overflow
+    
+    def close(self):
+        os.close(self._fd)
+
+
+class _PollingBackend:
+    """Confronto periodico di mtime e dimensione dei file"""
+    
+    def __init__(self, root: Path, recursive: bool, extensions: Iterable[str], interval: float):
+        self.root = root
+        self.recursive = recursive
+        self.extensions = tuple(extensions)
+        self.interval = interval
+        self._snapshot = self._scan()
+    
+    def _scan(self) -> Dict[Path, Tuple[float, int]]:
+        pattern = '**/*' if self.recursive else '*'
+        snapshot = {}
+        for path in self.root.glob(pattern):
+            if path.suffix.lower() in self.extensions:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime, stat.st_size)
+        return snapshot
+    
+    def read(self, timeout: float) -> Tuple[Set[Path], bool]:
+        time.sleep(max(0.0, min(timeout, self.interval)))
+        
+        current = self._scan()
+        changed = {path for path, state in current.items() if self._snapshot.get(path) != state}
+        changed.update(path for path in self._snapshot if path not in current)
+        self._snapshot = current
+        return changed, False
+    
+    def close(self):
+        pass
+
+
+class FileWatcher:
+    """
+    Osserva una directory e restituisce i file HTML/CSS/JS modificati
+    
+    Usa inotify su Linux e il polling altrove (o se inotify non è
+    disponibile). Le raffiche di salvataggi vengono raggruppate: una
+    modifica viene restituita solo dopo debounce_seconds senza nuovi eventi.
+    """
+    
+    def __init__(self, root: str, recursive: bool = True, extensions: Iterable[str] = WATCHED_EXTENSIONS,
+                 poll_interval: float = 1.0, debounce_seconds: float = 0.3, use_inotify: bool = True):
+        self.root = Path(root).resolve()
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.debounce_seconds = debounce_seconds
+        
+        self.backend = None
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self.backend = _InotifyBackend(self.root, recursive)
+            except (OSError, AttributeError):
+                self.backend = None
+        
+        if self.backend is None:
+            self.backend = _PollingBackend(self.root, recursive, self.extensions, poll_interval)
+    
+    @property
+    def mode(self) -> str:
+        return 'inotify' if isinstance(self.backend, _InotifyBackend) else 'polling'
+    
+    def wait_for_changes(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Attende modifiche (al massimo timeout secondi) e le restituisce dopo il debounce
+        
+        Returns:
+            File modificati, creati o eliminati (vuoto se scade il timeout).
+            In caso di overflow degli eventi restituisce tutti i file osservati.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed: Set[Path] = set()
+        
+        while not changed:
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                return set()
+            
+            batch, overflow = self.backend.read(remaining)
+            if overflow:
+                return self._all_files()
+            changed = self._relevant(batch)
+        
+        # Debounce: raccoglie gli eventi finché i salvataggi non si fermano
+        while True:
+            batch, overflow = self.backend.read(self.debounce_seconds)
+            if overflow:
+                return self._all_files()
+            batch = self._relevant(batch)
+            if not batch:
+                return changed
+            changed |= batch
+    
+    def _relevant(self, paths: Iterable[Path]) -> Set[Path]:
+        return {path for path in paths if path.suffix.lower() in self.extensions}
+    
+    def _all_files(self) -> Set[Path]:
+        return {path for path in self.root.rglob('*') if path.suffix.lower() in self.extensions}
+    
+    def close(self):
+        self.backend.close()